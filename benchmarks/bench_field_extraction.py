@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark pentru motorul de extragere a câmpurilor (FieldExtractionEngine)
+
+Compară extract_invoice_data cu varianta inițială, care rula fiecare pattern cu
+re.search/re.findall pe tot textul, și verifică faptul că rezultatele sunt identice.
+
+Utilizare:
+    python benchmarks/bench_field_extraction.py [--repeat N]
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from invoice_data_extractor import FIELD_ENGINE  # noqa: E402
+
+
+INVOICE_TEXT = """FACTURA
+Numar factura: FX 1042
+Data emitere 2024-03-15
+Data scadenta 15/04/2024
+VANZATOR ALFA SERVICII SRL
+CUI RO12345678
+CUMPARATOR
+Nume BETA COMERT SRL
+Nume articol/Descriere articol
+Linia 1 Servicii consultanta IT
+Cod CPV articol pentru linia 1: H87
+Cod NC8 articol pentru linia 1: LTR
+TOTAL TVA 190.00 RON
+TOTAL PLATA 1190.00
+"""
+
+# Factură cu anexă lungă (ex: detalii de consum pe 200 de pagini)
+ANNEX_TEXT = INVOICE_TEXT + "".join(
+    f"Anexa pagina {page} consum {page * 3} kWh index {page * 17}\n" * 40
+    for page in range(200)
+)
+
+# Factură în care lipsesc mai multe labeluri (cazul cel mai costisitor inițial)
+SPARSE_TEXT = "\n".join(
+    line for line in INVOICE_TEXT.splitlines()
+    if not line.startswith(("Cod", "Data scadenta", "TOTAL TVA"))
+) + "\n" + "Observatii generale despre livrare si transport\n" * 500
+
+DOCUMENTS = {
+    'factura_simpla': INVOICE_TEXT,
+    'factura_cu_anexa': ANNEX_TEXT,
+    'factura_incompleta': SPARSE_TEXT,
+}
+
+
+def legacy_extract(text: str) -> Dict[str, Optional[str]]:
+    """Varianta inițială: fiecare pattern rulat pe tot textul, fără index de labeluri"""
+    data = {}
+    for field, (patterns, all_matches, clean) in FIELD_ENGINE.fields.items():
+        data[field] = None
+        for pattern, _, _ in patterns:
+            if all_matches:
+                values = [clean(value) for value in re.findall(pattern.pattern, text, pattern.flags)]
+                value = next((value for value in values if value), None)
+            else:
+                match = re.search(pattern.pattern, text, pattern.flags)
+                value = match.group(1) if match else None
+                if value is not None and clean is not None:
+                    value = clean(value)
+            if value:
+                data[field] = value
+                break
+    return data
+
+
+def measure(func, text: str, repeat: int) -> float:
+    """Întoarce timpul mediu per document în microsecunde"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pentru extragerea câmpurilor")
+    parser.add_argument("--repeat", "-r", type=int, default=200,
+                        help="Numărul de repetări per document (implicit: 200)")
+    args = parser.parse_args()
+    
+    print(f"{'Document':<22}{'Inițial (µs)':>15}{'Motor (µs)':>15}{'Accelerare':>12}")
+    for name, text in DOCUMENTS.items():
+        expected = legacy_extract(text)
+        actual = FIELD_ENGINE.extract(text)
+        if expected != actual:
+            print(f"Rezultate diferite pentru {name}:\n  {expected}\n  {actual}")
+            sys.exit(1)
+        
+        legacy_time = measure(legacy_extract, text, args.repeat)
+        engine_time = measure(FIELD_ENGINE.extract, text, args.repeat)
+        print(f"{name:<22}{legacy_time:>15.1f}{engine_time:>15.1f}{legacy_time / engine_time:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
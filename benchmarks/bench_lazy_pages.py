@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark pentru citirea paginilor la cerere (--lazy-pages) pe facturi lungi
+
+Compară citirea completă cu --lazy-pages (în ordinea naturală și "edges") pe o
+factură cu multe pagini de anexă, în două cazuri: toate câmpurile sunt găsite
+(lazy se poate opri devreme) și un câmp lipsește (toate paginile sunt citite,
+deci lazy nu trebuie să fie mai lent decât citirea completă).
+
+Utilizare:
+    python benchmarks/bench_lazy_pages.py [--pages 200] [--repeat 3]
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import build_pdf, invoice_lines, invoice_pages, random_invoice  # noqa: E402
+from invoice_data_extractor import InvoiceDataExtractor  # noqa: E402
+
+
+def write_invoice(path: Path, pages: int, missing_nc8: bool) -> None:
+    """Scrie o factură cu pagini de anexă; cu missing_nc8 lipsește codul NC8"""
+    rng = random.Random(7)
+    header, footer, _ = invoice_lines(random_invoice(rng, 100000), "standard")
+    if missing_nc8:
+        footer = [line for line in footer if not line.startswith("Cod NC8")]
+    path.write_bytes(build_pdf(invoice_pages(header, footer, pages, 40, rng)))
+
+
+def measure(func: Callable, repeat: int) -> float:
+    """Cel mai bun timp din repeat rulări, în secunde"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pentru --lazy-pages pe facturi lungi")
+    parser.add_argument("--pages", "-p", type=int, default=200,
+                        help="Numărul de pagini al facturii (implicit: 200)")
+    parser.add_argument("--repeat", "-r", type=int, default=3,
+                        help="Numărul de repetări per variantă (implicit: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        variants = {
+            'complet': InvoiceDataExtractor(folder),
+            'lazy natural': InvoiceDataExtractor(folder, lazy_pages=True),
+            'lazy edges': InvoiceDataExtractor(folder, lazy_pages=True, page_order="edges"),
+        }
+        print(f"{'Factură':<22}" + "".join(f"{name + ' (s)':>18}" for name in variants))
+        for case, missing in (("toate câmpurile", False), ("lipsește NC8", True)):
+            pdf_path = Path(folder) / "100000.pdf"
+            write_invoice(pdf_path, args.pages, missing)
+            times = [measure(lambda: extractor.parse_pdf(pdf_path), args.repeat)
+                     for extractor in variants.values()]
+            print(f"{case:<22}" + "".join(f"{seconds:>18.3f}" for seconds in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark pentru timpul de pornire al programului
+
+Măsoară, în procese noi, importul modulului, `--help` și o rulare pe un folder
+fără facturi originale (cazul frecvent al rulărilor din cron sau la fiecare
+upload) și verifică faptul că bibliotecile grele (PyPDF2, openpyxl, pypdfium2,
+pdfminer, pyarrow, asyncio) nu sunt importate la pornire. Se termină cu codul 1
+dacă mediana unei rulări depășește bugetul sau dacă o bibliotecă grea este
+importată la pornire.
+
+Utilizare:
+    python benchmarks/bench_startup.py [--repeat N] [--budget MS]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import py_compile
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Bibliotecile care trebuie importate doar în etapa care le folosește
+HEAVY_MODULES = ["PyPDF2", "openpyxl", "pypdfium2", "pdfminer", "pyarrow", "asyncio", "http.server"]
+
+DEFAULT_BUDGET_MS = 250
+
+
+def run_times(args: List[str], repeat: int, env: Dict[str, str]) -> List[float]:
+    """Rulează python cu argumentele date de repeat ori și întoarce duratele în ms"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=env, cwd=str(ROOT),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def loaded_heavy_modules(env: Dict[str, str]) -> List[str]:
+    """Bibliotecile grele prezente în sys.modules după importul modulului"""
+    code = ("import sys, json, invoice_data_extractor; "
+            f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))")
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=str(ROOT),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pentru timpul de pornire")
+    parser.add_argument("--repeat", "-r", type=int, default=10,
+                        help="Numărul de rulări per scenariu (implicit: 10)")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Mediana maximă acceptată per scenariu, în ms (implicit: {DEFAULT_BUDGET_MS})")
+    args = parser.parse_args()
+
+    # Ca la o instalare obișnuită, modulul este încărcat din __pycache__
+    py_compile.compile(str(ROOT / "invoice_data_extractor.py"), doraise=True)
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+
+    with tempfile.TemporaryDirectory() as empty_folder:
+        scenarios = {
+            'python': (["-c", "pass"], False),
+            'import': (["-c", "import invoice_data_extractor"], True),
+            '--help': (["-m", "invoice_data_extractor", "--help"], True),
+            'folder fără facturi': (["-m", "invoice_data_extractor", empty_folder, "--dry-run"], True),
+        }
+
+        over_budget = []
+        print(f"{'Scenariu':<22}{'Mediană (ms)':>14}{'Minim (ms)':>12}")
+        for name, (command, budgeted) in scenarios.items():
+            durations = run_times(command, args.repeat, env)
+            median = statistics.median(durations)
+            print(f"{name:<22}{median:>14.1f}{min(durations):>12.1f}")
+            if budgeted and median > args.budget:
+                over_budget.append(name)
+
+    heavy = loaded_heavy_modules(env)
+    if heavy:
+        print(f"Biblioteci importate la pornire: {', '.join(heavy)}")
+    if over_budget:
+        print(f"Peste bugetul de {args.budget:.0f} ms: {', '.join(over_budget)}")
+    if heavy or over_budget:
+        sys.exit(1)
+    print(f"Pornirea se încadrează în bugetul de {args.budget:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Generator de facturi sintetice în stilul e-Factura (format ANAF)
+
+Creează PDF-uri minimale (fără dependențe externe) cu nume numerice, ca
+fișierele originale procesate de invoice_data_extractor.py, plus un fișier
+manifest.json cu valorile așteptate pentru fiecare factură.
+
+Utilizare:
+    python benchmarks/corpus.py /tmp/corpus --count 500 --pages 3
+    python benchmarks/corpus.py /tmp/corpus --layouts standard,next_line --annex-lines 40
+    python benchmarks/corpus.py /tmp/corpus --count 20 --items 10000
+"""
+
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Așezările suportate ale labelurilor în textul facturii
+LAYOUTS = ("standard", "next_line", "english", "comma")
+
+MANIFEST_NAME = "manifest.json"
+
+COMPANY_WORDS = [
+    "ALFA", "BETA", "DELTA", "OMEGA", "NOVA", "CARPATI", "DUNAREA", "TRANS",
+    "ELECTRO", "AGRO", "CONSTRUCT", "LOGISTIC", "MEDICAL", "SOFT", "ENERGY",
+]
+COMPANY_SUFFIXES = ["SRL", "SA", "SRL-D", "IMPEX SRL", "SERVICII SRL"]
+PRODUCTS = [
+    "Servicii consultanta IT", "Energie electrica activa", "Abonament telefonie",
+    "Materiale de constructii", "Transport marfa", "Licenta software anuala",
+    "Servicii de curatenie", "Combustibil motorina", "Echipamente birou",
+]
+UNIT_CODES = ["H87", "LTR", "KGM", "MTR", "C62", "KWH"]
+
+# Dimensiunea paginii A4 în puncte și pasul dintre rânduri
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+LINE_HEIGHT = 14
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Construiește un PDF minimal cu câte un rând de text (Helvetica) pe fiecare linie
+
+    Args:
+        pages: Liniile de text ale fiecărei pagini (doar caractere ASCII)
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # arborele de pagini, completat după ce se știu paginile
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        content = [f"BT /F1 10 Tf {LINE_HEIGHT} TL 40 {PAGE_HEIGHT - 40} Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            content.append(f"({escaped}) Tj T*")
+        content.append("ET")
+        stream = "\n".join(content).encode("latin-1")
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        ).encode())
+        page_refs.append(len(objects))
+
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def random_invoice(rng: random.Random, number: int) -> Dict[str, str]:
+    """Generează valorile unei facturi (fără formatare)"""
+    company = " ".join(rng.sample(COMPANY_WORDS, 2)) + " " + rng.choice(COMPANY_SUFFIXES)
+    month, day = rng.randint(1, 12), rng.randint(1, 28)
+    total_vat = rng.randint(1, 50000) / 100 * 19
+    return {
+        'number': f"FX{number:07d}",
+        'company_name': company,
+        'buyer_name': " ".join(rng.sample(COMPANY_WORDS, 2)) + " SRL",
+        'cui': f"RO{rng.randint(1000000, 99999999)}",
+        'issue_date': f"2024-{month:02d}-{day:02d}",
+        'due_date': f"2024-{month % 12 + 1:02d}-{day:02d}",
+        'total_vat': f"{total_vat:.2f}",
+        'total_payment': f"{total_vat / 0.19 * 1.19:.2f}",
+        'product_name': rng.choice(PRODUCTS),
+        'cpv_code': rng.choice(UNIT_CODES),
+        'nc8_code': rng.choice(UNIT_CODES),
+    }
+
+
+def invoice_lines(values: Dict[str, str], layout: str) -> Tuple[List[str], List[str], Dict[str, Optional[str]]]:
+    """
+    Formatează factura într-o așezare dată
+
+    Returns:
+        Tuple (liniile de antet, liniile de final, valorile așteptate la extragere)
+    """
+    issue, due = values['issue_date'], values['due_date']
+    total_payment, total_vat = values['total_payment'], values['total_vat']
+    if layout == "comma":
+        total_payment = total_payment.replace('.', ',')
+        total_vat = total_vat.replace('.', ',')
+        # Data scadentă în format DD/MM/YYYY
+        year, month, day = due.split('-')
+        due = f"{day}/{month}/{year}"
+
+    header = [
+        "FACTURA",
+        f"Numar factura: {values['number']}",
+        f"Data emitere {issue}",
+        f"Data scadenta {due}",
+    ]
+    if layout == "next_line":
+        header += ["VANZATOR", "Nume", values['company_name']]
+    else:
+        header += [f"VANZATOR {values['company_name']}"]
+    header += [
+        f"CUI {values['cui']}",
+        "CUMPARATOR",
+        f"Nume {values['buyer_name']}",
+        "Nume articol/Descriere articol",
+    ]
+
+    if layout == "next_line":
+        footer = ["Linia 1", values['product_name']]
+    else:
+        footer = [f"Linia 1 {values['product_name']}"]
+    if layout == "english":
+        footer += [
+            f"CPV Code: {values['cpv_code']}",
+            f"NC8 Code: {values['nc8_code']}",
+            f"TOTAL VAT {total_vat} RON",
+            f"TOTAL PAYMENT {total_payment}",
+        ]
+    else:
+        footer += [
+            f"Cod CPV articol pentru linia 1: {values['cpv_code']}",
+            f"Cod NC8 articol pentru linia 1: {values['nc8_code']}",
+        ]
+        if layout == "next_line":
+            footer += ["TOTAL TVA", f"{total_vat} RON", "TOTAL PLATA", total_payment]
+        else:
+            footer += [f"TOTAL TVA {total_vat} RON", f"TOTAL PLATA {total_payment}"]
+
+    expected = {
+        'company_name': values['company_name'],
+        'issue_date': issue,
+        'due_date': due,
+        'total_payment': values['total_payment'],
+        'total_vat': values['total_vat'],
+        'cpv_code': values['cpv_code'],
+        'nc8_code': values['nc8_code'],
+        'product_name': values['product_name'],
+    }
+    return header, footer, expected
+
+
+def item_lines(rng: random.Random, items: int, layout: str
+               ) -> Tuple[List[str], List[Dict[str, Optional[str]]]]:
+    """
+    Generează liniile 2..items ale facturii, cu cantitate, preț unitar și TVA
+    
+    În așezarea "english" codurile CPV/NC8 nu sunt numerotate pe linii (ca la
+    prima linie), deci liniile suplimentare nu au coduri.
+    
+    Returns:
+        Tuple (liniile de text, valorile așteptate ale fiecărei linii)
+    """
+    lines, expected = [], []
+    for number in range(2, items + 1):
+        quantity = rng.randint(1, 500)
+        unit_price = rng.randint(1, 1000000) / 100
+        values = {
+            'line': number,
+            'description': rng.choice(PRODUCTS),
+            'cpv_code': rng.choice(UNIT_CODES),
+            'nc8_code': rng.choice(UNIT_CODES),
+            'quantity': str(quantity),
+            'unit_price': f"{unit_price:.2f}",
+            'line_vat': f"{quantity * unit_price * 0.19:.2f}",
+        }
+        lines += [
+            f"Linia {number} {values['description']}",
+            f"Cantitate {values['quantity']} Pret unitar {values['unit_price']} "
+            f"Valoare TVA {values['line_vat']}",
+        ]
+        if layout == "english":
+            values['cpv_code'] = values['nc8_code'] = None
+        else:
+            lines += [
+                f"Cod CPV articol pentru linia {number}: {values['cpv_code']}",
+                f"Cod NC8 articol pentru linia {number}: {values['nc8_code']}",
+            ]
+        expected.append(values)
+    return lines, expected
+
+
+def invoice_pages(header: List[str], footer: List[str], pages: int, annex_lines: int,
+                  rng: random.Random) -> List[List[str]]:
+    """Împarte factura pe pagini: antetul pe prima, totalurile pe ultima, anexe între ele"""
+    if pages <= 1:
+        return [header + footer]
+
+    annex = [
+        [f"Anexa pagina {page} punct consum {rng.randint(100, 999)} index {rng.randint(1000, 99999)} kWh"
+         for _ in range(annex_lines)]
+        for page in range(2, pages)
+    ]
+    return [header] + annex + [footer]
+
+
+def generate_corpus(folder: Path, count: int, pages: int = 1, layouts: Tuple[str, ...] = LAYOUTS,
+                    annex_lines: int = 40, seed: int = 42, start_number: int = 100000,
+                    items: int = 1) -> List[Tuple[Path, Dict[str, Optional[str]]]]:
+    """
+    Generează un corpus de facturi sintetice în folder
+
+    Args:
+        folder: Folderul destinație (creat dacă nu există)
+        count: Numărul de facturi
+        pages: Numărul de pagini al fiecărei facturi
+        layouts: Așezările folosite, alternativ
+        annex_lines: Numărul de linii de pe fiecare pagină de anexă
+        seed: Sămânța generatorului aleator (corpusul este reproductibil)
+        start_number: Primul nume numeric de fișier
+        items: Numărul de linii (articole) ale fiecărei facturi; liniile 2..items
+            sunt adăugate după prima, iar valorile lor apar în manifest la "items"
+
+    Returns:
+        Lista (cale, valori așteptate); aceleași date sunt scrise în manifest.json
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    corpus = []
+    line_items = []
+    for i in range(count):
+        layout = layouts[i % len(layouts)]
+        header, footer, expected = invoice_lines(random_invoice(rng, start_number + i), layout)
+        if items > 1:
+            # Liniile suplimentare urmează după prima linie, înaintea totalurilor
+            lines, item_values = item_lines(rng, items, layout)
+            totals = next(i for i, line in enumerate(footer) if line.startswith("TOTAL"))
+            footer = footer[:totals] + lines + footer[totals:]
+            line_items.append(item_values)
+        pdf_path = folder / f"{start_number + i}.pdf"
+        pdf_path.write_bytes(build_pdf(invoice_pages(header, footer, pages, annex_lines, rng)))
+        corpus.append((pdf_path, expected))
+
+    manifest = {
+        'pages': pages,
+        'annex_lines': annex_lines,
+        'seed': seed,
+        'documents': [
+            {'file': pdf_path.name, 'layout': layouts[i % len(layouts)], 'expected': expected}
+            for i, (pdf_path, expected) in enumerate(corpus)
+        ],
+    }
+    if items > 1:
+        manifest['items'] = items
+        for document, item_values in zip(manifest['documents'], line_items):
+            document['items'] = item_values
+    (folder / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, ensure_ascii=False),
+                                        encoding='utf-8')
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generează un corpus de facturi PDF sintetice")
+    parser.add_argument("folder", help="Folderul în care se creează facturile")
+    parser.add_argument("--count", "-n", type=int, default=100,
+                        help="Numărul de facturi (implicit: 100)")
+    parser.add_argument("--pages", "-p", type=int, default=1,
+                        help="Numărul de pagini per factură (implicit: 1)")
+    parser.add_argument("--annex-lines", type=int, default=40,
+                        help="Liniile de pe fiecare pagină de anexă (implicit: 40)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS),
+                        help=f"Așezările folosite, separate prin virgulă (implicit: {','.join(LAYOUTS)})")
+    parser.add_argument("--items", type=int, default=1,
+                        help="Numărul de linii (articole) per factură (implicit: 1)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Sămânța generatorului aleator (implicit: 42)")
+    args = parser.parse_args()
+
+    layouts = tuple(layout.strip() for layout in args.layouts.split(",") if layout.strip())
+    unknown = [layout for layout in layouts if layout not in LAYOUTS]
+    if unknown:
+        parser.error(f"Așezări necunoscute: {', '.join(unknown)}")
+
+    corpus = generate_corpus(Path(args.folder), args.count, args.pages, layouts,
+                             args.annex_lines, args.seed, items=args.items)
+    print(f"Generate {len(corpus)} facturi în {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
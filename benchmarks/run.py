@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark pentru etapele procesării facturilor
+
+Rulează fiecare etapă separat (extract_text, extract_invoice_data,
+generate_new_filename, save_to_excel) și procesarea completă (process_pdf) pe
+un corpus de facturi sintetice și raportează, în format JSON, documente/secundă,
+latența p50/p99 și memoria maximă (RSS). Fiecare etapă rulează într-un proces
+separat, ca memoria maximă să nu fie influențată de etapele anterioare.
+
+Utilizare:
+    python benchmarks/run.py --count 200 --pages 3
+    python benchmarks/run.py --corpus /tmp/corpus --stages extract_text,end_to_end -o rezultate.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import resource
+import argparse
+import platform
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import LAYOUTS, generate_corpus  # noqa: E402
+from invoice_data_extractor import ExcelReportWriter, InvoiceDataExtractor  # noqa: E402
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Percentila (metoda nearest-rank) dintr-o listă de valori"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(percent / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    """Memoria maximă (RSS) a procesului curent, în MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Pe macOS ru_maxrss este în bytes, pe Linux în KB
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(func: Callable, items: List) -> List[float]:
+    """Rulează func pentru fiecare element și întoarce latențele în secunde"""
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def stage_extract_text(extractor: InvoiceDataExtractor, files: List[Path], workdir: Path) -> List[float]:
+    return timed(extractor.extract_text, files)
+
+
+def stage_extract_invoice_data(extractor: InvoiceDataExtractor, files: List[Path], workdir: Path) -> List[float]:
+    texts = [extractor.extract_text(pdf_file) for pdf_file in files]
+    return timed(extractor.extract_invoice_data, texts)
+
+
+def stage_generate_new_filename(extractor: InvoiceDataExtractor, files: List[Path], workdir: Path) -> List[float]:
+    results = [(pdf_file, extractor.parse_pdf(pdf_file)[1]) for pdf_file in files]
+    return timed(lambda item: extractor.generate_new_filename(*item), results)
+
+
+def stage_save_to_excel(extractor: InvoiceDataExtractor, files: List[Path], workdir: Path) -> List[float]:
+    rows = [(pdf_file.name, "Succes: copiat în x.pdf", extractor.parse_pdf(pdf_file)[1])
+            for pdf_file in files]
+    for _, _, data in rows:
+        data.new_file = "x.pdf"
+
+    writer = ExcelReportWriter(workdir / "benchmark.xlsx")
+    latencies = timed(lambda row: writer.write_success(*row), rows)
+    # Timpul de salvare este împărțit egal între rânduri
+    start = time.perf_counter()
+    writer.close()
+    share = (time.perf_counter() - start) / max(1, len(latencies))
+    return [latency + share for latency in latencies]
+
+
+def stage_end_to_end(extractor: InvoiceDataExtractor, files: List[Path], workdir: Path) -> List[float]:
+    # Fișierele sunt copiate, ca fișierele create să nu modifice corpusul
+    output_folder = workdir / "end_to_end"
+    output_folder.mkdir()
+    copies = [Path(shutil.copy2(pdf_file, output_folder)) for pdf_file in files]
+    return timed(extractor.process_pdf, copies)
+
+
+STAGES = {
+    'extract_text': stage_extract_text,
+    'extract_invoice_data': stage_extract_invoice_data,
+    'generate_new_filename': stage_generate_new_filename,
+    'save_to_excel': stage_save_to_excel,
+    'end_to_end': stage_end_to_end,
+}
+
+
+def run_stage(name: str, corpus_folder: str, files: List[str], options: Dict) -> Dict:
+    """Rulează o etapă (în procesul curent) și întoarce metricile ei"""
+    extractor = InvoiceDataExtractor(corpus_folder, **options)
+    with tempfile.TemporaryDirectory() as workdir, \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        latencies = STAGES[name](extractor, [Path(pdf_file) for pdf_file in files], Path(workdir))
+
+    # Doar operația măsurată; pregătirea datelor de intrare nu este inclusă
+    total = sum(latencies)
+    return {
+        'documents': len(latencies),
+        'total_s': round(total, 4),
+        'docs_per_sec': round(len(latencies) / total, 2) if total else None,
+        'mean_ms': round(total / max(1, len(latencies)) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def run_benchmark(corpus_folder: Path, stages: List[str], options: Dict) -> Dict:
+    """Rulează etapele cerute, fiecare într-un proces nou"""
+    files = sorted(str(pdf_file) for pdf_file in corpus_folder.glob("*.pdf"))
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in stages:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_stage, (name, str(corpus_folder), files, options))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pentru etapele procesării facturilor")
+    parser.add_argument("--corpus", help="Folder cu un corpus existent (implicit: se generează unul temporar)")
+    parser.add_argument("--count", "-n", type=int, default=100,
+                        help="Numărul de facturi generate (implicit: 100)")
+    parser.add_argument("--pages", "-p", type=int, default=1,
+                        help="Numărul de pagini per factură generată (implicit: 1)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS),
+                        help="Așezările facturilor generate, separate prin virgulă")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Etapele rulate, separate prin virgulă (implicit: {','.join(STAGES)})")
+    parser.add_argument("--lazy-pages", action="store_true",
+                        help="Rulează extractorul cu citirea paginilor la cerere")
+    parser.add_argument("--output", "-o", help="Fișierul JSON în care se salvează rezultatele")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"Etape necunoscute: {', '.join(unknown)}")
+    options = {'lazy_pages': args.lazy_pages}
+
+    with tempfile.TemporaryDirectory() as temp_folder:
+        if args.corpus:
+            corpus_folder = Path(args.corpus)
+            corpus_info = {'folder': str(corpus_folder)}
+        else:
+            corpus_folder = Path(temp_folder)
+            layouts = tuple(layout.strip() for layout in args.layouts.split(","))
+            generate_corpus(corpus_folder, args.count, args.pages, layouts)
+            corpus_info = {'count': args.count, 'pages': args.pages, 'layouts': list(layouts)}
+
+        report = {
+            'corpus': corpus_info,
+            'options': options,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'stages': run_benchmark(corpus_folder, stages, options),
+        }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Client pentru serviciul de extragere (invoice_data_extractor.py --serve)
+
+Trimite facturi PDF serviciului pornit local și afișează datele extrase, în
+format JSON. Folosește doar biblioteca standard Python, deci poate fi copiat
+lângă aplicația care are nevoie de date (ex: ERP-ul).
+
+Utilizare:
+    python invoice_client.py --server 127.0.0.1:8765 factura.pdf
+    python invoice_client.py --server unix:/tmp/facturi.sock --path 2024/12345.pdf
+    python invoice_client.py --server 127.0.0.1:8765 --health
+"""
+
+import sys
+import json
+import socket
+import argparse
+import http.client
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+DEFAULT_SERVER = "127.0.0.1:8765"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection pe un socket Unix"""
+
+    def __init__(self, socket_path: str, timeout: float = 60):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def connect(server: str, timeout: float = 60) -> http.client.HTTPConnection:
+    """Conexiune către serviciu: "host:port" sau "unix:/cale/socket" """
+    if server.startswith("unix:"):
+        return UnixHTTPConnection(server[len("unix:"):], timeout)
+    host, _, port = server.rpartition(":")
+    return http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=timeout)
+
+
+def request(connection: http.client.HTTPConnection, method: str, url: str,
+            body: Optional[bytes] = None, content_type: Optional[str] = None) -> Dict:
+    """Trimite o cerere și întoarce răspunsul JSON; ridică RuntimeError pentru coduri de eroare"""
+    headers = {'Content-Type': content_type} if content_type else {}
+    connection.request(method, url, body=body, headers=headers)
+    response = connection.getresponse()
+    result = json.loads(response.read().decode('utf-8'))
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}: {result.get('error')}")
+    return result
+
+
+def extract(server: str, pdf: Optional[bytes] = None, path: Optional[str] = None,
+            name: str = "document.pdf", timeout: float = 60) -> Dict:
+    """
+    Extrage datele unei facturi prin serviciu
+
+    Args:
+        server: Adresa serviciului ("host:port" sau "unix:/cale/socket")
+        pdf: Conținutul PDF-ului (trimis serviciului)
+        path: Calea unui fișier din folderele serviciului (citit de serviciu)
+        name: Numele fișierului raportat pentru pdf
+        timeout: Timpul maxim de așteptare, în secunde
+
+    Returns:
+        {"file", "error", "data"}; data conține câmpurile extrase
+    """
+    connection = connect(server, timeout)
+    try:
+        if pdf is not None:
+            return request(connection, "POST", f"/extract?name={quote(name)}", pdf, "application/pdf")
+        return request(connection, "POST", "/extract",
+                       json.dumps({'path': path}).encode('utf-8'), "application/json")
+    finally:
+        connection.close()
+
+
+def extract_paths(server: str, paths: List[str], timeout: float = 600) -> List[Dict]:
+    """Extrage datele mai multor fișiere din folderele serviciului, într-o singură cerere"""
+    connection = connect(server, timeout)
+    try:
+        body = json.dumps({'paths': paths}).encode('utf-8')
+        return request(connection, "POST", "/extract", body, "application/json")['results']
+    finally:
+        connection.close()
+
+
+def health(server: str, timeout: float = 10) -> Dict:
+    """Starea serviciului (procese, fișiere extrase, cereri refuzate)"""
+    connection = connect(server, timeout)
+    try:
+        return request(connection, "GET", "/health")
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client pentru serviciul de extragere a datelor din facturi")
+    parser.add_argument("files", nargs="*", help="Facturi PDF trimise serviciului")
+    parser.add_argument("--server", default=DEFAULT_SERVER,
+                        help=f"Adresa serviciului: host:port sau unix:/cale/socket (implicit: {DEFAULT_SERVER})")
+    parser.add_argument("--path", action="append", default=[],
+                        help="Cale din folderele serviciului, citită direct de serviciu (se poate repeta)")
+    parser.add_argument("--health", action="store_true", help="Afișează starea serviciului")
+    args = parser.parse_args()
+
+    if not args.files and not args.path and not args.health:
+        parser.error("Specifică cel puțin un fișier, --path sau --health")
+
+    try:
+        results = []
+        if args.health:
+            results.append(health(args.server))
+        for pdf_file in args.files:
+            results.append(extract(args.server, Path(pdf_file).read_bytes(), name=Path(pdf_file).name))
+        if args.path:
+            results.extend(extract_paths(args.server, args.path))
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
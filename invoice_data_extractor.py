@@ -5,94 +5,2522 @@ Extrage: numele companiei, data emitere, data scadenta, total plata, total TVA
 """
 
 import os
+import io
 import sys
 import re
+import csv
+import json
+import time
+import hashlib
+import sqlite3
+import select
+import struct
+import ctypes
+import fcntl
+import heapq
+import cProfile
 import argparse
+import importlib.util
 import shutil
+import subprocess
+import queue
+import threading
+import multiprocessing
+import multiprocessing.connection
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-import PyPDF2
-from typing import List, Optional, Dict, Tuple
-from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Set, Tuple, Union
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache, partial
+
+# Bibliotecile grele (PyPDF2, openpyxl, pypdfium2, pdfminer, pyarrow, asyncio) sunt
+# importate doar în etapa care le folosește, deci --help sau o rulare fără
+# facturi noi (cron, la fiecare upload) pornesc fără costul importului lor.
+# Durata importului este urmărită de benchmarks/bench_startup.py.
+
+
+def module_available(name: str) -> bool:
+    """Verifică dacă un modul opțional este instalat, fără să-l importe"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Versiunea logicii de extragere; schimbarea ei invalidează intrările din cache
+EXTRACTOR_VERSION = "1"
+
+# Ordinile în care pot fi citite paginile unui PDF
+PAGE_ORDERS = ("natural", "edges")
+
+# Modurile de creare a fișierului cu numele nou -> mesajul afișat după creare
+OUTPUT_MODES = {
+    'copy': "Copiat în",
+    'hardlink': "Hardlink creat",
+    'reflink': "Clonat în",
+    'symlink': "Symlink creat",
+    'rename': "Redenumit în",
+}
+
+# Modurile de creare a fișierului cu numele nou -> mesajul de succes din rapoarte
+OUTPUT_RESULTS = {
+    'copy': "copiat în",
+    'hardlink': "hardlink creat",
+    'reflink': "clonat în",
+    'symlink': "symlink creat",
+    'rename': "redenumit în",
+}
+
+# Backend-urile pentru extragerea textului -> numele afișat
+TEXT_BACKENDS = {
+    'pypdf2': "PyPDF2",
+    'pypdfium2': "pypdfium2",
+    'pdfminer': "pdfminer.six",
+    'pdftotext': "pdftotext (poppler)",
+}
+
+# Formatele de dată recunoscute la normalizare (rezultatul este YYYY-MM-DD)
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%Y/%m/%d')
+
+# Metodele de verificare a unei destinații deja identice cu sursa
+SKIP_IDENTICAL_MODES = ("none", "size-mtime", "hash")
+
+# ioctl-ul Linux care clonează conținutul unui fișier (reflink, ex: Btrfs, XFS)
+FICLONE = 0x40049409
+
+# Câte fișiere descoperite pot aștepta procesarea (coada dintre căutare și procesare)
+DISCOVERY_QUEUE_SIZE = 256
+
+# Câte loturi de fișiere pot aștepta simultan rezultatul, per proces worker
+WORKER_QUEUE_DEPTH = 4
+
+# Câte fișiere citite sunt trimise împreună unui proces worker în modul --pipeline
+PIPELINE_BATCH_SIZE = 8
+
+# Adresa implicită a serviciului HTTP (--serve); "unix:/cale" pentru un socket Unix
+DEFAULT_SERVE_ADDRESS = "127.0.0.1:8765"
+
+# Câte fișiere primite simultan de serviciul HTTP sunt trimise împreună unui proces worker
+SERVE_BATCH_SIZE = 8
+
+# Cât de des verifică supravegherea proceselor timpul și memoria, în secunde
+SUPERVISOR_POLL_INTERVAL = 0.1
+
+# Numele implicit al cache-ului persistent, creat în folderul de procesare
+DEFAULT_CACHE_NAME = ".invoice_cache.sqlite"
+
+# Numele implicit al jurnalului de reluare, creat în folderul de procesare
+DEFAULT_CHECKPOINT_NAME = ".invoice_checkpoint.jsonl"
+
+# Numele implicit al fișierului cu șabloanele furnizorilor, creat în folderul de procesare
+DEFAULT_TEMPLATES_NAME = ".invoice_templates.json"
+
+# Numele implicit al indexului de duplicate, creat în folderul de procesare
+DEFAULT_DUPLICATES_NAME = ".invoice_duplicates.sqlite"
+
+# Tipurile de duplicate (vezi DuplicateIndex) -> textul din rapoarte
+DUPLICATE_KINDS = {
+    'exact': "Duplicat exact",
+    'probabil': "Duplicat probabil",
+}
+
+# Numele cache-ului cu textul recunoscut prin OCR, creat în folderul de procesare
+DEFAULT_OCR_CACHE_NAME = ".invoice_ocr_cache.sqlite"
+
+# Limbile Tesseract folosite implicit pentru OCR (doar cele instalate) și
+# rezoluția la care sunt randate paginile scanate
+OCR_LANGUAGES = "ron+eng"
+OCR_DPI = 300
+
+# Câte fișiere analizate pot aștepta, în ordinea de intrare, în spatele celui
+# mai vechi fișier aflat încă la OCR
+OCR_QUEUE_SIZE = 256
+
+# Flag-urile folosite de pattern-urile de extragere
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Labelurile după care se caută câmpurile. Fiecare pattern de mai jos care începe
+# cu un label poate potrivi doar de la prima apariție a labelului, iar un pattern
+# al cărui label lipsește din text nu mai este rulat deloc.
+_LABELS = {
+    'vanzator': r'VANZATOR',
+    'denumire': r'Denumire',
+    'nume': r'Nume',
+    'data_emitere': r'Data emitere',
+    'data_scadenta': r'Data scadenta',
+    'total_plata': r'TOTAL\s+PLATA',
+    'total_payment': r'TOTAL\s+PAYMENT',
+    'total_tva': r'TOTAL\s+TVA',
+    'total_vat': r'TOTAL\s+VAT',
+    'cod_cpv': r'Cod\s+CPV',
+    'cpv': r'CPV',
+    'cod_nc8': r'Cod\s+NC8',
+    'nc8': r'NC8',
+    'linia_1': r'Linia\s+1',
+}
+
+# label -> (prefix literal cu litere mici, regex pentru verificarea labelului complet)
+_LABEL_INDEX = {
+    key: (label.split('\\')[0].lower(),
+          re.compile(label, re.IGNORECASE) if '\\' in label else None)
+    for key, label in _LABELS.items()
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Codul fiscal al furnizorului (CUI/CIF), cu sau fără prefixul RO
+_SUPPLIER_ID_RE = re.compile(
+    r'\b(?:CUI|CIF|C\.U\.I\.|Cod\s+fiscal|Cod\s+de\s+identificare\s+fiscala)\s*:?\s*(?:RO)?\s*(\d{2,10})\b',
+    re.IGNORECASE
+)
+
+# Câte caractere după labelul VANZATOR se caută codul fiscal al furnizorului;
+# căutarea se oprește la blocul CUMPARATOR, unde este codul fiscal al clientului
+SUPPLIER_ID_WINDOW = 2000
+_BUYER_LABEL_RE = re.compile(r'\bCUMPARATOR\b', re.IGNORECASE)
+
+# Începutul unei linii din tabelul de articole: "Linia N" la început de rând, urmat de descriere
+_LINE_ITEM_RE = re.compile(r'^[ \t]*Linia[ \t]+(\d+)\b[ \t]*([^\n]*)', re.IGNORECASE | re.MULTILINE)
+_LINE_ITEM_NEXT_LINE_RE = re.compile(r'\n[ \t]*([^\n]*\S)')
+_LINE_ITEM_CPV_RE = re.compile(r'Cod\s+CPV\s+articol\s+pentru\s+linia\s+(\d+)\s*:\s*([A-Z0-9]+)', _FLAGS)
+_LINE_ITEM_NC8_RE = re.compile(r'Cod\s+NC8\s+articol\s+pentru\s+linia\s+(\d+)\s*:\s*([A-Z0-9]+)', _FLAGS)
+
+# Valorile numerice ale unei linii, căutate între "Linia N" și linia următoare
+_LINE_ITEM_NUMBER = r'(\d+(?:[.,]\d+)?)'
+_LINE_ITEM_QUANTITY_RE = re.compile(r'Cantitate[^\d\n]*' + _LINE_ITEM_NUMBER, re.IGNORECASE)
+_LINE_ITEM_UNIT_PRICE_RE = re.compile(r'Pret\s+unitar[^\d\n]*' + _LINE_ITEM_NUMBER, re.IGNORECASE)
+_LINE_ITEM_VAT_RE = re.compile(r'Valoare\s+TVA[^\d\n]*' + _LINE_ITEM_NUMBER, re.IGNORECASE)
+_LINE_ITEM_DETAILS_RE = re.compile(r'\s+(?:Cantitate|Pret\s+unitar|Valoare\s+TVA)\b', re.IGNORECASE)
+
+# Zecimalele păstrate pentru cantitățile și sumele liniilor (stocate ca întregi)
+LINE_ITEM_SCALE = 4
+
+
+def _fold_case(text: str) -> str:
+    """
+    Transformă textul în litere mici păstrând pozițiile caracterelor
+    
+    Singurele caractere non-ASCII pe care re.IGNORECASE le consideră egale cu
+    litere ASCII sunt înlocuite explicit ("İ" își schimbă lungimea la lower()).
+    """
+    if not text.isascii():
+        text = text.replace('\u0130', 'i').replace('\u0131', 'i').replace('\u017f', 's')
+    return text.lower()
+
+
+def _compile_patterns(specs: List[Tuple[str, Optional[str], bool]], flags: int = _FLAGS
+                      ) -> List[Tuple["re.Pattern", Optional[str], bool]]:
+    """
+    Compilează o listă de pattern-uri (regex, label, anchored)
+    
+    label este labelul care trebuie să apară în text pentru ca pattern-ul să
+    poată potrivi; anchored înseamnă că potrivirea începe chiar cu labelul.
+    """
+    return [(re.compile(pattern, flags), label, anchored) for pattern, label, anchored in specs]
+
+
+def _clean_company_name(value: str) -> Optional[str]:
+    company_name = _WHITESPACE_RE.sub(' ', value.strip())
+    company_name = company_name.rstrip('.')
+    
+    # Filtrează numele prea scurte, care conțin doar cifre sau care încep cu "Nr."
+    if (len(company_name) > 3 and
+            not company_name.isdigit() and
+            not company_name.startswith('Nr.')):
+        return company_name
+    return None
+
+
+def _clean_amount(value: str) -> Optional[str]:
+    return value.replace(',', '.')
+
+
+def _clean_code(value: str) -> Optional[str]:
+    return value.strip()
+
+
+def _clean_product_name(value: str) -> Optional[str]:
+    product_name = value.strip()
+    # Filtrează numele prea scurte sau care conțin doar cifre
+    if len(product_name) > 2 and not product_name.isdigit():
+        return product_name
+    return None
+
+
+@lru_cache(maxsize=32)
+def _date_patterns(label: str) -> Tuple["re.Pattern", ...]:
+    """Pattern-urile compilate pentru date în format YYYY-MM-DD sau DD-MM-YYYY"""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'{label}\s+(\d{{4}}-\d{{2}}-\d{{2}})',
+        rf'{label}\s+(\d{{2}}-\d{{2}}-\d{{4}})',
+        rf'{label}\s+(\d{{1,2}}/\d{{1,2}}/\d{{4}})',
+        rf'{label}\s+(\d{{4}}/\d{{1,2}}/\d{{1,2}})',
+    ))
+
+
+class LabelIndex:
+    """
+    Pozițiile labelurilor dintr-un text
+    
+    Prima apariție a fiecărui label este căutată la construcție (str.find pe
+    textul cu litere mici, mult mai rapid decât regex-urile IGNORECASE);
+    aparițiile următoare sunt căutate doar la cerere, cu find().
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.folded = _fold_case(text)
+        self.first = {}
+        # Labelurile cu același prefix ("total", "cod") refolosesc aceeași căutare
+        prefix_positions = {}
+        for key, (prefix, pattern) in _LABEL_INDEX.items():
+            pos = prefix_positions.get(prefix)
+            if pos is None:
+                pos = prefix_positions[prefix] = self.folded.find(prefix)
+            if pos != -1 and pattern is not None and not pattern.match(text, pos):
+                pos = self.find(key, pos + 1)
+            if pos != -1:
+                self.first[key] = pos
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.first
+    
+    def find(self, key: str, start: int) -> int:
+        """Întoarce poziția următoarei apariții a labelului începând de la start, sau -1"""
+        prefix, pattern = _LABEL_INDEX[key]
+        pos = self.folded.find(prefix, start)
+        while pos != -1 and pattern is not None and not pattern.match(self.text, pos):
+            pos = self.folded.find(prefix, pos + 1)
+        return pos
+
+
+class FieldExtractionEngine:
+    """
+    Motor de extragere a câmpurilor din textul facturii
+    
+    Toate pattern-urile sunt compilate o singură dată. Pentru fiecare text se
+    construiește un singur index al labelurilor (LabelIndex), iar pentru fiecare
+    câmp pattern-urile sunt încercate în aceeași ordine de prioritate ca înainte,
+    sărind peste cele al căror label lipsește și încercând potrivirea doar la
+    pozițiile labelului în loc să scaneze tot textul.
+    """
+    
+    def __init__(self):
+        # câmp -> (pattern-uri, toate potrivirile?, funcție de curățare)
+        self.fields = {
+            'company_name': (_compile_patterns([
+                # Caută "VANZATOR" urmat de numele companiei
+                (r'VANZATOR\s+([A-Za-z0-9\s\.\-&]+?)(?=\s+Nume|\n)', 'vanzator', True),
+                # Caută "Denumire" urmat de numele companiei
+                (r'Denumire\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'denumire', True),
+                # Caută "Nume" urmat de spațiu și apoi numele companiei până la următoarea linie
+                (r'Nume\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'nume', True),
+                # Variantă mai permisivă
+                (r'Nume\s+([A-Za-z0-9\s\.\-&]+?)(?=\s+[A-Z]|\n|$)', 'nume', True),
+                # Caută pe linia următoare după "Nume"
+                (r'Nume\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'nume', True),
+            ]), True, _clean_company_name),
+            'issue_date': (tuple(
+                (pattern, 'data_emitere', True) for pattern in _date_patterns('Data emitere')
+            ), False, None),
+            'due_date': (tuple(
+                (pattern, 'data_scadenta', True) for pattern in _date_patterns('Data scadenta')
+            ), False, None),
+            'total_payment': (_compile_patterns([
+                (r'TOTAL\s+PLATA\s+(\d+\.?\d*)', 'total_plata', True),
+                (r'TOTAL\s+PAYMENT\s+(\d+\.?\d*)', 'total_payment', True),
+                (r'TOTAL\s+PLATA\s+(\d+,\d*)', 'total_plata', True),
+                (r'TOTAL\s+PAYMENT\s+(\d+,\d*)', 'total_payment', True),
+                # Caută "TOTAL PLATA" urmat de număr pe linia următoare
+                (r'TOTAL\s+PLATA\s*\n\s*(\d+\.?\d*)', 'total_plata', True),
+                # Caută numere în contextul "TOTAL PLATA"
+                (r'(\d+\.?\d*)\s*TOTAL\s+PLATA', 'total_plata', False),
+                (r'TOTAL\s+PLATA.*?(\d+\.?\d*)', 'total_plata', True),
+            ]), False, _clean_amount),
+            'total_vat': (_compile_patterns([
+                (r'TOTAL\s+TVA\s+(\d+\.?\d*)\s*RON', 'total_tva', True),
+                (r'TOTAL\s+VAT\s+(\d+\.?\d*)\s*RON', 'total_vat', True),
+                (r'TOTAL\s+TVA\s+(\d+,\d*)\s*RON', 'total_tva', True),
+                (r'TOTAL\s+VAT\s+(\d+,\d*)\s*RON', 'total_vat', True),
+                # Caută "TOTAL TVA" urmat de număr pe linia următoare
+                (r'TOTAL\s+TVA\s*\n\s*(\d+\.?\d*)\s*RON', 'total_tva', True),
+                # Caută numere în contextul "TOTAL TVA"
+                (r'(\d+\.?\d*)\s*RON\s*TOTAL\s+TVA', 'total_tva', False),
+                (r'TOTAL\s+TVA.*?(\d+\.?\d*)\s*RON', 'total_tva', True),
+            ]), False, _clean_amount),
+            'cpv_code': (_compile_patterns([
+                (r'Cod\s+CPV\s+articol\s+pentru\s+linia\s+\d+\s*:\s*([A-Z0-9]+)', 'cod_cpv', True),
+                (r'Cod\s+CPV\s*:\s*([A-Z0-9]+)', 'cod_cpv', True),
+                (r'CPV\s+Code\s*:\s*([A-Z0-9]+)', 'cpv', True),
+                (r'CPV\s*:\s*([A-Z0-9]+)', 'cpv', True),
+            ]), False, _clean_code),
+            'nc8_code': (_compile_patterns([
+                (r'Cod\s+NC8\s+articol\s+pentru\s+linia\s+\d+\s*:\s*([A-Z0-9]+)', 'cod_nc8', True),
+                (r'Cod\s+NC8\s*:\s*([A-Z0-9]+)', 'cod_nc8', True),
+                (r'NC8\s+Code\s*:\s*([A-Z0-9]+)', 'nc8', True),
+                (r'NC8\s*:\s*([A-Z0-9]+)', 'nc8', True),
+            ]), False, _clean_code),
+            'product_name': (_compile_patterns([
+                # Caută în tabelul cu "Nume articol/Descriere articol"
+                (r'Linia\s+1\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'linia_1', True),
+                (r'Nume\s+articol/Descriere\s+articol\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'nume', True),
+                # Caută după "Linia 1" urmat de denumirea produsului
+                (r'Linia\s+1\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', 'linia_1', True),
+                # Caută în contextul tabelului de articole
+                (r'1\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)', None, False),
+            ]), False, _clean_product_name),
+        }
+    
+    def index_labels(self, text: str) -> "LabelIndex":
+        """Construiește indexul labelurilor pentru text"""
+        return LabelIndex(text)
+    
+    def extract_field(self, field: str, text: str,
+                      index: Optional["LabelIndex"] = None) -> Optional[str]:
+        """
+        Extrage un singur câmp, încercând pattern-urile în ordinea priorității
+        
+        Args:
+            field: Numele câmpului (cheie din extract_invoice_data)
+            text: Textul facturii
+            index: Indexul labelurilor (calculat dacă lipsește)
+        """
+        return self.match_field(field, text, index)[0]
+    
+    def match_field(self, field: str, text: str, index: Optional["LabelIndex"] = None,
+                    preferred: Optional[int] = None) -> Tuple[Optional[str], int, int]:
+        """
+        Ca extract_field, dar raportează și ce pattern a potrivit
+        
+        Args:
+            preferred: Numărul pattern-ului încercat primul (ex: din șablonul
+                furnizorului); dacă nu găsește nimic, se încearcă celelalte
+                pattern-uri în ordinea priorității
+        
+        Returns:
+            Tuple (valoare, numărul pattern-ului care a potrivit începând de la 1
+            sau 0 dacă niciunul, numărul de pattern-uri rulate efectiv)
+        """
+        if index is None:
+            index = self.index_labels(text)
+        patterns, all_matches, clean = self.fields[field]
+        
+        tried = 0
+        if preferred is not None and 0 < preferred <= len(patterns):
+            pattern, label, anchored = patterns[preferred - 1]
+            if label is None or label in index:
+                tried += 1
+                value = self._match_pattern(pattern, label, anchored, all_matches, clean, text, index)
+                if value:
+                    return value, preferred, tried
+        
+        for number, (pattern, label, anchored) in enumerate(patterns, 1):
+            if label is not None and label not in index:
+                continue
+            if number == preferred:
+                continue
+            tried += 1
+            
+            if all_matches:
+                matches = (self._anchored_matches(pattern, text, index, label)
+                           if anchored else pattern.finditer(text))
+                for match in matches:
+                    value = clean(match.group(1))
+                    if value:
+                        return value, number, tried
+                continue
+            
+            if anchored:
+                match = self._first_anchored_match(pattern, text, index, label)
+            else:
+                match = pattern.search(text)
+            if match:
+                value = match.group(1)
+                if clean is not None:
+                    value = clean(value)
+                if value:
+                    return value, number, tried
+        
+        return None, 0, tried
+    
+    def _match_pattern(self, pattern: "re.Pattern", label: Optional[str], anchored: bool,
+                       all_matches: bool, clean: Optional[Callable[[str], Optional[str]]],
+                       text: str, index: "LabelIndex") -> Optional[str]:
+        """Valoarea găsită de un singur pattern (după curățare), sau None"""
+        if all_matches:
+            matches = (self._anchored_matches(pattern, text, index, label)
+                       if anchored else pattern.finditer(text))
+            for match in matches:
+                value = clean(match.group(1))
+                if value:
+                    return value
+            return None
+        
+        if anchored:
+            match = self._first_anchored_match(pattern, text, index, label)
+        else:
+            match = pattern.search(text)
+        if match:
+            value = match.group(1)
+            if clean is not None:
+                value = clean(value)
+            return value
+        return None
+    
+    def _first_anchored_match(self, pattern: "re.Pattern", text: str, index: "LabelIndex",
+                              label: str) -> Optional["re.Match"]:
+        """Echivalentul pattern.search(text) pentru un pattern care începe cu labelul"""
+        pos = index.first[label]
+        match = pattern.match(text, pos)
+        while match is None:
+            pos = index.find(label, pos + 1)
+            if pos == -1:
+                return None
+            match = pattern.match(text, pos)
+        return match
+    
+    def _anchored_matches(self, pattern: "re.Pattern", text: str, index: "LabelIndex",
+                          label: str) -> Iterator["re.Match"]:
+        """Echivalentul pattern.finditer(text) pentru un pattern care începe cu labelul"""
+        pos = index.first[label]
+        while pos != -1:
+            match = pattern.match(text, pos)
+            if match:
+                yield match
+                # Ca în finditer, potrivirile următoare nu se pot suprapune
+                pos = index.find(label, match.end())
+            else:
+                pos = index.find(label, pos + 1)
+    
+    def extract(self, text: str, fields: Optional[List[str]] = None,
+                trace: Optional[Dict] = None) -> Dict[str, Optional[str]]:
+        """
+        Extrage câmpurile cerute (implicit toate) folosind un singur index de labeluri
+        
+        Args:
+            text: Textul facturii
+            fields: Câmpurile de extras (implicit toate)
+            trace: Dacă este dat (vezi new_trace), se adaugă în trace["fields"]
+                timpul, pattern-ul care a potrivit și pattern-urile rulate per câmp
+        """
+        if trace is None:
+            index = self.index_labels(text)
+            return {
+                field: self.extract_field(field, text, index)
+                for field in (fields if fields is not None else self.fields)
+            }
+        _, matches = self.match_fields(text, fields, trace)
+        return {field: value for field, (value, _, _) in matches.items()}
+    
+    def match_fields(self, text: str, fields: Optional[List[str]] = None,
+                     trace: Optional[Dict] = None,
+                     templates: Optional["SupplierTemplates"] = None
+                     ) -> Tuple[Optional[str], Dict[str, Tuple[Optional[str], int, Optional[int]]]]:
+        """
+        Ca extract, dar raportează și ce pattern a potrivit fiecare câmp
+        
+        Cu templates, pentru un furnizor cunoscut se încearcă întâi pattern-ul
+        din șablonul lui (vezi SupplierTemplates). Rezultatul nu este înregistrat
+        în șabloane: apelantul îl înregistrează o singură dată per factură (vezi
+        InvoiceDataExtractor.record_template_outcome), chiar dacă textul este
+        căutat pe bucăți (modul lazy).
+        
+        Returns:
+            Tuple (codul fiscal al furnizorului sau None, câmp -> (valoare,
+            numărul pattern-ului care a potrivit sau 0, numărul pattern-ului din
+            șablon sau None))
+        """
+        index = self.index_labels(text)
+        supplier = templates.supplier_key(text, index) if templates is not None else None
+        template = templates.get(supplier) if supplier is not None else {}
+        matches = {}
+        for field in (fields if fields is not None else self.fields):
+            if trace is not None:
+                start = time.perf_counter()
+            preferred = template.get(field)
+            value, number, tried = self.match_field(field, text, index, preferred)
+            matches[field] = (value, number, preferred)
+            if trace is not None:
+                # În modul lazy un câmp poate fi căutat de mai multe ori; timpii se adună
+                elapsed = time.perf_counter() - start
+                field_traces = trace['fields']
+                previous_time, _, previous_tried = field_traces.get(field, (0.0, 0, 0))
+                field_traces[field] = (previous_time + elapsed, number, previous_tried + tried)
+        return supplier, matches
+
+
+FIELD_ENGINE = FieldExtractionEngine()
+
+
+class LineItems:
+    """
+    Liniile (articolele) unei facturi, stocate pe coloane
+    
+    Textele sunt în liste, iar cantitățile și sumele în array-uri de întregi
+    (în unități de 10^-LINE_ITEM_SCALE, MISSING pentru valorile lipsă), deci
+    o factură cu 10.000 de linii nu creează 10.000 de dicționare. Codurile
+    CPV/NC8, care se repetă, sunt internate.
+    """
+    
+    __slots__ = ('numbers', 'descriptions', 'cpv_codes', 'nc8_codes',
+                 'quantities', 'unit_prices', 'vat_amounts')
+    
+    MISSING = -2 ** 63
+    
+    # Coloanele, în ordinea din to_json() și din rapoarte
+    COLUMNS = ('line', 'description', 'cpv_code', 'nc8_code', 'quantity', 'unit_price', 'line_vat')
+    AMOUNT_COLUMNS = ('quantities', 'unit_prices', 'vat_amounts')
+    
+    def __init__(self):
+        self.numbers = array('q')
+        self.descriptions = []
+        self.cpv_codes = []
+        self.nc8_codes = []
+        self.quantities = array('q')
+        self.unit_prices = array('q')
+        self.vat_amounts = array('q')
+    
+    def __len__(self) -> int:
+        return len(self.numbers)
+    
+    def __str__(self) -> str:
+        return f"{len(self)} linii"
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LineItems) and self.to_json() == other.to_json()
+    
+    def append(self, number: int, description: Optional[str], cpv_code: Optional[str],
+               nc8_code: Optional[str], quantity: Optional[str], unit_price: Optional[str],
+               vat_amount: Optional[str]) -> None:
+        """Adaugă o linie; sumele sunt textele extrase (cu punct sau virgulă zecimală)"""
+        self.numbers.append(number)
+        self.descriptions.append(description)
+        self.cpv_codes.append(sys.intern(cpv_code) if cpv_code else None)
+        self.nc8_codes.append(sys.intern(nc8_code) if nc8_code else None)
+        self.quantities.append(self.scaled(quantity))
+        self.unit_prices.append(self.scaled(unit_price))
+        self.vat_amounts.append(self.scaled(vat_amount))
+    
+    @classmethod
+    def scaled(cls, value: Optional[str]) -> int:
+        """Transformă o sumă extrasă în întreg (unități de 10^-LINE_ITEM_SCALE)"""
+        amount = parse_amount(value.replace(',', '.')) if value else None
+        if amount is None:
+            return cls.MISSING
+        return int(amount.scaleb(LINE_ITEM_SCALE).to_integral_value())
+    
+    @classmethod
+    def unscaled(cls, value: int) -> Optional[Decimal]:
+        """Inversul scaled(): Decimal cu cel puțin 2 zecimale, sau None"""
+        if value == cls.MISSING:
+            return None
+        amount = Decimal(value).scaleb(-LINE_ITEM_SCALE)
+        cents = amount.quantize(Decimal("0.01"))
+        return cents if cents == amount else amount.normalize()
+    
+    def rows(self) -> Iterator[Tuple]:
+        """Generează liniile ca tuple, în ordinea din COLUMNS (sumele ca Decimal)"""
+        unscaled = self.unscaled
+        for row in zip(self.numbers, self.descriptions, self.cpv_codes, self.nc8_codes,
+                       self.quantities, self.unit_prices, self.vat_amounts):
+            yield row[:4] + (unscaled(row[4]), unscaled(row[5]), unscaled(row[6]))
+    
+    def to_json(self) -> Dict[str, List]:
+        """Forma JSON, pe coloane (sumele rămân întregi scalați, null pentru lipsă)"""
+        return {
+            'line': self.numbers.tolist(),
+            'description': self.descriptions,
+            'cpv_code': self.cpv_codes,
+            'nc8_code': self.nc8_codes,
+            'quantity': [None if value == self.MISSING else value for value in self.quantities],
+            'unit_price': [None if value == self.MISSING else value for value in self.unit_prices],
+            'line_vat': [None if value == self.MISSING else value for value in self.vat_amounts],
+        }
+    
+    @classmethod
+    def from_json(cls, columns: Dict[str, List]) -> "LineItems":
+        """Inversul to_json()"""
+        items = cls()
+        items.numbers = array('q', columns['line'])
+        items.descriptions = columns['description']
+        items.cpv_codes = [sys.intern(code) if code else None for code in columns['cpv_code']]
+        items.nc8_codes = [sys.intern(code) if code else None for code in columns['nc8_code']]
+        for attribute, column in zip(cls.AMOUNT_COLUMNS, ('quantity', 'unit_price', 'line_vat')):
+            setattr(items, attribute, array('q', (
+                cls.MISSING if value is None else value for value in columns[column])))
+        return items
+
+
+def extract_line_items(text: str) -> LineItems:
+    """
+    Extrage toate liniile facturii ("Linia N" urmat de descriere)
+    
+    Codurile CPV/NC8 sunt asociate după numărul liniei ("Cod CPV articol
+    pentru linia N"); cantitatea, prețul unitar și valoarea TVA sunt căutate
+    între începutul liniei și începutul liniei următoare. Textul este parcurs
+    o singură dată pentru fiecare tip de informație.
+    """
+    cpv_codes = {int(number): code for number, code in _LINE_ITEM_CPV_RE.findall(text)}
+    nc8_codes = {int(number): code for number, code in _LINE_ITEM_NC8_RE.findall(text)}
+    items = LineItems()
+    
+    def add_line(match: "re.Match", end: int) -> None:
+        number = int(match.group(1))
+        description = _LINE_ITEM_DETAILS_RE.split(match.group(2), 1)[0].strip()
+        if not description:
+            # Descrierea pe rândul următor (ex: "Linia 1\nServicii ...")
+            next_line = _LINE_ITEM_NEXT_LINE_RE.match(text, match.end(), end)
+            if next_line:
+                description = _LINE_ITEM_DETAILS_RE.split(next_line.group(1), 1)[0].strip()
+        
+        values = []
+        for pattern in (_LINE_ITEM_QUANTITY_RE, _LINE_ITEM_UNIT_PRICE_RE, _LINE_ITEM_VAT_RE):
+            found = pattern.search(text, match.start(), end)
+            values.append(found.group(1) if found else None)
+        
+        items.append(number, _WHITESPACE_RE.sub(' ', description) or None,
+                     cpv_codes.get(number), nc8_codes.get(number), *values)
+    
+    # Fiecare linie se termină unde începe următoarea
+    previous = None
+    for match in _LINE_ITEM_RE.finditer(text):
+        if previous is not None:
+            add_line(previous, match.start())
+        previous = match
+    if previous is not None:
+        add_line(previous, len(text))
+    return items
+
+
+def encode_extracted(value):
+    """Hook json.dumps(default=...) pentru datele extrase care nu sunt text (LineItems)"""
+    if isinstance(value, LineItems):
+        return value.to_json()
+    raise TypeError(f"Tip necunoscut în datele extrase: {type(value).__name__}")
+
+
+def decode_extracted(data: Dict) -> Dict:
+    """Inversul encode_extracted(): reface LineItems în datele citite din JSON"""
+    items = data.get('line_items')
+    if isinstance(items, dict):
+        data['line_items'] = LineItems.from_json(items)
+    return data
+
+
+@lru_cache(maxsize=4096)
+def _shared_date(value: str) -> Optional[date]:
+    """parse_invoice_date cu rezultatul refolosit (multe facturi au aceleași date)"""
+    return parse_invoice_date(value)
+
+
+class InvoiceRecord:
+    """
+    Datele extrase dintr-o factură, în formă compactă și tipizată
+    
+    Un obiect cu __slots__ în locul dicționarului de texte: datele sunt date,
+    sumele Decimal, iar numele furnizorilor, produselor și codurile sunt
+    șiruri internate (aceeași instanță pentru toate facturile unui furnizor).
+    Textul extras se păstrează (în raw) doar când valoarea tipizată nu îl
+    reproduce exact (ex: "15.03.2024", "1.234,50" sau o dată invalidă), ca
+    rapoartele și numele fișierelor să rămână aceleași. file și message sunt
+    completate când rezultatul este păstrat în processed_files, iar new_file
+    este numele fișierului creat (sau care ar fi creat cu --dry-run). blank_pages
+    sunt paginile fără text, reținute doar cu OCR activ (vezi OcrEngine), iar
+    duplicate este (tip, fișierul original) pentru facturile deja văzute
+    (vezi DuplicateIndex).
+    """
+    
+    FIELDS = tuple(FIELD_ENGINE.fields)
+    DATE_FIELDS = ('issue_date', 'due_date')
+    AMOUNT_FIELDS = ('total_payment', 'total_vat')
+    __slots__ = FIELDS + ('line_items', 'raw', 'file', 'message', 'new_file', 'blank_pages', 'duplicate')
+    
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+    
+    @classmethod
+    def from_extracted(cls, data: Dict) -> "InvoiceRecord":
+        """Construiește înregistrarea din dicționarul de texte extrase (FieldExtractionEngine.extract)"""
+        record = cls()
+        raw = []
+        for field in cls.FIELDS:
+            value = data.get(field)
+            if not value:
+                continue
+            if field in cls.DATE_FIELDS:
+                typed = _shared_date(value)
+                if typed is None or typed.isoformat() != value:
+                    raw.append((field, sys.intern(value)))
+            elif field in cls.AMOUNT_FIELDS:
+                typed = parse_amount(value)
+                if typed is None or str(typed) != value:
+                    raw.append((field, value))
+            else:
+                typed = sys.intern(value)
+            setattr(record, field, typed)
+        record.line_items = data.get('line_items')
+        blank_pages = data.get('blank_pages')
+        if blank_pages is not None:
+            record.blank_pages = tuple(blank_pages)
+        duplicate = data.get('duplicate')
+        if duplicate is not None:
+            record.duplicate = tuple(duplicate)
+        record.new_file = data.get('new_file')
+        if raw:
+            record.raw = tuple(raw)
+        return record
+    
+    def text(self, field: str) -> Optional[str]:
+        """Valoarea unui câmp ca text, exact cum a fost extrasă"""
+        if self.raw is not None:
+            for name, value in self.raw:
+                if name == field:
+                    return value
+        value = getattr(self, field)
+        if value is None or isinstance(value, str):
+            return value
+        return value.isoformat() if isinstance(value, date) else str(value)
+    
+    def text_items(self) -> List[Tuple[str, object]]:
+        """Perechile (câmp, text), în ordinea câmpurilor, plus line_items dacă există"""
+        items = [(field, self.text(field)) for field in self.FIELDS]
+        if self.line_items is not None:
+            items.append(('line_items', self.line_items))
+        return items
+    
+    def to_dict(self) -> Dict:
+        """Dicționarul de texte (forma din cache și din jurnalul de reluare)"""
+        data = dict(self.text_items())
+        if self.blank_pages is not None:
+            data['blank_pages'] = list(self.blank_pages)
+        if self.duplicate is not None:
+            data['duplicate'] = list(self.duplicate)
+        if self.new_file is not None:
+            data['new_file'] = self.new_file
+        return data
+    
+    def has_data(self) -> bool:
+        """True dacă s-a găsit cel puțin un câmp"""
+        return self.raw is not None or any(getattr(self, field) is not None for field in self.FIELDS)
+    
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple) -> None:
+        # Internarea și datele comune nu supraviețuiesc pickle (procesele worker)
+        for name, value in zip(self.__slots__, state):
+            if isinstance(value, str) and name in self.FIELDS:
+                value = sys.intern(value)
+            elif isinstance(value, date):
+                value = _shared_date(value.isoformat())
+            setattr(self, name, value)
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={value!r}" for field, value in self.text_items() if value is not None)
+        return f"InvoiceRecord({values})"
+
+
+class SupplierTemplates:
+    """
+    Șabloanele furnizorilor: pattern-ul care a găsit fiecare câmp ultima dată
+    
+    Furnizorul este recunoscut după codul fiscal (CUI/CIF) din blocul VANZATOR.
+    Facturile unui furnizor au de obicei aceeași așezare, deci pentru un
+    furnizor cunoscut se încearcă întâi pattern-ul care a găsit câmpul la
+    factura anterioară; toate pattern-urile, în ordinea priorității, sunt
+    încercate doar dacă acesta nu găsește nimic. Pattern-ul care a găsit
+    câmpul este memorat pentru factura următoare.
+    """
+    
+    def __init__(self, templates: Optional[Dict[str, Dict[str, int]]] = None):
+        # furnizor -> câmp -> numărul pattern-ului (începând de la 1)
+        self.templates = templates if templates is not None else {}
+        self.hits = 0
+        self.misses = 0
+        self.suppliers = set()
+        self.new_suppliers = set()
+    
+    def supplier_key(self, text: str, index: "LabelIndex") -> Optional[str]:
+        """
+        Codul fiscal al furnizorului (fără prefixul RO), căutat doar în blocul
+        VANZATOR; None dacă nu apare acolo (un cod fiscal de altundeva, ex: al
+        clientului, ar amesteca șabloanele a doi furnizori diferiți)
+        """
+        start = index.first.get('vanzator')
+        if start is None:
+            return None
+        end = start + SUPPLIER_ID_WINDOW
+        buyer = _BUYER_LABEL_RE.search(text, start, end)
+        if buyer:
+            end = buyer.start()
+        match = _SUPPLIER_ID_RE.search(text, start, end)
+        return match.group(1) if match else None
+    
+    def get(self, supplier: str) -> Dict[str, int]:
+        """Șablonul furnizorului (câmp -> pattern); gol pentru un furnizor nou"""
+        return self.templates.get(supplier, {})
+    
+    def record(self, supplier: str, found: Dict[str, int], lookups: int, hits: int) -> None:
+        """
+        Înregistrează rezultatul unei facturi și actualizează șablonul furnizorului
+        
+        Args:
+            supplier: Codul fiscal al furnizorului
+            found: câmp -> numărul pattern-ului care l-a găsit
+            lookups: Câte câmpuri au fost căutate întâi cu pattern-ul din șablon
+            hits: Câte dintre acestea au fost găsite direct cu pattern-ul din șablon
+        """
+        self.suppliers.add(supplier)
+        template = self.templates.get(supplier)
+        if template is None:
+            template = self.templates[supplier] = {}
+            self.new_suppliers.add(supplier)
+        template.update(found)
+        self.hits += hits
+        self.misses += lookups - hits
+    
+    def replay(self, outcomes: Iterable[Tuple[str, Dict[str, int], int, int]]) -> None:
+        """Înregistrează rezultatele calculate de un proces worker (vezi InvoiceDataExtractor.record_template_outcome)"""
+        for outcome in outcomes:
+            self.record(*outcome)
+    
+    def hit_rate(self) -> Optional[float]:
+        """Procentul câmpurilor găsite direct cu pattern-ul din șablon"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups * 100 if lookups else None
+    
+    @classmethod
+    def load(cls, path: Path) -> "SupplierTemplates":
+        """Citește șabloanele salvate; un fișier lipsă sau de altă versiune înseamnă șabloane goale"""
+        try:
+            with open(path, encoding='utf-8') as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            print(f"Atenție: șabloanele din {path} nu au putut fi citite ({e}); se creează din nou")
+            return cls()
+        # Numerele pattern-urilor sunt valabile doar pentru aceeași versiune a extractorului
+        if not isinstance(saved, dict) or saved.get('version') != EXTRACTOR_VERSION:
+            return cls()
+        return cls(saved.get('suppliers', {}))
+    
+    def save(self, path: Path) -> None:
+        """Salvează șabloanele (scriere atomică, prin fișier temporar)"""
+        temp_path = Path(str(path) + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': EXTRACTOR_VERSION, 'suppliers': self.templates},
+                      file, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+def available_backends() -> List[str]:
+    """Întoarce backend-urile de extragere a textului instalate pe sistem"""
+    available = {
+        'pypdf2': True,
+        'pypdfium2': module_available("pypdfium2"),
+        'pdfminer': module_available("pdfminer"),
+        'pdftotext': shutil.which("pdftotext") is not None,
+    }
+    return [backend for backend in TEXT_BACKENDS if available[backend]]
+
+
+# Conținutul unui PDF aflat în memorie (un mmap.mmap este acceptat ca orice buffer)
+PdfBuffer = Union[bytes, bytearray, memoryview]
+
+
+def pdf_bytes(document: PdfBuffer) -> bytes:
+    """
+    Conținutul unui PDF din memorie, ca bytes
+    
+    bytes este folosit direct; pentru bytearray, memoryview sau un fișier
+    mapat (mmap) se face o singură copie, ca backend-urile și procesele
+    worker să primească un obiect nemodificabil.
+    """
+    if isinstance(document, bytes):
+        return document
+    try:
+        return bytes(memoryview(document))
+    except TypeError:
+        raise TypeError(f"Se așteaptă conținutul PDF-ului (bytes, memoryview, mmap), nu {type(document).__name__}")
+
+
+def new_trace() -> Dict:
+    """
+    Creează structura în care se măsoară procesarea unui fișier
+    
+    trace["stages"]: etapă -> secunde; trace["fields"]: câmp -> (secunde,
+    numărul pattern-ului care a potrivit sau 0, pattern-uri rulate)
+    """
+    return {'stages': {}, 'fields': {}}
+
+
+def add_stage_time(trace: Dict, stage: str, seconds: float) -> None:
+    """Adaugă timpul unei etape în trace"""
+    stages = trace['stages']
+    stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+class RunStats:
+    """
+    Statistici de timp pentru o rulare: pe etape, pe câmpuri și cele mai lente fișiere
+    
+    Primește trace-urile fișierelor procesate (vezi new_trace) și le agregă;
+    costul este de câteva operații per fișier, iar când măsurarea nu este
+    activă extractorul nu creează deloc trace-uri.
+    """
+    
+    def __init__(self, slowest: int = 10):
+        self.slowest = slowest
+        self.files = 0
+        self.stage_times = {}
+        self.field_times = {}
+        self.field_tried = {}
+        # câmp -> {numărul pattern-ului (0 = negăsit): număr de fișiere}
+        self.field_matches = {}
+        # heap cu cele mai lente fișiere: (timp total, nume, etape)
+        self.slowest_files = []
+    
+    def add_file(self, filename: str, trace: Dict) -> None:
+        """Adaugă trace-ul unui fișier procesat"""
+        self.files += 1
+        for stage, seconds in trace['stages'].items():
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + seconds
+        for field, (seconds, number, tried) in trace['fields'].items():
+            self.field_times[field] = self.field_times.get(field, 0.0) + seconds
+            self.field_tried[field] = self.field_tried.get(field, 0) + tried
+            matches = self.field_matches.setdefault(field, {})
+            matches[number] = matches.get(number, 0) + 1
+        
+        total = sum(trace['stages'].values())
+        entry = (total, filename, dict(trace['stages']))
+        if len(self.slowest_files) < self.slowest:
+            heapq.heappush(self.slowest_files, entry)
+        elif self.slowest_files and total > self.slowest_files[0][0]:
+            heapq.heapreplace(self.slowest_files, entry)
+    
+    def print_report(self) -> None:
+        """Afișează raportul de timpi"""
+        if not self.files:
+            return
+        
+        total = sum(self.stage_times.values())
+        print("\nTIMPI PE ETAPE:")
+        for stage, seconds in sorted(self.stage_times.items(), key=lambda item: -item[1]):
+            share = seconds / total * 100 if total else 0
+            print(f"  {stage:<16} {seconds:9.3f} s  {share:5.1f}%  "
+                  f"medie {seconds / self.files * 1000:8.3f} ms/fișier")
+        
+        if self.field_times:
+            print("\nTIMPI PE CÂMPURI:")
+            for field, seconds in sorted(self.field_times.items(), key=lambda item: -item[1]):
+                matches = self.field_matches[field]
+                searched = sum(matches.values())
+                found = ", ".join(f"#{number}: {count}" for number, count in sorted(matches.items()) if number)
+                missing = matches.get(0, 0)
+                print(f"  {field:<14} {seconds * 1000:9.3f} ms  "
+                      f"pattern-uri rulate {self.field_tried[field] / searched:4.1f}/fișier  "
+                      f"potrivite: {found or '-'}" + (f", negăsit: {missing}" if missing else ""))
+        
+        print(f"\nCELE MAI LENTE {len(self.slowest_files)} FIȘIERE:")
+        for seconds, filename, stages in sorted(self.slowest_files, reverse=True):
+            details = ", ".join(f"{stage} {value * 1000:.1f}" for stage, value in stages.items())
+            print(f"  {filename}: {seconds * 1000:.1f} ms ({details})")
+
+
+# Extractorul folosit de fiecare proces din pool (setat o singură dată la pornire)
+_worker_extractor = None
+
+
+def _init_worker(extractor: "InvoiceDataExtractor") -> None:
+    """Inițializează procesul worker cu o copie a extractorului"""
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _parse_in_worker(pdf_path: Path, content: Optional[bytes] = None
+                     ) -> Tuple[Optional[str], str, InvoiceRecord, Optional[Dict]]:
+    """Rulează extragerea textului și a datelor într-un proces worker"""
+    # Rezultatele șabloanelor ajung în procesul principal prin trace
+    traced = _worker_extractor.timings is not None or _worker_extractor.templates is not None
+    trace = new_trace() if traced else None
+    try:
+        text, data = _worker_extractor.parse_pdf(pdf_path, trace, content)
+        return None, text, data, trace
+    except Exception as e:
+        return f"Eroare: {str(e)}", "", InvoiceRecord(), trace
+
+
+def _ocr_in_worker(pdf_path: Path) -> Tuple[Optional[str], str, InvoiceRecord, Optional[Dict]]:
+    """Rulează extragerea cu OCR pentru paginile fără text, într-un proces al pool-ului OCR"""
+    ocr = _worker_extractor.ocr
+    pages, cached = ocr.pages, ocr.cached
+    trace = new_trace()
+    try:
+        text, data = _worker_extractor.parse_pdf(pdf_path, trace, ocr=True)
+        error = None
+    except Exception as e:
+        text, data, error = "", InvoiceRecord(), f"Eroare OCR: {str(e)}"
+    # Numărătorile ajung în procesul principal prin trace
+    trace['ocr'] = (ocr.pages - pages, ocr.cached - cached)
+    return error, text, data, trace
+
+
+def _parse_batch_in_worker(pdf_paths: List[Path], contents: Optional[List[Optional[bytes]]] = None
+                           ) -> List[Tuple[Optional[str], str, InvoiceRecord, Optional[Dict]]]:
+    """Rulează _parse_in_worker pentru un lot de fișiere (mai puține mesaje între procese)"""
+    if contents is None:
+        contents = [None] * len(pdf_paths)
+    return [_parse_in_worker(pdf_path, content) for pdf_path, content in zip(pdf_paths, contents)]
+
+
+def _supervised_worker(conn, extractor: "InvoiceDataExtractor") -> None:
+    """Bucla unui proces supravegheat: primește căi, trimite rezultatele _parse_in_worker"""
+    _init_worker(extractor)
+    while True:
+        try:
+            pdf_path = conn.recv()
+        except EOFError:
+            break
+        if pdf_path is None:
+            break
+        conn.send(_parse_in_worker(pdf_path))
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """Memoria rezidentă (RSS) a unui proces în bytes, din /proc; None dacă nu este disponibilă"""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SupervisedPool:
+    """
+    Procese worker supravegheate, cu limită de timp și de memorie per fișier
+    
+    Fiecare proces primește câte un singur fișier. Dacă extragerea depășește
+    timeout-ul sau memoria (RSS, citită din /proc - doar pe Linux), procesul
+    este oprit, fișierul primește o eroare cu motivul opririi, iar în locul
+    procesului este pornit altul. Un fișier problematic ocupă deci un singur
+    proces cel mult timeout secunde.
+    """
+    
+    def __init__(self, extractor: "InvoiceDataExtractor", workers: int,
+                 timeout: Optional[float] = None, max_rss_mb: Optional[int] = None):
+        self.extractor = extractor
+        self.timeout = timeout
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.context = multiprocessing.get_context()
+        # motiv -> numărul de fișiere oprite (timeout, memory, crash)
+        self.kills = {'timeout': 0, 'memory': 0, 'crash': 0}
+        self.workers = [self.start_worker() for _ in range(max(1, workers))]
+    
+    def start_worker(self) -> Dict:
+        """Pornește un proces worker nou"""
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=_supervised_worker, args=(child_conn, self.extractor),
+                                       daemon=True)
+        process.start()
+        child_conn.close()
+        return {'process': process, 'conn': parent_conn, 'task': None, 'started': 0.0}
+    
+    def idle(self) -> bool:
+        """Există un proces liber?"""
+        return any(worker['task'] is None for worker in self.workers)
+    
+    def submit(self, task, pdf_path: Path) -> None:
+        """Trimite un fișier unui proces liber; task este întors împreună cu rezultatul"""
+        worker = next(worker for worker in self.workers if worker['task'] is None)
+        worker['conn'].send(pdf_path)
+        worker['task'] = task
+        worker['started'] = time.monotonic()
+    
+    def wait(self, timeout: float = SUPERVISOR_POLL_INTERVAL) -> List[Tuple]:
+        """
+        Așteaptă rezultate cel mult timeout secunde și aplică limitele
+        
+        Returns:
+            Lista (task, rezultat), unde rezultatul are forma celui din
+            _parse_in_worker; fișierele oprite primesc un rezultat cu eroare
+        """
+        busy = [worker for worker in self.workers if worker['task'] is not None]
+        if not busy:
+            return []
+        ready = multiprocessing.connection.wait([worker['conn'] for worker in busy], timeout)
+        
+        results = []
+        now = time.monotonic()
+        for worker in busy:
+            if worker['conn'] in ready:
+                try:
+                    result = worker['conn'].recv()
+                except (EOFError, OSError):
+                    worker['process'].join(1)
+                    results.append(self.replace(
+                        worker, 'crash',
+                        f"Proces oprit: extragerea s-a oprit neașteptat (cod {worker['process'].exitcode})"))
+                    continue
+                results.append((worker['task'], result))
+                worker['task'] = None
+            elif self.timeout is not None and now - worker['started'] > self.timeout:
+                results.append(self.replace(
+                    worker, 'timeout', f"Timeout: extragerea a depășit {self.timeout:g} s"))
+            elif self.max_rss is not None:
+                rss = process_rss(worker['process'].pid)
+                if rss is not None and rss > self.max_rss:
+                    results.append(self.replace(
+                        worker, 'memory',
+                        f"Memorie depășită: {rss // (1024 * 1024)} MB "
+                        f"(limita {self.max_rss // (1024 * 1024)} MB)"))
+        return results
+    
+    def replace(self, worker: Dict, reason: str, message: str) -> Tuple:
+        """Oprește procesul unui fișier problematic și pornește altul în locul lui"""
+        task = worker['task']
+        worker['process'].kill()
+        worker['process'].join()
+        worker['conn'].close()
+        self.kills[reason] += 1
+        self.workers[self.workers.index(worker)] = self.start_worker()
+        return task, (message, "", InvoiceRecord(), None)
+    
+    def close(self) -> None:
+        """Oprește procesele; cele care încă lucrează sunt oprite forțat"""
+        for worker in self.workers:
+            if worker['task'] is None:
+                try:
+                    worker['conn'].send(None)
+                except OSError:
+                    pass
+            else:
+                worker['process'].kill()
+        for worker in self.workers:
+            worker['process'].join(5)
+            if worker['process'].is_alive():
+                worker['process'].kill()
+                worker['process'].join()
+            worker['conn'].close()
+
+
+class ExtractionCache:
+    """
+    Cache persistent (SQLite) pentru textul și datele extrase din PDF-uri
+    
+    Intrările sunt indexate după hash-ul SHA-256 al conținutului și versiunea
+    extractorului (inclusiv opțiunile care influențează rezultatul, ex:
+    "1:templates"). Un index separat (cale, dimensiune, mtime) -> hash evită
+    recitirea fișierelor neschimbate. Intrările scrise de o altă versiune a
+    codului (EXTRACTOR_VERSION) sunt eliminate; cele ale altor opțiuni sunt
+    păstrate, ca rulările cu opțiuni diferite pe același folder să nu își
+    șteargă reciproc cache-ul. Când dimensiunea totală a textelor depășește
+    max_bytes, se elimină intrările folosite cel mai demult, indiferent de opțiuni.
+    """
+    
+    def __init__(self, db_path: Path, max_bytes: int = 512 * 1024 * 1024,
+                 version: str = EXTRACTOR_VERSION):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                digest TEXT NOT NULL,
+                version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (digest, version)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+        """)
+    
+    def file_digest(self, pdf_path: Path) -> str:
+        """Întoarce hash-ul conținutului, recalculat doar dacă fișierul s-a schimbat"""
+        stat = pdf_path.stat()
+        key = str(pdf_path.resolve())
+        digest = self.known_digest(key, stat)
+        if digest is not None:
+            return digest
+        
+        sha = hashlib.sha256()
+        with open(pdf_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        self.remember_digest(key, stat, digest)
+        return digest
+    
+    def known_digest(self, key: str, stat: os.stat_result) -> Optional[str]:
+        """Hash-ul memorat pentru calea absolută key, dacă fișierul nu s-a schimbat"""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        return None
+    
+    def remember_digest(self, key: str, stat: os.stat_result, digest: str) -> None:
+        """Memorează hash-ul conținutului pentru calea absolută key"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, digest)
+        )
+    
+    def get(self, digest: str) -> Optional[Tuple[str, InvoiceRecord]]:
+        """Întoarce (text, date) din cache sau None"""
+        row = self.conn.execute(
+            "SELECT text, data FROM entries WHERE digest = ? AND version = ?",
+            (digest, self.version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE entries SET last_used = ? WHERE digest = ? AND version = ?",
+            (time.time(), digest, self.version)
+        )
+        return row[0], InvoiceRecord.from_extracted(decode_extracted(json.loads(row[1])))
+    
+    def put(self, digest: str, text: str, data: InvoiceRecord) -> None:
+        """Salvează textul și datele extrase pentru un hash"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (digest, version, text, data, size, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, self.version, text, json.dumps(data.to_dict(), ensure_ascii=False, default=encode_extracted),
+             len(text.encode('utf-8')), time.time())
+        )
+    
+    def evict(self) -> int:
+        """Elimină intrările altor versiuni ale codului, apoi pe cele vechi până sub max_bytes"""
+        code_version = self.version.split(":", 1)[0]
+        removed = self.conn.execute(
+            "DELETE FROM entries WHERE version != ? AND substr(version, 1, ?) != ?",
+            (code_version, len(code_version) + 1, code_version + ":")
+        ).rowcount
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return removed
+        
+        # Parcurge intrările de la cea mai veche și le șterge până la încadrarea în limită
+        cutoff = None
+        for size, last_used in self.conn.execute(
+                "SELECT size, last_used FROM entries ORDER BY last_used"):
+            total -= size
+            cutoff = last_used
+            if total <= self.max_bytes:
+                break
+        removed += self.conn.execute(
+            "DELETE FROM entries WHERE last_used <= ?", (cutoff,)
+        ).rowcount
+        return removed
+    
+    def commit(self) -> None:
+        """Aplică limita de dimensiune și salvează modificările pe disc"""
+        self.evict()
+        self.conn.commit()
+    
+    def close(self) -> None:
+        """Salvează și închide cache-ul"""
+        self.commit()
+        self.conn.close()
+
+
+class DuplicateIndex:
+    """
+    Index persistent (SQLite) al facturilor procesate, pentru detectarea duplicatelor
+    
+    Fiecare factură este căutată după hash-ul SHA-256 al conținutului (duplicat
+    exact: același fișier retrimis sub alt nume) și după cheia (furnizor, data
+    emiterii, total plată) (duplicat probabil: aceeași factură, ex: rescanată
+    sau regenerată). Ambele căutări sunt pe chei primare, deci costul per
+    fișier nu crește cu numărul facturilor din index. Un fișier găsit în index
+    la aceeași cale nu este duplicat (este o rulare nouă peste același folder).
+    Cu dry_run indexul nu este modificat: facturile rulării curente sunt
+    ținute doar în tranzacția deschisă, care nu este salvată niciodată.
+    Poate fi folosit din mai multe thread-uri (modul --pipeline).
+    """
+    
+    def __init__(self, db_path: Path, dry_run: bool = False):
+        self.db_path = Path(db_path)
+        self.dry_run = dry_run
+        # Duplicatele găsite în rularea curentă, pe tipuri
+        self.counts = dict.fromkeys(DUPLICATE_KINDS, 0)
+        self.lock = threading.Lock()
+        if dry_run and not self.db_path.exists():
+            # Nici fișierul indexului nu este creat
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS contents (
+                digest TEXT PRIMARY KEY,
+                path TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS invoices (
+                supplier TEXT NOT NULL,
+                issue_date TEXT NOT NULL,
+                total TEXT NOT NULL,
+                path TEXT NOT NULL,
+                PRIMARY KEY (supplier, issue_date, total)
+            );
+        """)
+    
+    @staticmethod
+    def invoice_key(data: InvoiceRecord) -> Optional[Tuple[str, str, str]]:
+        """Cheia (furnizor, data emiterii, total) normalizată; None dacă lipsește o parte"""
+        if not data.company_name or data.issue_date is None or data.total_payment is None:
+            return None
+        supplier = _WHITESPACE_RE.sub(' ', data.company_name).strip().casefold()
+        return supplier, data.issue_date.isoformat(), format(data.total_payment.normalize(), 'f')
+    
+    def check(self, path: str, digest: str, data: InvoiceRecord) -> Optional[Tuple[str, str]]:
+        """
+        Caută factura în index și o adaugă, dacă nu este duplicat
+        
+        Args:
+            path: Calea absolută a fișierului
+            digest: Hash-ul conținutului
+            data: Datele extrase
+            
+        Returns:
+            (tip, calea fișierului original) sau None dacă factura nu a mai fost văzută
+        """
+        key = self.invoice_key(data)
+        with self.lock:
+            row = self.conn.execute("SELECT path FROM contents WHERE digest = ?", (digest,)).fetchone()
+            if row is not None and row[0] != path:
+                self.counts['exact'] += 1
+                return 'exact', row[0]
+            
+            if key is not None:
+                row = self.conn.execute(
+                    "SELECT path FROM invoices WHERE supplier = ? AND issue_date = ? AND total = ?", key
+                ).fetchone()
+                if row is not None and row[0] != path:
+                    # Același conținut trimis din nou va fi un duplicat exact al acestui fișier
+                    self.conn.execute("INSERT OR IGNORE INTO contents (digest, path) VALUES (?, ?)",
+                                      (digest, path))
+                    self.counts['probabil'] += 1
+                    return 'probabil', row[0]
+            
+            self.conn.execute("INSERT OR REPLACE INTO contents (digest, path) VALUES (?, ?)", (digest, path))
+            if key is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO invoices (supplier, issue_date, total, path) VALUES (?, ?, ?, ?)",
+                    key + (path,)
+                )
+            return None
+    
+    def commit(self) -> None:
+        if self.dry_run:
+            return
+        with self.lock:
+            self.conn.commit()
+    
+    def close(self) -> None:
+        """Salvează (fără dry_run) și închide indexul"""
+        self.commit()
+        self.conn.close()
+
+
+class OcrEngine:
+    """
+    OCR cu Tesseract pentru paginile fără text (facturi scanate)
+    
+    Paginile sunt randate în tonuri de gri (cu pypdfium2 sau pdftoppm) și
+    trimise pe stdin la tesseract. Textul recunoscut este păstrat într-un
+    cache SQLite indexat după hash-ul imaginii paginii și limbi, deci o pagină
+    este recunoscută o singură dată, chiar dacă apare din nou în alt fișier.
+    OCR-ul rulează doar în procesele pool-ului OCR (vezi iter_ocr_analyses);
+    fiecare proces își deschide propria conexiune la cache.
+    """
+    
+    def __init__(self, cache_path: Optional[Path], languages: str = OCR_LANGUAGES,
+                 dpi: int = OCR_DPI, workers: int = 1, timeout: Optional[float] = None):
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.languages = languages
+        self.dpi = dpi
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        # Fișierele trimise la OCR, paginile recunoscute și cele găsite în cache
+        self.files = 0
+        self.pages = 0
+        self.cached = 0
+        self.conn = None
+    
+    def __getstate__(self) -> dict:
+        # Conexiunea SQLite nu poate fi transmisă proceselor worker
+        state = self.__dict__.copy()
+        state['conn'] = None
+        return state
+    
+    @staticmethod
+    def renderer() -> Optional[str]:
+        """Programul cu care sunt randate paginile: pypdfium2, pdftoppm sau None"""
+        if module_available("pypdfium2"):
+            return "pypdfium2"
+        if shutil.which("pdftoppm") is not None:
+            return "pdftoppm"
+        return None
+    
+    @staticmethod
+    def installed_languages() -> List[str]:
+        """Limbile Tesseract instalate (lista este goală dacă tesseract lipsește)"""
+        if shutil.which("tesseract") is None:
+            return []
+        result = subprocess.run(["tesseract", "--list-langs"], capture_output=True, text=True)
+        # Antetul listei ("List of available languages ...") conține spații
+        lines = (result.stdout + result.stderr).splitlines()
+        return [line.strip() for line in lines if line.strip() and " " not in line.strip()]
+    
+    def connect(self) -> Optional[sqlite3.Connection]:
+        """Deschide cache-ul OCR (o dată per proces)"""
+        if self.conn is None and self.cache_path is not None:
+            self.conn = sqlite3.connect(str(self.cache_path), timeout=60)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages (digest TEXT PRIMARY KEY, text TEXT NOT NULL)"
+            )
+        return self.conn
+    
+    @staticmethod
+    def pgm_image(pixels: bytes, width: int, height: int, stride: int) -> bytes:
+        """Imaginea PGM (tonuri de gri, 8 biți) dintr-un bitmap cu stride octeți per rând"""
+        header = f"P5\n{width} {height}\n255\n".encode('ascii')
+        if stride == width:
+            return header + pixels
+        view = memoryview(pixels)
+        return header + b"".join(view[row * stride:row * stride + width] for row in range(height))
+    
+    def render_pages(self, pdf_path: Path, indexes: List[int],
+                     content: Optional[bytes] = None) -> Iterator[Tuple[int, bytes]]:
+        """Generează (index_pagină, imagine PGM) pentru paginile date"""
+        if self.renderer() == "pypdfium2":
+            import pypdfium2
+            document = pypdfium2.PdfDocument(content if content is not None else str(pdf_path))
+            try:
+                for index in indexes:
+                    page = document[index]
+                    try:
+                        bitmap = page.render(scale=self.dpi / 72, grayscale=True)
+                        image = self.pgm_image(bytes(bitmap.buffer), bitmap.width,
+                                               bitmap.height, bitmap.stride)
+                        bitmap.close()
+                    finally:
+                        page.close()
+                    yield index, image
+            finally:
+                document.close()
+            return
+        
+        source = "-" if content is not None else str(pdf_path)
+        for index in indexes:
+            page = str(index + 1)
+            result = subprocess.run(
+                ["pdftoppm", "-r", str(self.dpi), "-gray", "-f", page, "-l", page, "-singlefile", source],
+                input=content, capture_output=True, check=True, timeout=self.timeout)
+            yield index, result.stdout
+    
+    def recognize(self, image: bytes) -> str:
+        """Recunoaște textul unei imagini cu tesseract"""
+        # Paralelismul vine din pool-ul OCR, nu din firele de execuție ale tesseract
+        env = dict(os.environ, OMP_THREAD_LIMIT="1")
+        result = subprocess.run(
+            ["tesseract", "stdin", "stdout", "-l", self.languages, "--dpi", str(self.dpi)],
+            input=image, capture_output=True, env=env, timeout=self.timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"tesseract: {result.stderr.decode('utf-8', errors='replace').strip()}")
+        return result.stdout.decode('utf-8', errors='replace').replace('\f', '')
+    
+    def page_texts(self, pdf_path: Path, indexes: List[int],
+                   content: Optional[bytes] = None) -> Dict[int, str]:
+        """Textul recunoscut al paginilor date (index -> text), din cache când există"""
+        conn = self.connect()
+        texts = {}
+        for index, image in self.render_pages(pdf_path, indexes, content):
+            sha = hashlib.sha256(image)
+            sha.update(self.languages.encode('ascii'))
+            digest = sha.hexdigest()
+            row = None
+            if conn is not None:
+                row = conn.execute("SELECT text FROM pages WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                self.cached += 1
+                texts[index] = row[0]
+                continue
+            
+            texts[index] = self.recognize(image)
+            self.pages += 1
+            if conn is not None:
+                conn.execute("INSERT OR REPLACE INTO pages (digest, text) VALUES (?, ?)",
+                             (digest, texts[index]))
+                conn.commit()
+        return texts
+    
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class PollingWatcher:
+    """Detectează fișierele noi sau modificate din folder prin scanări periodice"""
+    
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.snapshot = self.scan()
+    
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pdf') and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def poll(self, timeout: float) -> Set[str]:
+        """Așteaptă timeout secunde și întoarce numele fișierelor noi sau modificate"""
+        time.sleep(timeout)
+        snapshot = self.scan()
+        changed = {name for name, state in snapshot.items() if self.snapshot.get(name) != state}
+        self.snapshot = snapshot
+        return changed
+    
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detectează fișierele noi din folder folosind inotify (doar Linux)"""
+    
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, folder: Path):
+        import ctypes.util
+        
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify nu este disponibil pe această platformă")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a eșuat")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(folder)), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch a eșuat")
+    
+    def poll(self, timeout: float) -> Set[str]:
+        """Așteaptă maxim timeout secunde și întoarce numele fișierelor semnalate"""
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        
+        buffer = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name.endswith(b'.pdf'):
+                changed.add(os.fsdecode(name))
+        return changed
+    
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(folder: Path, polling: bool = False):
+    """Creează un watcher inotify, cu scanare periodică dacă inotify nu e disponibil"""
+    if not polling:
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folder)
+
+
+class ExcelReportWriter:
+    """
+    Scrie raportul Excel rând cu rând (openpyxl în modul write-only)
+    
+    Rândurile de succes sunt scrise pe disc imediat ce sunt primite, deci
+    memoria folosită nu depinde de numărul de facturi. Erorile sunt păstrate
+    până la close() și adăugate la final, ca în raportul clasic.
+    """
+    
+    HEADERS = [
+        "Fișier Original",
+        "Nume Companie", 
+        "Data Emitere",
+        "Data Scadenta",
+        "Total Plata",
+        "Total TVA",
+        "Denumire Produs",
+        "Cod CPV",
+        "Cod NC8",
+        "Status",
+        "Fișier Nou"
+    ]
+    
+    COLUMN_WIDTHS = [25, 30, 15, 15, 15, 15, 25, 12, 12, 15, 30]
+    
+    # Câmpurile din datele extrase, în ordinea coloanelor 2-9
+    DATA_FIELDS = [
+        'company_name', 'issue_date', 'due_date', 'total_payment',
+        'total_vat', 'product_name', 'cpv_code', 'nc8_code'
+    ]
+    
+    # Foaia cu liniile facturilor (cu line_items=True)
+    LINE_ITEM_HEADERS = [
+        "Fișier Original",
+        "Linia",
+        "Descriere Articol",
+        "Cod CPV",
+        "Cod NC8",
+        "Cantitate",
+        "Preț Unitar",
+        "Valoare TVA"
+    ]
+    
+    LINE_ITEM_COLUMN_WIDTHS = [25, 8, 40, 12, 12, 12, 15, 15]
+    
+    def __init__(self, output_path: Path, line_items: bool = False):
+        from openpyxl import Workbook
+        
+        self.output_path = Path(output_path)
+        self.success_count = 0
+        self.pending_errors = []
+        
+        self.wb = Workbook(write_only=True)
+        self.ws = self.create_sheet("Facturi Extrase", self.HEADERS, self.COLUMN_WIDTHS)
+        self.items_ws = None
+        if line_items:
+            self.items_ws = self.create_sheet("Linii Facturi", self.LINE_ITEM_HEADERS,
+                                              self.LINE_ITEM_COLUMN_WIDTHS)
+    
+    def create_sheet(self, title: str, headers: List[str], widths: List[int]):
+        """Creează o foaie cu antetul formatat"""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        ws = self.wb.create_sheet(title)
+        
+        # Lățimea coloanelor trebuie setată înainte de primul rând
+        for col, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        
+        # Definește stilurile
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_alignment = Alignment(horizontal="center", vertical="center")
+        
+        header_row = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header_row.append(cell)
+        ws.append(header_row)
+        return ws
+    
+    def write_success(self, filename: str, message: str, data: InvoiceRecord) -> None:
+        """Scrie rândul unei facturi procesate cu succes (și liniile ei, dacă există foaia)"""
+        if data.duplicate is not None:
+            # Duplicatele nu au fișier nou; ultima coloană spune al cui duplicat sunt
+            status = DUPLICATE_KINDS[data.duplicate[0]]
+        else:
+            status = "Succes"
+        self.ws.append(
+            [filename]
+            + [data.text(field) for field in self.DATA_FIELDS]
+            + [status, data.new_file if data.new_file is not None else message]
+        )
+        self.success_count += 1
+        
+        items = data.line_items
+        if self.items_ws is not None and items:
+            for row in items.rows():
+                self.items_ws.append((filename,) + row)
+    
+    def write_error(self, filename: str, error: str) -> None:
+        """Reține o eroare; erorile sunt scrise după toate rândurile de succes"""
+        self.pending_errors.append((filename, error))
+    
+    def close(self) -> None:
+        """Scrie erorile și salvează fișierul"""
+        for filename, error in self.pending_errors:
+            self.ws.append([filename] + ["N/A"] * len(self.DATA_FIELDS) + ["Eroare", error])
+        self.wb.save(self.output_path)
+
+
+# Coloanele înregistrărilor scrise de RecordSink, cu tipul fiecăreia
+RECORD_COLUMNS = {
+    'file': 'text',
+    'status': 'text',
+    'company_name': 'text',
+    'issue_date': 'date',
+    'due_date': 'date',
+    'total_payment': 'decimal',
+    'total_vat': 'decimal',
+    'product_name': 'text',
+    'cpv_code': 'text',
+    'nc8_code': 'text',
+    'new_file': 'text',
+    'error': 'text',
+    'duplicate_of': 'text',
+}
+
+
+def parse_invoice_date(value: Optional[str]) -> Optional[date]:
+    """Transformă o dată extrasă (într-unul din DATE_FORMATS) în date; None dacă nu se poate"""
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_amount(value: Optional[str]) -> Optional[Decimal]:
+    """Transformă o sumă extrasă în Decimal; None dacă nu este un număr"""
+    if not value:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def invoice_record(filename: str, message: str, data: InvoiceRecord,
+                   success: bool = True) -> Dict:
+    """
+    Construiește înregistrarea unui rezultat (coloanele din RECORD_COLUMNS)
+    
+    Datele și sumele vin deja tipizate din InvoiceRecord; valorile care nu au
+    putut fi convertite sunt None.
+    """
+    record = dict.fromkeys(RECORD_COLUMNS)
+    record['file'] = filename
+    record['status'] = "succes" if success else "eroare"
+    for field in ExcelReportWriter.DATA_FIELDS:
+        record[field] = getattr(data, field)
+    if data.duplicate is not None:
+        record['status'] = DUPLICATE_KINDS[data.duplicate[0]].lower()
+        record['duplicate_of'] = data.duplicate[1]
+    elif success:
+        record['new_file'] = data.new_file
+    else:
+        record['error'] = message
+    return record
+
+
+class RecordSink(ABC):
+    """
+    Destinație care primește rezultatele ca înregistrări tipizate (vezi invoice_record)
+    
+    Are aceeași interfață ca ExcelReportWriter (write_success, write_error,
+    close); clasele derivate implementează write_record și close.
+    """
+    
+    FORMAT_NAME = ""
+    # Coloanele înregistrărilor și zecimalele păstrate pentru sume (Parquet)
+    COLUMNS = RECORD_COLUMNS
+    DECIMAL_PLACES = 2
+    
+    def __init__(self, output_path: Path):
+        self.output_path = Path(output_path)
+        self.count = 0
+    
+    def write_success(self, filename: str, message: str, data: InvoiceRecord) -> None:
+        """Scrie înregistrarea unei facturi procesate cu succes"""
+        self.write_record(invoice_record(filename, message, data))
+        self.count += 1
+    
+    def write_error(self, filename: str, error: str) -> None:
+        """Scrie înregistrarea unei erori"""
+        self.write_record(invoice_record(filename, error, InvoiceRecord(), success=False))
+        self.count += 1
+    
+    @abstractmethod
+    def write_record(self, record: Dict) -> None:
+        """Scrie o înregistrare"""
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Scrie pe disc înregistrările rămase și închide fișierul"""
+
+
+def _json_value(value) -> str:
+    """Codifică o valoare JSON; Decimal este scris ca număr, fără pierderi de precizie"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return f'"{value.isoformat()}"'
+    return json.dumps(value, ensure_ascii=False)
+
+
+class JsonLinesSink(RecordSink):
+    """Scrie câte un obiect JSON pe linie (datele ca YYYY-MM-DD, sumele ca numere)"""
+    
+    FORMAT_NAME = "JSON Lines"
+    
+    def __init__(self, output_path: Path):
+        super().__init__(output_path)
+        self.file = open(self.output_path, 'w', encoding='utf-8')
+    
+    def write_record(self, record: Dict) -> None:
+        fields = ", ".join(f'"{column}": {_json_value(value)}' for column, value in record.items())
+        self.file.write("{" + fields + "}\n")
+    
+    def close(self) -> None:
+        self.file.close()
+
+
+class CsvSink(RecordSink):
+    """Scrie un CSV cu antet (datele ca YYYY-MM-DD, sumele cu punct zecimal, gol pentru None)"""
+    
+    FORMAT_NAME = "CSV"
+    
+    def __init__(self, output_path: Path):
+        super().__init__(output_path)
+        self.file = open(self.output_path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.COLUMNS)
+    
+    def write_record(self, record: Dict) -> None:
+        self.writer.writerow([
+            value.isoformat() if isinstance(value, date) else value
+            for value in record.values()
+        ])
+    
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetSink(RecordSink):
+    """
+    Scrie un fișier Parquet (necesită pyarrow), câte un row group la ROW_GROUP_SIZE rânduri
+    
+    Datele sunt de tip date32, sumele decimal128(18, DECIMAL_PLACES); sumele
+    cu mai multe zecimale sunt rotunjite.
+    """
+    
+    FORMAT_NAME = "Parquet"
+    ROW_GROUP_SIZE = 10000
+    
+    def __init__(self, output_path: Path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Exportul Parquet necesită pyarrow (pip install pyarrow)")
+        super().__init__(output_path)
+        self.pyarrow = pyarrow
+        types = {
+            'text': pyarrow.string(),
+            'int': pyarrow.int64(),
+            'date': pyarrow.date32(),
+            'decimal': pyarrow.decimal128(18, self.DECIMAL_PLACES),
+        }
+        self.schema = pyarrow.schema([(column, types[kind]) for column, kind in self.COLUMNS.items()])
+        self.writer = pyarrow.parquet.ParquetWriter(str(self.output_path), self.schema)
+        self.quantum = Decimal(1).scaleb(-self.DECIMAL_PLACES)
+        self.columns = {column: [] for column in self.COLUMNS}
+        self.buffered = 0
+    
+    def write_record(self, record: Dict) -> None:
+        for column, value in record.items():
+            if isinstance(value, Decimal):
+                value = value.quantize(self.quantum)
+            self.columns[column].append(value)
+        self.buffered += 1
+        if self.buffered >= self.ROW_GROUP_SIZE:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Scrie rândurile acumulate ca un row group"""
+        if not self.buffered:
+            return
+        self.writer.write_table(self.pyarrow.table(self.columns, schema=self.schema))
+        self.columns = {column: [] for column in self.COLUMNS}
+        self.buffered = 0
+    
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+class CheckpointJournal(RecordSink):
+    """
+    Jurnal de reluare: câte o linie JSON per fișier procesat, scrisă imediat
+    
+    Fiecare linie conține numele fișierului (ca în rapoarte), dacă a reușit,
+    mesajul și datele extrase, deci o rulare întreruptă poate fi continuată cu
+    replay_journal() fără a citi din nou PDF-urile deja procesate. Liniile sunt
+    scrise pe disc după fiecare fișier (flush) și sincronizate (fsync) la
+    fiecare SYNC_INTERVAL fișiere. Prima linie este antetul jurnalului, care
+    reține dacă rularea a fost --dry-run.
+    """
+    
+    FORMAT_NAME = "jurnalul de reluare"
+    SYNC_INTERVAL = 100
+    
+    def __init__(self, output_path: Path, append: bool = False, dry_run: bool = False):
+        super().__init__(output_path)
+        if append and self.output_path.exists():
+            self.truncate_partial_line(self.output_path)
+        self.file = open(self.output_path, 'a' if append else 'w', encoding='utf-8')
+        if self.file.tell() == 0:
+            self.file.write(json.dumps({'journal': EXTRACTOR_VERSION, 'dry_run': dry_run}) + "\n")
+            self.file.flush()
+    
+    @staticmethod
+    def truncate_partial_line(path: Path) -> None:
+        """Elimină ultima linie scrisă incomplet (ex: la o oprire bruscă), ca noile intrări să nu se lipească de ea"""
+        with open(path, 'rb+') as file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                file.seek(start)
+                newline = file.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                file.truncate(position)
+    
+    def write_success(self, filename: str, message: str, data: InvoiceRecord) -> None:
+        self.write_record({'file': filename, 'success': True, 'message': message, 'data': data.to_dict()})
+    
+    def write_error(self, filename: str, error: str) -> None:
+        self.write_record({'file': filename, 'success': False, 'message': error, 'data': {}})
+    
+    def write_record(self, record: Dict) -> None:
+        self.file.write(json.dumps(record, ensure_ascii=False, default=encode_extracted) + "\n")
+        self.file.flush()
+        self.count += 1
+        if self.count % self.SYNC_INTERVAL == 0:
+            os.fsync(self.file.fileno())
+    
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+    
+    @staticmethod
+    def header(path: Path) -> Optional[Dict]:
+        """Antetul jurnalului; None pentru un jurnal gol sau scris de o versiune fără antet"""
+        with open(path, encoding='utf-8') as file:
+            try:
+                entry = json.loads(file.readline())
+            except json.JSONDecodeError:
+                return None
+        return entry if isinstance(entry, dict) and 'journal' in entry else None
+    
+    @staticmethod
+    def read(path: Path) -> Iterator[Dict]:
+        """Generează intrările unui jurnal (fără antet); o linie scrisă incomplet este ignorată"""
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if 'file' in entry:
+                    yield entry
+
+
+# Destinațiile de date disponibile în linia de comandă
+SINK_TYPES = {
+    'jsonl': JsonLinesSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+}
+
+
+# Coloanele înregistrărilor scrise pentru liniile facturilor (vezi LineItemRecords)
+LINE_ITEM_COLUMNS = {
+    'file': 'text',
+    'line': 'int',
+    'description': 'text',
+    'cpv_code': 'text',
+    'nc8_code': 'text',
+    'quantity': 'decimal',
+    'unit_price': 'decimal',
+    'line_vat': 'decimal',
+}
+
+
+class LineItemRecords:
+    """
+    Variantă a unei destinații RecordSink care scrie câte o înregistrare per linie de factură
+    
+    Se combină cu JsonLinesSink, CsvSink sau ParquetSink; erorile nu au linii
+    și nu sunt scrise. count numără liniile scrise.
+    """
+    
+    COLUMNS = LINE_ITEM_COLUMNS
+    DECIMAL_PLACES = LINE_ITEM_SCALE
+    
+    def write_success(self, filename: str, message: str, data: InvoiceRecord) -> None:
+        items = data.line_items
+        if not items:
+            return
+        for row in items.rows():
+            self.write_record(dict(zip(self.COLUMNS, (filename,) + row)))
+        self.count += len(items)
+    
+    def write_error(self, filename: str, error: str) -> None:
+        pass
+
+
+class LineItemJsonLinesSink(LineItemRecords, JsonLinesSink):
+    FORMAT_NAME = "JSON Lines (linii facturi)"
+
+
+class LineItemCsvSink(LineItemRecords, CsvSink):
+    FORMAT_NAME = "CSV (linii facturi)"
+
+
+class LineItemParquetSink(LineItemRecords, ParquetSink):
+    FORMAT_NAME = "Parquet (linii facturi)"
+
+
+# Destinațiile pentru liniile facturilor, după extensia fișierului
+LINE_ITEM_SINK_TYPES = {
+    '.jsonl': LineItemJsonLinesSink,
+    '.csv': LineItemCsvSink,
+    '.parquet': LineItemParquetSink,
+}
 
 
 class InvoiceDataExtractor:
-    def __init__(self, input_folder: str, dry_run: bool = False):
+    def __init__(self, input_folder: Optional[str] = None, dry_run: bool = False, workers: int = 1,
+                 cache: Optional[ExtractionCache] = None, lazy_pages: bool = False,
+                 page_order: str = "natural", max_pages: Optional[int] = None,
+                 output_mode: str = "copy", skip_identical: str = "size-mtime",
+                 backends: Tuple[str, ...] = ("pypdf2",),
+                 roots: Optional[List[str]] = None, recursive: bool = False,
+                 file_timeout: Optional[float] = None, max_rss_mb: Optional[int] = None,
+                 pipeline: bool = False, read_concurrency: int = 8, write_concurrency: int = 4,
+                 line_items: bool = False):
         """
         Inițializează Invoice Data Extractor
         
         Args:
-            input_folder: Folderul cu PDF-urile de procesat
+            input_folder: Folderul cu PDF-urile de procesat; None pentru extragerea
+                din memorie (analyze_bytes, analyze_many), fără acces la disc
             dry_run: Dacă True, doar afișează ce ar face fără să redenumească
+            workers: Numărul de procese folosite pentru extragerea datelor (1 = serial)
+            cache: Cache persistent pentru rezultatele extragerii (opțional)
+            lazy_pages: Dacă True, extrage paginile pe rând și se oprește când
+                toate câmpurile au fost găsite
+            page_order: Ordinea paginilor: "natural" sau "edges" (prima, ultima,
+                a doua, penultima, ...)
+            max_pages: Numărul maxim de pagini citite dintr-un PDF (None = toate)
+            output_mode: Cum se creează fișierul cu numele nou: copy, hardlink,
+                reflink, symlink sau rename
+            skip_identical: Cum se verifică dacă destinația existentă este deja
+                identică (none, size-mtime sau hash); cele identice nu sunt rescrise
+            backends: Backend-urile de extragere a textului, în ordinea încercării;
+                următorul este folosit doar dacă cel anterior nu găsește text
+            roots: Folderele în care se caută PDF-uri (implicit doar input_folder)
+            recursive: Dacă True, caută și în subfolderele rădăcinilor
+            file_timeout: Timpul maxim de extragere per fișier, în secunde
+            max_rss_mb: Memoria maximă (RSS) a procesului de extragere, în MB
+                (cu file_timeout sau max_rss_mb extragerea rulează în procese
+                supravegheate, vezi SupervisedPool)
+            pipeline: Dacă True, fișierele trec printr-un pipeline asyncio în care
+                citirea și scrierea fișierelor se suprapun cu parsarea (vezi run_pipeline)
+            read_concurrency: Câte fișiere sunt citite simultan în pipeline
+            write_concurrency: Câte fișiere cu nume nou sunt create simultan în pipeline
+            line_items: Dacă True, se extrag și toate liniile facturii, în
+                data.line_items (vezi LineItems)
         """
-        self.input_folder = Path(input_folder)
+        if page_order not in PAGE_ORDERS:
+            raise ValueError(f"Ordine de pagini necunoscută: {page_order}")
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Mod de ieșire necunoscut: {output_mode}")
+        if skip_identical not in SKIP_IDENTICAL_MODES:
+            raise ValueError(f"Verificare necunoscută: {skip_identical}")
+        unknown = [backend for backend in backends if backend not in TEXT_BACKENDS]
+        if unknown or not backends:
+            raise ValueError(f"Backend necunoscut: {', '.join(unknown)}")
+        missing = [backend for backend in backends if backend not in available_backends()]
+        if missing:
+            raise ValueError(f"Backend indisponibil (neinstalat): {', '.join(missing)}")
+        
+        self.input_folder = Path(input_folder) if input_folder is not None else None
+        if roots:
+            self.roots = [Path(root) for root in roots]
+        else:
+            self.roots = [self.input_folder] if self.input_folder is not None else []
+        self.recursive = recursive
+        self.file_timeout = file_timeout
+        self.max_rss_mb = max_rss_mb
+        self.pipeline = pipeline
+        self.read_concurrency = max(1, read_concurrency)
+        self.write_concurrency = max(1, write_concurrency)
+        # Fișierele oprite de supraveghere, pe motive (vezi SupervisedPool.kills)
+        self.guard_kills = {'timeout': 0, 'memory': 0, 'crash': 0}
         self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.lazy_pages = lazy_pages
+        self.line_items = line_items
+        self.page_order = page_order
+        self.max_pages = max_pages
+        self.output_mode = output_mode
+        self.skip_identical = skip_identical
+        self.backends = list(backends)
+        # Statisticile de timp (RunStats); None = măsurarea este dezactivată
+        self.timings = None
+        # Șabloanele furnizorilor (SupplierTemplates); None = dezactivate
+        self.templates = None
+        # OCR pentru paginile fără text (OcrEngine); None = dezactivat
+        self.ocr = None
+        # Indexul facturilor deja văzute (DuplicateIndex); None = fără detectarea duplicatelor
+        self.duplicates = None
         self.processed_files = []
         self.errors = []
+        self.success_count = 0
+        self.error_count = 0
+        # Numele fișierelor deja procesate (folosit de modul watch)
+        self.handled_files = set()
+        # Procesele worker păstrate între loturi de modul watch (vezi
+        # start_worker_pool); None = fiecare rulare pornește procesele ei
+        self.worker_pool = None
+        # Dacă este False, rezultatele de succes nu sunt păstrate în memorie
+        # (ex: când sunt scrise direct de un ExcelReportWriter)
+        self.keep_results = True
+        # Destinații care primesc fiecare rezultat imediat ce este produs
+        self.sinks = []
         
-        if not self.input_folder.exists():
+        if self.input_folder is not None and not self.input_folder.exists():
             raise FileNotFoundError(f"Folderul {input_folder} nu există")
     
-    def extract_text_pypdf2(self, pdf_path: Path) -> str:
+    def __getstate__(self) -> dict:
+        # Conexiunea SQLite și rapoartele deschise nu pot fi transmise proceselor
+        # worker; rezultatele acumulate nu le sunt necesare
+        state = self.__dict__.copy()
+        state['cache'] = None
+        state['duplicates'] = None
+        state['worker_pool'] = None
+        state['sinks'] = []
+        state['processed_files'] = []
+        state['errors'] = []
+        state['handled_files'] = set()
+        return state
+    
+    def page_sequence(self, page_count: int) -> List[int]:
+        """Întoarce indicii paginilor în ordinea de citire configurată"""
+        if self.page_order == "edges":
+            # Prima, ultima, a doua, penultima, ... (labelurile sunt de obicei la capete)
+            order = []
+            low, high = 0, page_count - 1
+            while low <= high:
+                order.append(low)
+                if high != low:
+                    order.append(high)
+                low, high = low + 1, high - 1
+        else:
+            order = list(range(page_count))
+        
+        if self.max_pages is not None:
+            order = order[:self.max_pages]
+        return order
+    
+    def open_pdf(self, pdf_path: Path, content: Optional[bytes] = None):
+        """Deschide PDF-ul pentru citire: din conținutul deja citit, dacă este dat, altfel de pe disc"""
+        if content is not None:
+            return io.BytesIO(content)
+        return open(pdf_path, 'rb')
+    
+    def iter_pages_pypdf2(self, pdf_path: Path, content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Generează (index_pagină, text) folosind PyPDF2, extrăgând paginile la cerere
+        
+        Paginile sunt citite în ordinea dată de page_sequence; fișierul rămâne
+        deschis doar cât timp generatorul este consumat. Dacă este dat content
+        (conținutul PDF-ului deja citit), fișierul nu mai este citit de pe disc.
+        """
+        import PyPDF2
+        
+        with self.open_pdf(pdf_path, content) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for index in self.page_sequence(len(pdf_reader.pages)):
+                yield index, pdf_reader.pages[index].extract_text()
+    
+    def iter_pages_pypdfium2(self, pdf_path: Path, content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """Generează (index_pagină, text) folosind pypdfium2 (PDFium, cod nativ)"""
+        import pypdfium2
+        
+        document = pypdfium2.PdfDocument(content if content is not None else str(pdf_path))
+        try:
+            for index in self.page_sequence(len(document)):
+                page = document[index]
+                text_page = page.get_textpage()
+                try:
+                    yield index, text_page.get_text_range().replace('\r\n', '\n')
+                finally:
+                    text_page.close()
+                    page.close()
+        finally:
+            document.close()
+    
+    def iter_pages_pdfminer(self, pdf_path: Path, content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """Generează (index_pagină, text) folosind pdfminer.six"""
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        
+        resources = PDFResourceManager()
+        laparams = LAParams()
+        with self.open_pdf(pdf_path, content) as file:
+            # Documentul este parsat o singură dată; paginile sunt interpretate la cerere
+            pages = list(PDFPage.get_pages(file))
+            for index in self.page_sequence(len(pages)):
+                output = io.StringIO()
+                device = TextConverter(resources, output, laparams=laparams)
+                PDFPageInterpreter(resources, device).process_page(pages[index])
+                device.close()
+                yield index, output.getvalue().rstrip('\f')
+    
+    def iter_pages_pdftotext(self, pdf_path: Path, content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Generează (index_pagină, text) folosind pdftotext (poppler-utils)
+        
+        Documentul este convertit dintr-un singur apel (conținutul deja citit
+        este trimis pe stdin); paginile sunt separate în ieșire prin caracterul
+        form feed.
+        """
+        source = "-" if content is not None else str(pdf_path)
+        result = subprocess.run(["pdftotext", "-enc", "UTF-8", source, "-"],
+                                input=content, capture_output=True, check=True)
+        pages = result.stdout.decode('utf-8', errors='replace').split('\f')
+        if len(pages) > 1 and not pages[-1].strip():
+            pages.pop()
+        for index in self.page_sequence(len(pages)):
+            yield index, pages[index]
+    
+    def iter_pages_with(self, pdf_path: Path, backend: str,
+                        content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """Generează textul paginilor din PDF folosind backend-ul dat"""
+        return getattr(self, f"iter_pages_{backend}")(pdf_path, content)
+    
+    def iter_pages(self, pdf_path: Path, content: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Generează textul paginilor din PDF cu primul backend configurat
+        
+        Dacă un backend nu găsește text în nicio pagină (sau eșuează înainte de
+        a găsi), paginile sunt generate din nou cu următorul backend.
+        """
+        for number, backend in enumerate(self.backends, 1):
+            found = False
+            try:
+                for index, page_text in self.iter_pages_with(pdf_path, backend, content):
+                    found = found or bool(page_text.strip())
+                    yield index, page_text
+            except Exception as e:
+                if found or number == len(self.backends):
+                    raise
+                print(f"Eroare la extragerea textului cu {TEXT_BACKENDS[backend]} din {pdf_path}: {e}")
+                continue
+            if found:
+                return
+    
+    def join_pages(self, pages: Dict[int, str]) -> str:
+        """Reconstruiește textul documentului din paginile extrase, în ordinea lor"""
+        return "".join(pages[index] + "\n" for index in sorted(pages))
+    
+    def extract_text_pypdf2(self, pdf_path: Path, content: Optional[bytes] = None) -> str:
         """Extrage text din PDF folosind PyPDF2"""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return self.join_pages(dict(self.iter_pages_pypdf2(pdf_path, content)))
         except Exception as e:
             print(f"Eroare la extragerea textului cu PyPDF2 din {pdf_path}: {e}")
             return ""
     
-    def extract_text(self, pdf_path: Path) -> str:
-        """Extrage text din PDF folosind PyPDF2"""
-        return self.extract_text_pypdf2(pdf_path)
+    def extract_text_with(self, pdf_path: Path, backend: str, content: Optional[bytes] = None) -> str:
+        """Extrage text din PDF folosind backend-ul dat"""
+        if backend == 'pypdf2':
+            return self.extract_text_pypdf2(pdf_path, content)
+        try:
+            return self.join_pages(dict(self.iter_pages_with(pdf_path, backend, content)))
+        except Exception as e:
+            print(f"Eroare la extragerea textului cu {TEXT_BACKENDS[backend]} din {pdf_path}: {e}")
+            return ""
     
-    def extract_company_name(self, text: str) -> Optional[str]:
-        """Extrage numele companiei din text"""
-        patterns = [
-            # Caută "VANZATOR" urmat de numele companiei
-            r'VANZATOR\s+([A-Za-z0-9\s\.\-&]+?)(?=\s+Nume|\n)',
-            # Caută "Denumire" urmat de numele companiei
-            r'Denumire\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-            # Caută "Nume" urmat de spațiu și apoi numele companiei până la următoarea linie
-            r'Nume\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-            # Variantă mai permisivă
-            r'Nume\s+([A-Za-z0-9\s\.\-&]+?)(?=\s+[A-Z]|\n|$)',
-            # Caută pe linia următoare după "Nume"
-            r'Nume\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                company_name = match.strip()
-                company_name = re.sub(r'\s+', ' ', company_name)
-                company_name = company_name.rstrip('.')
+    def extract_pages(self, pdf_path: Path, content: Optional[bytes] = None) -> Dict[int, str]:
+        """Ca extract_text, dar păstrează textul fiecărei pagini (index -> text)"""
+        pages = {}
+        for backend in self.backends:
+            try:
+                pages = dict(self.iter_pages_with(pdf_path, backend, content))
+            except Exception as e:
+                print(f"Eroare la extragerea textului cu {TEXT_BACKENDS[backend]} din {pdf_path}: {e}")
+                pages = {}
+            if any(page_text.strip() for page_text in pages.values()):
+                break
+        return pages
+    
+    def recognize_pages(self, pdf_path: Path, indexes: List[int], content: Optional[bytes] = None,
+                        trace: Optional[Dict] = None) -> Dict[int, str]:
+        """Recunoaște prin OCR paginile date (index -> text) și măsoară etapa ocr"""
+        if trace is not None:
+            start = time.perf_counter()
+        texts = self.ocr.page_texts(pdf_path, indexes, content)
+        if trace is not None:
+            add_stage_time(trace, 'ocr', time.perf_counter() - start)
+        return texts
+    
+    def extract_text(self, pdf_path: Path, content: Optional[bytes] = None) -> str:
+        """
+        Extrage text din PDF cu backend-urile configurate, până când unul găsește text
+        
+        Dacă este dat content (conținutul PDF-ului deja citit), fișierul nu mai
+        este citit de pe disc; pdf_path este folosit doar în mesaje.
+        """
+        text = ""
+        for backend in self.backends:
+            text = self.extract_text_with(pdf_path, backend, content)
+            if text.strip():
+                break
+        return text
+    
+    def extract_lazy(self, pdf_path: Path, trace: Optional[Dict] = None,
+                     content: Optional[bytes] = None, ocr: bool = False) -> Tuple[str, InvoiceRecord]:
+        """
+        Extrage paginile pe rând până când toate câmpurile sunt găsite
+        
+        După fiecare pagină nouă se caută doar câmpurile fără o potrivire
+        definitivă, doar în pagina nouă împreună cu paginile vecine deja citite
+        (pentru un label și o valoare despărțite de sfârșitul paginii), deci
+        fiecare pagină este parcursă de un număr constant de ori. O potrivire
+        este definitivă doar dacă vine de la pattern-ul cu cea mai mare
+        prioritate (sau de la cel din șablonul furnizorului); una găsită de un
+        pattern de rezervă este păstrată doar dacă, până la ultima pagină, niciun
+        pattern mai prioritar nu găsește câmpul, deci rezultatul este același ca
+        la citirea completă. Cu ocr, paginile fără text sunt recunoscute prin OCR
+        pe măsură ce sunt citite.
+        
+        Returns:
+            Tuple (text_citit, extracted_data)
+        """
+        pages = {}
+        matches = dict.fromkeys(FIELD_ENGINE.fields, (None, 0, None))
+        # câmp -> (rangul potrivirii: 0 pentru pattern-ul din șablon, altfel
+        # numărul pattern-ului, poziția paginii noi în document)
+        ranks = {}
+        final = set()
+        supplier = None
+        # Pagina cu blocul VANZATOR rămâne în text, ca furnizorul să fie recunoscut (--templates)
+        supplier_page = None
+        try:
+            for index, page_text in self.iter_pages(pdf_path, content):
+                if ocr and not page_text.strip():
+                    page_text = self.recognize_pages(pdf_path, [index], content, trace)[index]
+                pages[index] = page_text
+                if not page_text.strip():
+                    continue
+                if supplier_page is None and self.templates is not None and 'vanzator' in _fold_case(page_text):
+                    supplier_page = index
                 
-                # Filtrează numele prea scurte, care conțin doar cifre sau care încep cu "Nr."
-                if (len(company_name) > 3 and 
-                    not company_name.isdigit() and 
-                    not company_name.startswith('Nr.')):
-                    return company_name
+                pending = [field for field in FIELD_ENGINE.fields if field not in final]
+                window = {neighbor: pages[neighbor] for neighbor in (index - 1, index, index + 1, supplier_page)
+                          if neighbor in pages}
+                window_supplier, found = FIELD_ENGINE.match_fields(self.join_pages(window), pending,
+                                                                   trace, self.templates)
+                supplier = supplier or window_supplier
+                for field, (value, number, preferred) in found.items():
+                    if not number:
+                        continue
+                    rank = (0 if number == preferred else number, index)
+                    if field not in ranks or rank < ranks[field]:
+                        ranks[field] = rank
+                        matches[field] = (value, number, preferred)
+                    # Pattern-ul din șablon sau primul pattern (fără șablon) nu poate fi depășit
+                    if rank[0] == 0 or (number == 1 and preferred is None):
+                        final.add(field)
+                if len(final) == len(matches):
+                    break
+        except Exception as e:
+            print(f"Eroare la extragerea textului din {pdf_path}: {e}")
+            return "", InvoiceRecord()
         
-        return None
+        if trace is not None:
+            # Pattern-ul raportat este cel al potrivirii păstrate, nu al ultimei căutări
+            for field, (_, number, _) in matches.items():
+                if field in trace['fields']:
+                    seconds, _, tried = trace['fields'][field]
+                    trace['fields'][field] = (seconds, number, tried)
+        self.record_template_outcome(supplier, matches, trace)
+        record = InvoiceRecord.from_extracted({field: value for field, (value, _, _) in matches.items()})
+        if self.ocr is not None and not ocr:
+            record.blank_pages = tuple(index for index in sorted(pages) if not pages[index].strip())
+        return self.join_pages(pages), record
+    
+    def extraction_version(self) -> str:
+        """Versiunea folosită ca cheie în cache (include opțiunile de citire a textului)"""
+        version = EXTRACTOR_VERSION
+        if self.lazy_pages or self.max_pages is not None:
+            mode = "lazy" if self.lazy_pages else "full"
+            version += f":{mode}:{self.page_order}:{self.max_pages}"
+        if self.backends != ["pypdf2"]:
+            version += ":" + "+".join(self.backends)
+        if self.templates is not None:
+            version += ":templates"
+        if self.line_items:
+            version += ":items"
+        if self.ocr is not None:
+            version += f":ocr:{self.ocr.languages}"
+        return version
+    
+    def extract_company_name(self, text: str) -> Optional[str]:
+        """Extrage numele companiei din text"""
+        return FIELD_ENGINE.extract_field('company_name', text)
     
     def extract_date(self, text: str, label: str) -> Optional[str]:
         """Extrage o dată specifică din text pe baza labelului"""
-        # Pattern-uri pentru date în format YYYY-MM-DD sau DD-MM-YYYY
-        date_patterns = [
-            rf'{label}\s+(\d{{4}}-\d{{2}}-\d{{2}})',
-            rf'{label}\s+(\d{{2}}-\d{{2}}-\d{{4}})',
-            rf'{label}\s+(\d{{1,2}}/\d{{1,2}}/\d{{4}})',
-            rf'{label}\s+(\d{{4}}/\d{{1,2}}/\d{{1,2}})',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _date_patterns(label):
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -100,119 +2528,56 @@ class InvoiceDataExtractor:
     
     def extract_total_payment(self, text: str) -> Optional[str]:
         """Extrage totalul plății din text"""
-        patterns = [
-            r'TOTAL\s+PLATA\s+(\d+\.?\d*)',
-            r'TOTAL\s+PAYMENT\s+(\d+\.?\d*)',
-            r'TOTAL\s+PLATA\s+(\d+,\d*)',
-            r'TOTAL\s+PAYMENT\s+(\d+,\d*)',
-            # Caută "TOTAL PLATA" urmat de număr pe linia următoare
-            r'TOTAL\s+PLATA\s*\n\s*(\d+\.?\d*)',
-            # Caută numere în contextul "TOTAL PLATA"
-            r'(\d+\.?\d*)\s*TOTAL\s+PLATA',
-            r'TOTAL\s+PLATA.*?(\d+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return match.group(1).replace(',', '.')
-        
-        return None
+        return FIELD_ENGINE.extract_field('total_payment', text)
     
     def extract_total_vat(self, text: str) -> Optional[str]:
         """Extrage totalul TVA din text"""
-        patterns = [
-            r'TOTAL\s+TVA\s+(\d+\.?\d*)\s*RON',
-            r'TOTAL\s+VAT\s+(\d+\.?\d*)\s*RON',
-            r'TOTAL\s+TVA\s+(\d+,\d*)\s*RON',
-            r'TOTAL\s+VAT\s+(\d+,\d*)\s*RON',
-            # Caută "TOTAL TVA" urmat de număr pe linia următoare
-            r'TOTAL\s+TVA\s*\n\s*(\d+\.?\d*)\s*RON',
-            # Caută numere în contextul "TOTAL TVA"
-            r'(\d+\.?\d*)\s*RON\s*TOTAL\s+TVA',
-            r'TOTAL\s+TVA.*?(\d+\.?\d*)\s*RON',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return match.group(1).replace(',', '.')
-        
-        return None
+        return FIELD_ENGINE.extract_field('total_vat', text)
     
     def extract_cpv_code(self, text: str) -> Optional[str]:
         """Extrage codul CPV din text"""
-        patterns = [
-            r'Cod\s+CPV\s+articol\s+pentru\s+linia\s+\d+\s*:\s*([A-Z0-9]+)',
-            r'Cod\s+CPV\s*:\s*([A-Z0-9]+)',
-            r'CPV\s+Code\s*:\s*([A-Z0-9]+)',
-            r'CPV\s*:\s*([A-Z0-9]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return match.group(1).strip()
-        
-        return None
+        return FIELD_ENGINE.extract_field('cpv_code', text)
     
     def extract_nc8_code(self, text: str) -> Optional[str]:
         """Extrage codul NC8 din text"""
-        patterns = [
-            r'Cod\s+NC8\s+articol\s+pentru\s+linia\s+\d+\s*:\s*([A-Z0-9]+)',
-            r'Cod\s+NC8\s*:\s*([A-Z0-9]+)',
-            r'NC8\s+Code\s*:\s*([A-Z0-9]+)',
-            r'NC8\s*:\s*([A-Z0-9]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return match.group(1).strip()
-        
-        return None
+        return FIELD_ENGINE.extract_field('nc8_code', text)
     
     def extract_product_name(self, text: str) -> Optional[str]:
         """Extrage denumirea produsului din text"""
-        patterns = [
-            # Caută în tabelul cu "Nume articol/Descriere articol"
-            r'Linia\s+1\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-            r'Nume\s+articol/Descriere\s+articol\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-            # Caută după "Linia 1" urmat de denumirea produsului
-            r'Linia\s+1\s*\n\s*([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-            # Caută în contextul tabelului de articole
-            r'1\s+([A-Za-z0-9\s\.\-&]+?)(?=\n|$)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                product_name = match.group(1).strip()
-                # Filtrează numele prea scurte sau care conțin doar cifre
-                if len(product_name) > 2 and not product_name.isdigit():
-                    return product_name
-        
-        return None
+        return FIELD_ENGINE.extract_field('product_name', text)
     
-    def extract_invoice_data(self, text: str) -> Dict[str, Optional[str]]:
+    def extract_invoice_data(self, text: str, trace: Optional[Dict] = None) -> InvoiceRecord:
         """
         Extrage toate datele din text
         
         Returns:
-            Dict cu toate datele extrase
-        """
-        data = {
-            'company_name': self.extract_company_name(text),
-            'issue_date': self.extract_date(text, 'Data emitere'),
-            'due_date': self.extract_date(text, 'Data scadenta'),
-            'total_payment': self.extract_total_payment(text),
-            'total_vat': self.extract_total_vat(text),
-            'cpv_code': self.extract_cpv_code(text),
-            'nc8_code': self.extract_nc8_code(text),
-            'product_name': self.extract_product_name(text),
-        }
+            InvoiceRecord cu toate datele extrase
+        """
+        if self.templates is None:
+            return InvoiceRecord.from_extracted(FIELD_ENGINE.extract(text, trace=trace))
+        supplier, matches = FIELD_ENGINE.match_fields(text, trace=trace, templates=self.templates)
+        self.record_template_outcome(supplier, matches, trace)
+        return InvoiceRecord.from_extracted({field: value for field, (value, _, _) in matches.items()})
+    
+    def record_template_outcome(self, supplier: Optional[str],
+                                matches: Dict[str, Tuple[Optional[str], int, Optional[int]]],
+                                trace: Optional[Dict] = None) -> None:
+        """
+        Înregistrează în șabloane rezultatul unei facturi (vezi FieldExtractionEngine.match_fields)
         
-        return data
+        Se apelează o singură dată per factură, după ce toate câmpurile au fost
+        căutate. Rezultatul este adăugat și în trace["templates"], ca procesul
+        principal să actualizeze șabloanele cu rezultatele calculate într-un worker.
+        """
+        if self.templates is None or supplier is None:
+            return
+        found = {field: number for field, (_, number, _) in matches.items() if number}
+        preferred = {field: template for field, (_, _, template) in matches.items() if template is not None}
+        hits = sum(found.get(field) == number for field, number in preferred.items())
+        outcome = (supplier, found, len(preferred), hits)
+        self.templates.record(*outcome)
+        if trace is not None:
+            trace.setdefault('templates', []).append(outcome)
     
     def sanitize_filename(self, filename: str) -> str:
         """Curăță numele fișierului de caractere invalide"""
@@ -232,7 +2597,7 @@ class InvoiceDataExtractor:
         
         return filename
     
-    def generate_new_filename(self, original_path: Path, data: Dict[str, Optional[str]]) -> Path:
+    def generate_new_filename(self, original_path: Path, data: InvoiceRecord) -> Path:
         """
         Generează noul nume de fișier pe baza datelor extrase
         
@@ -250,20 +2615,18 @@ class InvoiceDataExtractor:
         parts = []
         
         # Adaugă numele companiei dacă există
-        if data['company_name']:
-            company_part = data['company_name'][:30]  # Limitează la 30 caractere
+        if data.company_name:
+            company_part = data.company_name[:30]  # Limitează la 30 caractere
             parts.append(company_part)
         
-        # Adaugă data emitere dacă există
-        if data['issue_date']:
-            # Convertește data în format YYYY-MM-DD dacă e necesar
-            date_str = self.normalize_date(data['issue_date'])
-            if date_str:
-                parts.append(date_str)
+        # Adaugă data emitere (în format YYYY-MM-DD) dacă există și este validă
+        if data.issue_date:
+            parts.append(data.issue_date.strftime('%Y-%m-%d'))
         
-        # Adaugă totalul plății dacă există
-        if data['total_payment']:
-            parts.append(f"TOTAL_{data['total_payment']}")
+        # Adaugă totalul plății, cu textul din factură, dacă există
+        total_payment = data.text('total_payment')
+        if total_payment:
+            parts.append(f"TOTAL_{total_payment}")
         
         # Dacă nu avem date suficiente, folosește numele original
         if not parts:
@@ -279,14 +2642,7 @@ class InvoiceDataExtractor:
         """Normalizează data în format YYYY-MM-DD"""
         try:
             # Încearcă să parseze diferite formate de dată
-            formats = [
-                '%Y-%m-%d',
-                '%d-%m-%Y',
-                '%d/%m/%Y',
-                '%Y/%m/%d',
-            ]
-            
-            for fmt in formats:
+            for fmt in DATE_FORMATS:
                 try:
                     date_obj = datetime.strptime(date_str, fmt)
                     return date_obj.strftime('%Y-%m-%d')
@@ -297,66 +2653,402 @@ class InvoiceDataExtractor:
         except:
             return None
     
-    def process_pdf(self, pdf_path: Path) -> Tuple[bool, str, Dict[str, Optional[str]]]:
+    def parse_pdf(self, pdf_path: Path, trace: Optional[Dict] = None,
+                  content: Optional[bytes] = None, ocr: bool = False) -> Tuple[str, InvoiceRecord]:
+        """
+        Extrage textul și datele dintr-un PDF, fără cache și fără efecte secundare
+        
+        Args:
+            pdf_path: Calea către PDF
+            trace: Dacă este dat, se măsoară etapele extract_text și extract_fields
+            content: Conținutul PDF-ului, dacă a fost deja citit (altfel se citește pdf_path)
+            ocr: Dacă True, paginile fără text sunt recunoscute prin OCR (necesită
+                self.ocr); altfel, cu OCR activ, ele sunt doar reținute în
+                blank_pages (vezi iter_ocr_analyses)
+            
+        Returns:
+            Tuple (text, extracted_data); datele sunt goale dacă nu există text
+        """
+        if trace is not None:
+            start = time.perf_counter()
+        
+        if self.lazy_pages:
+            text, data = self.extract_lazy(pdf_path, trace, content, ocr)
+        elif self.ocr is not None:
+            pages = self.extract_pages(pdf_path, content)
+            blank_pages = [index for index in sorted(pages) if not pages[index].strip()]
+            if ocr and blank_pages:
+                pages.update(self.recognize_pages(pdf_path, blank_pages, content, trace))
+            text = self.join_pages(pages)
+            data = self.extract_invoice_data(text, trace) if text.strip() else InvoiceRecord()
+            if not ocr:
+                data.blank_pages = tuple(blank_pages)
+        else:
+            text = self.extract_text(pdf_path, content)
+            data = self.extract_invoice_data(text, trace) if text.strip() else InvoiceRecord()
+        
+        if trace is not None:
+            # În modul lazy extragerea textului și a câmpurilor alternează,
+            # deci timpul textului este diferența față de timpii câmpurilor
+            fields_time = sum(seconds for seconds, _, _ in trace['fields'].values())
+            ocr_time = trace['stages'].get('ocr', 0.0)
+            add_stage_time(trace, 'extract_text', time.perf_counter() - start - fields_time - ocr_time)
+            add_stage_time(trace, 'extract_fields', fields_time)
+        
+        if not text.strip():
+            # Paginile fără text rămân în blank_pages, pentru OCR
+            return text, data
+        
+        if self.line_items and data.has_data():
+            if trace is not None:
+                start = time.perf_counter()
+            data.line_items = extract_line_items(text)
+            if trace is not None:
+                add_stage_time(trace, 'line_items', time.perf_counter() - start)
+        return text, data
+    
+    def analysis_result(self, text: str, data: InvoiceRecord
+                        ) -> Tuple[Optional[str], InvoiceRecord]:
+        """Transformă (text, date) în rezultatul analizei (error_message, extracted_data)"""
+        if not text.strip():
+            return "Nu s-a putut extrage text din PDF", data
+        return None, data
+    
+    def cached_analysis(self, pdf_path: Path, trace: Optional[Dict] = None
+                        ) -> Tuple[Optional[str], Optional[Tuple[Optional[str], InvoiceRecord]]]:
+        """
+        Caută rezultatul analizei în cache
+        
+        Returns:
+            Tuple (digest, analysis); analysis este None dacă fișierul nu e în cache
+        """
+        if self.cache is None:
+            return None, None
+        if trace is not None:
+            start = time.perf_counter()
+        digest = self.cache.file_digest(pdf_path)
+        cached = self.cache.get(digest)
+        if trace is not None:
+            add_stage_time(trace, 'cache', time.perf_counter() - start)
+        if cached is None:
+            return digest, None
+        return digest, self.analysis_result(*cached)
+    
+    def analyze_pdf(self, pdf_path: Path, trace: Optional[Dict] = None
+                    ) -> Tuple[Optional[str], InvoiceRecord]:
+        """
+        Extrage textul și datele dintr-un PDF, folosind cache-ul dacă există
+        
+        Args:
+            pdf_path: Calea către PDF
+            trace: Dacă este dat, se măsoară etapele (vezi new_trace)
+            
+        Returns:
+            Tuple (error_message, extracted_data); error_message este None la succes
+        """
+        digest, analysis = self.cached_analysis(pdf_path, trace)
+        if analysis is not None:
+            return analysis
+        
+        text, data = self.parse_pdf(pdf_path, trace)
+        if digest is not None:
+            self.cache.put(digest, text, data)
+        return self.analysis_result(text, data)
+    
+    def analyze_bytes(self, document: PdfBuffer, name: str = "document.pdf",
+                      trace: Optional[Dict] = None) -> Tuple[Optional[str], InvoiceRecord]:
+        """
+        Extrage datele dintr-un PDF aflat în memorie, fără să citească sau să scrie fișiere
+        
+        Cache-ul (dacă există) este căutat după hash-ul conținutului, iar cu OCR
+        activ paginile fără text sunt recunoscute direct.
+        
+        Args:
+            document: Conținutul PDF-ului (bytes, bytearray, memoryview sau mmap)
+            name: Numele documentului, folosit doar în mesaje
+            trace: Dacă este dat, se măsoară etapele (vezi new_trace)
+            
+        Returns:
+            Tuple (error_message, extracted_data); error_message este None la succes
+        """
+        content = pdf_bytes(document)
+        digest = None
+        if self.cache is not None:
+            digest = hashlib.sha256(content).hexdigest()
+            cached = self.cache.get(digest)
+            if cached is not None:
+                return self.analysis_result(*cached)
+        
+        text, data = self.parse_pdf(Path(name), trace, content, ocr=self.ocr is not None)
+        if digest is not None:
+            self.cache.put(digest, text, data)
+        return self.analysis_result(text, data)
+    
+    def analyze_many(self, documents: Iterable[Union[PdfBuffer, Tuple[str, PdfBuffer]]]
+                     ) -> Iterator[Tuple[str, Optional[str], InvoiceRecord]]:
+        """
+        Generează (nume, error_message, extracted_data) pentru documente aflate în memorie
+        
+        Un document este conținutul PDF-ului sau un tuple (nume, conținut);
+        documentele fără nume primesc numele document_N.pdf. Rezultatele sunt
+        generate în ordinea de intrare. Cu mai multe procese worker, documentele
+        sunt trimise în loturi de PIPELINE_BATCH_SIZE și sunt citite din
+        documents pe măsură ce se eliberează locuri, deci documents poate fi un
+        generator (ex: atașamentele primite de la gateway-ul de e-mail).
+        """
+        def named() -> Iterator[Tuple[str, bytes]]:
+            for number, document in enumerate(documents, 1):
+                if isinstance(document, tuple):
+                    yield document[0], pdf_bytes(document[1])
+                else:
+                    yield f"document_{number}.pdf", pdf_bytes(document)
+        
+        if self.workers <= 1:
+            for name, content in named():
+                yield (name,) + self.analyze_bytes(content, name)
+            return
+        
+        window = self.workers * WORKER_QUEUE_DEPTH * PIPELINE_BATCH_SIZE
+        # Intrări [nume, conținut, digest, analiză din cache, (future, poziție în lot)]
+        in_flight = deque()
+        batch = []
+        
+        def finish(entry: List) -> Tuple[str, Optional[str], InvoiceRecord]:
+            name, content, digest, analysis, pending = entry
+            if pending is not None:
+                result = pending[0].result()[pending[1]]
+                _, analysis, _ = self.finish_analysis(Path(name), digest, None, result, None)
+                if self.ocr is not None and self.needs_ocr(analysis[1]):
+                    # OCR-ul rulează în procesul curent, ca în analyze_bytes
+                    text, data = self.parse_pdf(Path(name), None, content, ocr=True)
+                    if digest is not None:
+                        self.cache.put(digest, text, data)
+                    analysis = self.analysis_result(text, data)
+            return (name,) + analysis
+        
+        with self.worker_executor() as executor:
+            
+            def submit_batch() -> None:
+                future = executor.submit(_parse_batch_in_worker, [Path(entry[0]) for entry in batch],
+                                         [entry[1] for entry in batch])
+                for position, entry in enumerate(batch):
+                    entry[4] = (future, position)
+                batch.clear()
+            
+            for name, content in named():
+                digest, analysis = None, None
+                if self.cache is not None:
+                    digest = hashlib.sha256(content).hexdigest()
+                    cached = self.cache.get(digest)
+                    if cached is not None:
+                        analysis = self.analysis_result(*cached)
+                entry = [name, content, digest, analysis, None]
+                in_flight.append(entry)
+                if analysis is None:
+                    batch.append(entry)
+                    if len(batch) >= PIPELINE_BATCH_SIZE:
+                        submit_batch()
+                
+                while in_flight:
+                    head = in_flight[0]
+                    if head[3] is None:
+                        if head[4] is None:
+                            if len(in_flight) < window:
+                                break
+                            submit_batch()
+                        elif len(in_flight) < window and not head[4][0].done():
+                            break
+                    yield finish(in_flight.popleft())
+            
+            if batch:
+                submit_batch()
+            while in_flight:
+                yield finish(in_flight.popleft())
+    
+    def process_pdf(self, pdf_path: Path,
+                    analysis: Optional[Tuple[Optional[str], InvoiceRecord]] = None,
+                    trace: Optional[Dict] = None,
+                    log: Callable[[str], None] = print) -> Tuple[bool, str, InvoiceRecord]:
         """
         Procesează un singur PDF
         
         Args:
             pdf_path: Calea către PDF
+            analysis: Rezultatul analyze_pdf calculat deja (ex: într-un proces worker)
+            trace: Dacă este dat, se măsoară etapele (vezi new_trace)
+            log: Funcția care afișează mesajele (ex: list.append pentru a le
+                afișa mai târziu, din alt thread)
             
         Returns:
             Tuple (success, message, extracted_data)
         """
         try:
-            print(f"Procesez: {pdf_path.name}")
+            log(f"Procesez: {pdf_path.name}")
             
-            # Extrage textul
-            text = self.extract_text(pdf_path)
-            if not text.strip():
-                return False, "Nu s-a putut extrage text din PDF", {}
-            
-            # Extrage datele
-            data = self.extract_invoice_data(text)
+            # Extrage textul și datele (dacă nu au fost extrase deja)
+            if analysis is None:
+                analysis = self.analyze_pdf(pdf_path, trace)
+            error, data = analysis
+            if error:
+                return False, error, data
             
             # Afișează datele găsite
-            print(f"  Date găsite:")
-            for key, value in data.items():
+            log(f"  Date găsite:")
+            for key, value in data.text_items():
                 if value:
-                    print(f"    {key}: {value}")
+                    log(f"    {key}: {value}")
             
             # Verifică dacă am găsit cel puțin o dată
-            if not any(data.values()):
+            if not data.has_data():
                 return False, "Nu s-au găsit date în PDF", data
             
+            # Factura a mai fost văzută (alt fișier cu același conținut sau aceleași date)
+            duplicate = self.find_duplicate(pdf_path, data)
+            if duplicate is not None:
+                data.duplicate = duplicate
+                message = f"{DUPLICATE_KINDS[duplicate[0]]} al {duplicate[1]}"
+                log(f"  ⚠️  {message} - nu se copiază")
+                return True, f"{message}: nu a fost copiat", data
+            
             # Generează noul nume
+            if trace is not None:
+                start = time.perf_counter()
             new_path = self.generate_new_filename(pdf_path, data)
+            if trace is not None:
+                add_stage_time(trace, 'filename', time.perf_counter() - start)
             
             # Verifică dacă fișierul de destinație este același cu cel sursă
             if new_path == pdf_path:
-                print(f"  ℹ️  Fișierul {pdf_path.name} are deja numele corect")
+                log(f"  ℹ️  Fișierul {pdf_path.name} are deja numele corect")
+                data.new_file = pdf_path.name
                 return True, f"Fișierul are deja numele corect: {pdf_path.name}", data
             
+            data.new_file = new_path.name
+            message = f"Succes: {OUTPUT_RESULTS[self.output_mode]} {new_path.name}"
+            
             # Verifică dacă fișierul de destinație există deja
-            if new_path.exists():
-                print(f"  ⚠️  Fișierul {new_path.name} există deja - îl recreez")
+            existed = os.path.lexists(new_path)
+            if existed and self.is_identical_output(pdf_path, new_path):
+                log(f"  ✔️  Fișierul {new_path.name} există deja și este identic - nu îl rescriu")
+                return True, message, data
+            if existed:
+                log(f"  ⚠️  Fișierul {new_path.name} există deja - îl recreez")
             
-            # Creează o copie cu noul nume (suprascrie dacă există)
+            # Creează fișierul cu noul nume (suprascrie dacă există)
             if not self.dry_run:
-                shutil.copy2(pdf_path, new_path)
-                if new_path.exists():
-                    print(f"  ✅ Recreeat: {new_path.name}")
+                if trace is not None:
+                    start = time.perf_counter()
+                self.write_output(pdf_path, new_path)
+                if trace is not None:
+                    add_stage_time(trace, 'output', time.perf_counter() - start)
+                if existed:
+                    log(f"  ✅ Recreeat: {new_path.name}")
                 else:
-                    print(f"  ✅ Copiat în: {new_path.name}")
+                    log(f"  ✅ {OUTPUT_MODES[self.output_mode]}: {new_path.name}")
             else:
-                if new_path.exists():
-                    print(f"  [DRY RUN] Ar recreea: {new_path.name}")
+                if existed:
+                    log(f"  [DRY RUN] Ar recreea: {new_path.name}")
+                elif self.output_mode == 'copy':
+                    log(f"  [DRY RUN] Ar copia în: {new_path.name}")
                 else:
-                    print(f"  [DRY RUN] Ar copia în: {new_path.name}")
+                    log(f"  [DRY RUN] Ar crea ({self.output_mode}): {new_path.name}")
             
-            return True, f"Succes: copiat în {new_path.name}", data
+            return True, message, data
             
         except Exception as e:
-            return False, f"Eroare: {str(e)}", {}
+            return False, f"Eroare: {str(e)}", InvoiceRecord()
+    
+    def find_duplicate(self, pdf_path: Path, data: InvoiceRecord) -> Optional[Tuple[str, str]]:
+        """Caută factura în indexul de duplicate: (tip, numele fișierului original) sau None"""
+        if self.duplicates is None:
+            return None
+        # În modul --pipeline process_pdf rulează în thread-uri, fără acces la cache
+        if self.cache is not None and not self.pipeline:
+            digest = self.cache.file_digest(pdf_path)
+        else:
+            digest = self.file_sha256(pdf_path)
+        found = self.duplicates.check(str(pdf_path.resolve()), digest, data)
+        if found is None:
+            return None
+        return found[0], self.display_name(Path(found[1]))
+    
+    def file_sha256(self, path: Path) -> str:
+        """Calculează hash-ul SHA-256 al conținutului unui fișier"""
+        sha = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+    
+    def is_identical_output(self, pdf_path: Path, new_path: Path) -> bool:
+        """
+        Verifică dacă destinația existentă are deja conținutul sursei
+        
+        Hardlink-urile și symlink-urile către sursă sunt identice prin definiție;
+        altfel se compară dimensiunea și data modificării (copy2 și reflink le
+        păstrează) sau, cu skip_identical="hash", conținutul.
+        """
+        if self.skip_identical == "none" or self.output_mode == "rename":
+            return False
+        try:
+            if os.path.samefile(pdf_path, new_path):
+                return True
+            source, target = pdf_path.stat(), new_path.stat()
+        except OSError:
+            return False
+        
+        if source.st_size != target.st_size:
+            return False
+        if self.skip_identical == "hash":
+            return self.file_sha256(pdf_path) == self.file_sha256(new_path)
+        # Precizie de microsecunde: unele sisteme de fișiere de rețea rotunjesc mtime
+        return source.st_mtime_ns // 1000 == target.st_mtime_ns // 1000
+    
+    def write_output(self, pdf_path: Path, new_path: Path) -> None:
+        """Creează fișierul cu numele nou folosind modul de ieșire configurat"""
+        if self.output_mode == 'copy':
+            shutil.copy2(pdf_path, new_path)
+        elif self.output_mode == 'rename':
+            os.replace(pdf_path, new_path)
+        elif self.output_mode == 'reflink':
+            self.reflink_copy(pdf_path, new_path)
+        else:
+            # Legătura este creată sub un nume temporar și apoi mutată atomic peste destinație
+            temp_path = new_path.with_name(f".{new_path.name}.{os.getpid()}.tmp")
+            if self.output_mode == 'hardlink':
+                os.link(pdf_path, temp_path)
+            else:
+                os.symlink(os.path.relpath(pdf_path.resolve(), new_path.parent.resolve()), temp_path)
+            try:
+                os.replace(temp_path, new_path)
+            except OSError:
+                os.unlink(temp_path)
+                raise
+    
+    def reflink_copy(self, pdf_path: Path, new_path: Path) -> None:
+        """
+        Copiază fișierul fără a duplica datele când sistemul de fișiere permite
+        
+        Încearcă pe rând clonarea (FICLONE), copierea în kernel cu copy_file_range
+        și, în final, o copiere obișnuită. Metadatele sunt păstrate ca la copy2.
+        """
+        with open(pdf_path, 'rb') as source, open(new_path, 'wb') as target:
+            try:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            except OSError:
+                remaining = os.fstat(source.fileno()).st_size
+                try:
+                    while remaining > 0:
+                        copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except (OSError, AttributeError):
+                    source.seek(0)
+                    target.seek(0)
+                    target.truncate()
+                    shutil.copyfileobj(source, target)
+        shutil.copystat(pdf_path, new_path)
     
     def is_original_file(self, filename: str) -> bool:
         """
@@ -383,20 +3075,345 @@ class InvoiceDataExtractor:
         # Dacă nu se potrivește cu pattern-ul numeric, probabil este creat de program
         return False
     
+    def discover_files(self) -> Iterator[Tuple[Path, bool]]:
+        """
+        Generează (cale, este_original) pentru PDF-urile din rădăcini, pe măsură ce sunt găsite
+        
+        Fiecare folder este citit cu os.scandir și fiecare nume este clasificat o
+        singură dată. În modul recursiv subfolderele sunt parcurse în adâncime, în
+        ordinea numelor; symlink-urile către foldere nu sunt urmate. Ca la glob,
+        intrările ascunse (care încep cu ".") sunt ignorate. Doar lista unui
+        singur folder este ținută în memorie, nu lista completă a fișierelor.
+        """
+        for root in self.roots:
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as iterator:
+                        entries = sorted(iterator, key=lambda entry: entry.name)
+                except OSError as e:
+                    print(f"Nu pot citi folderul {directory}: {e}")
+                    continue
+                
+                subfolders = []
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.name.endswith('.pdf'):
+                        yield Path(entry.path), self.is_original_file(entry.name)
+                    elif self.recursive and entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                stack.extend(reversed(subfolders))
+    
+    def iter_discovered(self, queue_size: int = DISCOVERY_QUEUE_SIZE) -> Iterator[Tuple[Path, bool]]:
+        """
+        Rulează discover_files într-un thread separat, printr-o coadă limitată
+        
+        Citirea folderelor (lentă pe discuri de rețea) continuă în timp ce
+        fișierele deja găsite sunt procesate; când coada este plină, căutarea
+        așteaptă procesarea.
+        """
+        found = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        done = object()
+        
+        def discover() -> None:
+            try:
+                for item in self.discover_files():
+                    while not stop.is_set():
+                        try:
+                            found.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            finally:
+                found.put(done)
+        
+        thread = threading.Thread(target=discover, name="discover-files", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = found.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+    
+    def display_name(self, pdf_path: Path) -> str:
+        """Numele fișierului în rapoarte: relativ la rădăcină când se caută în subfoldere"""
+        if not self.recursive and len(self.roots) == 1:
+            return pdf_path.name
+        if len(self.roots) == 1:
+            return os.path.relpath(pdf_path, self.roots[0])
+        return str(pdf_path)
+    
+    def iter_analyses(self, pdf_files: Iterable[Path]
+                      ) -> Iterator[Tuple[Path, Optional[Tuple[Optional[str], InvoiceRecord]], Optional[Dict]]]:
+        """
+        Generează (cale, rezultatul analyze_pdf, trace) pentru fiecare fișier, în ordinea de intrare
+        
+        În modul serial analiza este None (se face direct în process_pdf),
+        altfel extragerea este distribuită pe un pool de procese, în loturi.
+        Fișierele sunt citite din pdf_files pe măsură ce se eliberează locuri,
+        deci pdf_files poate fi un generator: cel mult WORKER_QUEUE_DEPTH loturi
+        per proces așteaptă rezultatul. Trace-ul este None dacă măsurarea
+        timpilor nu este activă.
+        """
+        if self.file_timeout is not None or self.max_rss_mb is not None:
+            yield from self.iter_supervised_analyses(pdf_files)
+            return
+        
+        timed = self.timings is not None
+        if self.workers <= 1 or (isinstance(pdf_files, list) and len(pdf_files) <= 1):
+            for pdf_file in pdf_files:
+                yield pdf_file, None, new_trace() if timed else None
+            return
+        
+        if isinstance(pdf_files, list):
+            chunksize = max(1, min(16, len(pdf_files) // (self.workers * 4)))
+        else:
+            chunksize = 8
+        window = self.workers * WORKER_QUEUE_DEPTH * chunksize
+        
+        # Intrări [cale, digest, analiză din cache, (future, poziție în lot), trace]
+        in_flight = deque()
+        batch = []
+        
+        def finish(entry: List) -> Tuple:
+            pdf_file, digest, analysis, pending, trace = entry
+            result = pending[0].result()[pending[1]] if pending is not None else None
+            return self.finish_analysis(pdf_file, digest, analysis, result, trace)
+        
+        with self.worker_executor() as executor:
+            
+            def submit_batch() -> None:
+                future = executor.submit(_parse_batch_in_worker, [entry[0] for entry in batch])
+                for position, entry in enumerate(batch):
+                    entry[3] = (future, position)
+                batch.clear()
+            
+            for pdf_file in pdf_files:
+                trace = new_trace() if timed else None
+                # Fișierele găsite în cache nu mai sunt trimise la procesele worker
+                digest, analysis = self.cached_analysis(pdf_file, trace)
+                entry = [pdf_file, digest, analysis, None, trace]
+                in_flight.append(entry)
+                if analysis is None:
+                    batch.append(entry)
+                    if len(batch) >= chunksize:
+                        submit_batch()
+                
+                # Rezultatele sunt generate în ordinea de intrare, deci rapoartele sunt stabile
+                while in_flight:
+                    head = in_flight[0]
+                    if head[2] is None:
+                        if head[3] is None:
+                            if len(in_flight) < window:
+                                break
+                            submit_batch()
+                        elif len(in_flight) < window and not head[3][0].done():
+                            break
+                    yield finish(in_flight.popleft())
+            
+            if batch:
+                submit_batch()
+            while in_flight:
+                yield finish(in_flight.popleft())
+    
+    def iter_supervised_analyses(self, pdf_files: Iterable[Path]
+                                 ) -> Iterator[Tuple[Path, Tuple[Optional[str], InvoiceRecord], Optional[Dict]]]:
+        """
+        Ca iter_analyses, dar extragerea rulează în procese supravegheate (SupervisedPool)
+        
+        Fișierele care depășesc file_timeout sau max_rss_mb primesc o eroare cu
+        motivul opririi; rezultatele sunt generate tot în ordinea de intrare.
+        """
+        timed = self.timings is not None
+        window = self.workers * WORKER_QUEUE_DEPTH
+        # Intrări [cale, digest, analiză din cache, rezultat din worker, trace]
+        in_flight = deque()
+        files = iter(pdf_files)
+        exhausted = False
+        
+        pool = self.worker_pool if isinstance(self.worker_pool, SupervisedPool) else self.start_worker_pool()
+        try:
+            while True:
+                while not exhausted and pool.idle() and len(in_flight) < window:
+                    pdf_file = next(files, None)
+                    if pdf_file is None:
+                        exhausted = True
+                        break
+                    trace = new_trace() if timed else None
+                    digest, analysis = self.cached_analysis(pdf_file, trace)
+                    entry = [pdf_file, digest, analysis, None, trace]
+                    in_flight.append(entry)
+                    if analysis is None:
+                        pool.submit(entry, pdf_file)
+                
+                while in_flight and (in_flight[0][2] is not None or in_flight[0][3] is not None):
+                    yield self.finish_analysis(*in_flight.popleft())
+                if exhausted and not in_flight:
+                    break
+                
+                for entry, result in pool.wait():
+                    entry[3] = result
+        finally:
+            for reason, count in pool.kills.items():
+                self.guard_kills[reason] += count
+                pool.kills[reason] = 0
+            if pool is not self.worker_pool:
+                pool.close()
+    
+    def start_worker_pool(self) -> Union[ProcessPoolExecutor, SupervisedPool]:
+        """Pornește procesele worker ale lui process_files (SupervisedPool cu file_timeout/max_rss_mb)"""
+        if self.file_timeout is not None or self.max_rss_mb is not None:
+            return SupervisedPool(self, self.workers, self.file_timeout, self.max_rss_mb)
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self,))
+    
+    @contextmanager
+    def worker_executor(self) -> Iterator[ProcessPoolExecutor]:
+        """Pool-ul păstrat de modul watch (worker_pool) sau unul nou, oprit la final"""
+        if isinstance(self.worker_pool, ProcessPoolExecutor):
+            yield self.worker_pool
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            yield executor
+    
+    def needs_ocr(self, data: InvoiceRecord) -> bool:
+        """True dacă fișierul are pagini fără text și îi lipsesc câmpuri"""
+        return bool(data.blank_pages) and any(data.text(field) is None for field in InvoiceRecord.FIELDS)
+    
+    def iter_ocr_analyses(self, analyses: Iterable[Tuple[Path, Optional[Tuple[Optional[str], InvoiceRecord]],
+                                                          Optional[Dict]]]
+                          ) -> Iterator[Tuple[Path, Tuple[Optional[str], InvoiceRecord], Optional[Dict]]]:
+        """
+        Trimite la OCR fișierele din analyses care au pagini fără text (vezi needs_ocr)
+        
+        Cele scanate sunt extrase din nou, cu OCR, într-un pool de procese
+        separat (ocr.workers, pornit la primul fișier scanat), în timp ce
+        fișierele următoare sunt analizate mai departe. Rezultatele sunt
+        generate în ordinea de intrare (ca în iter_analyses), deci ordinea din
+        rapoarte nu depinde de durata OCR-ului; cel mult OCR_QUEUE_SIZE fișiere
+        așteaptă în spatele unui fișier aflat la OCR. Dacă OCR-ul eșuează,
+        rămâne analiza inițială.
+        """
+        executor = None
+        # Intrări (cale, digest, analiza fără OCR, future sau None fără OCR, trace), în ordinea de intrare
+        pending = deque()
+        
+        def finish(pdf_file: Path, digest: Optional[str], analysis: Tuple, future, trace: Optional[Dict]) -> Tuple:
+            if future is None:
+                return pdf_file, analysis, trace
+            try:
+                result = future.result()
+            except Exception as e:
+                result = (f"Eroare OCR: {str(e)}", "", InvoiceRecord(), None)
+            if result[0] is not None:
+                print(f"{result[0]} ({pdf_file.name})")
+                return pdf_file, analysis, trace
+            return self.finish_analysis(pdf_file, digest, None, result, trace)
+        
+        try:
+            for pdf_file, analysis, trace in analyses:
+                if analysis is None:
+                    analysis = self.analyze_pdf(pdf_file, trace)
+                if not self.needs_ocr(analysis[1]):
+                    pending.append((pdf_file, None, analysis, None, trace))
+                else:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=self.ocr.workers,
+                                                       initializer=_init_worker,
+                                                       initargs=(self,))
+                    digest = self.cache.file_digest(pdf_file) if self.cache is not None else None
+                    self.ocr.files += 1
+                    pending.append((pdf_file, digest, analysis,
+                                    executor.submit(_ocr_in_worker, pdf_file), trace))
+                
+                while pending and (pending[0][3] is None or pending[0][3].done()
+                                   or len(pending) > OCR_QUEUE_SIZE):
+                    yield finish(*pending.popleft())
+            
+            while pending:
+                yield finish(*pending.popleft())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def finish_analysis(self, pdf_file: Path, digest: Optional[str],
+                        analysis: Optional[Tuple[Optional[str], InvoiceRecord]],
+                        result: Optional[Tuple], trace: Optional[Dict]
+                        ) -> Tuple[Path, Tuple[Optional[str], InvoiceRecord], Optional[Dict]]:
+        """Completează analiza unui fișier cu rezultatul primit de la un proces worker și o pune în cache"""
+        if result is None:
+            return pdf_file, analysis, trace
+        
+        error, text, data, worker_trace = result
+        if worker_trace is not None:
+            if self.templates is not None:
+                self.templates.replay(worker_trace.get('templates', ()))
+            if self.ocr is not None and 'ocr' in worker_trace:
+                self.ocr.pages += worker_trace['ocr'][0]
+                self.ocr.cached += worker_trace['ocr'][1]
+            if trace is not None:
+                for stage, seconds in worker_trace['stages'].items():
+                    add_stage_time(trace, stage, seconds)
+                trace['fields'] = worker_trace['fields']
+        if error:
+            return pdf_file, (error, InvoiceRecord()), trace
+        if digest is not None:
+            self.cache.put(digest, text, data)
+        return pdf_file, self.analysis_result(text, data), trace
+    
+    def record_result(self, filename: str, success: bool, message: str,
+                      data: InvoiceRecord) -> None:
+        """Înregistrează rezultatul unui fișier și îl trimite către destinațiile active"""
+        self.handled_files.add(filename)
+        if success:
+            self.success_count += 1
+            if self.keep_results:
+                data.file = filename
+                data.message = message
+                self.processed_files.append(data)
+            for sink in self.sinks:
+                sink.write_success(filename, message, data)
+        else:
+            self.error_count += 1
+            self.errors.append((filename, message))
+            for sink in self.sinks:
+                sink.write_error(filename, message)
+    
     def process_folder(self) -> None:
         """Procesează toate PDF-urile din folder"""
-        all_pdf_files = list(self.input_folder.glob("*.pdf"))
+        if not self.roots:
+            raise ValueError("Extractorul nu are un folder de procesat (pentru documente "
+                             "din memorie folosește analyze_bytes sau analyze_many)")
+        if self.recursive or len(self.roots) > 1:
+            self.process_tree()
+            return
+        
+        # Separă fișierele originale (cu nume numeric) de cele create de program;
+        # fișierele din handled_files (ex: preluate din jurnal) nu mai sunt procesate
+        pdf_files, ignored_files = [], []
+        completed = 0
+        for pdf_file, original in self.discover_files():
+            if original and self.display_name(pdf_file) in self.handled_files:
+                completed += 1
+            else:
+                (pdf_files if original else ignored_files).append(pdf_file)
         
-        if not all_pdf_files:
+        if not pdf_files and not ignored_files and not completed:
             print("Nu s-au găsit fișiere PDF în folder")
             return
         
-        # Filtrează doar fișierele originale (cu nume numeric)
-        pdf_files = [f for f in all_pdf_files if self.is_original_file(f.name)]
-        ignored_files = [f for f in all_pdf_files if not self.is_original_file(f.name)]
-        
-        print(f"Găsite {len(all_pdf_files)} fișiere PDF în total")
+        print(f"Găsite {len(pdf_files) + len(ignored_files) + completed} fișiere PDF în total")
         print(f"Fișiere originale de procesat: {len(pdf_files)}")
+        if completed:
+            print(f"Fișiere deja procesate (din jurnal): {completed}")
         print(f"Fișiere ignorate (create de program): {len(ignored_files)}")
         print(f"Folder: {self.input_folder}")
         
@@ -407,143 +3424,743 @@ class InvoiceDataExtractor:
             if len(ignored_files) > 3:
                 print(f"  ... și încă {len(ignored_files) - 3} fișiere")
         
+        if not pdf_files and completed:
+            print("\n✅ Toate fișierele originale au fost deja procesate")
+            self.print_summary()
+            return
+        
         if not pdf_files:
             print("\n❌ Nu s-au găsit fișiere originale de procesat!")
             print("💡 Fișierele originale trebuie să aibă nume numerice (ex: 5532528720#)")
             return
         
-        print(f"\nFișiere originale de procesat:")
-        for i, pdf_file in enumerate(pdf_files[:5]):  # Afișează primele 5
-            print(f"  {i+1}. {pdf_file.name}")
-        if len(pdf_files) > 5:
-            print(f"  ... și încă {len(pdf_files) - 5} fișiere")
+        print(f"\nFișiere originale de procesat:")
+        for i, pdf_file in enumerate(pdf_files[:5]):  # Afișează primele 5
+            print(f"  {i+1}. {pdf_file.name}")
+        if len(pdf_files) > 5:
+            print(f"  ... și încă {len(pdf_files) - 5} fișiere")
+        
+        if self.dry_run:
+            print("\n*** MOD DRY RUN - Nu se vor copia fișierele ***")
+        if self.workers > 1:
+            print(f"Procese paralele: {self.workers}")
+        print("-" * 50)
+        
+        self.process_files(pdf_files)
+        self.print_summary()
+    
+    def process_tree(self) -> None:
+        """
+        Procesează PDF-urile din mai multe rădăcini și/sau din subfoldere
+        
+        Procesarea începe imediat ce sunt găsite primele fișiere; lista completă
+        nu este construită, deci numărul de fișiere este afișat abia la final.
+        """
+        print(f"Caut fișierele originale{' recursiv' if self.recursive else ''} în:")
+        for root in self.roots:
+            print(f"  {root}")
+        if self.dry_run:
+            print("\n*** MOD DRY RUN - Nu se vor copia fișierele ***")
+        if self.workers > 1:
+            print(f"Procese paralele: {self.workers}")
+        print("-" * 50)
+        
+        counts = {'total': 0, 'ignored': 0, 'completed': 0}
+        
+        def original_files() -> Iterator[Path]:
+            for pdf_file, original in self.iter_discovered():
+                counts['total'] += 1
+                if not original:
+                    counts['ignored'] += 1
+                elif self.display_name(pdf_file) in self.handled_files:
+                    counts['completed'] += 1
+                else:
+                    yield pdf_file
+        
+        self.process_files(original_files())
+        
+        print(f"\nGăsite {counts['total']} fișiere PDF în total, "
+              f"ignorate (create de program): {counts['ignored']}")
+        if counts['completed']:
+            print(f"Fișiere deja procesate (din jurnal): {counts['completed']}")
+        if counts['total'] == counts['ignored']:
+            print("❌ Nu s-au găsit fișiere originale de procesat!")
+            print("💡 Fișierele originale trebuie să aibă nume numerice (ex: 5532528720#)")
+        self.print_summary()
+    
+    def process_files(self, pdf_files: Iterable[Path]) -> None:
+        """Procesează fișierele originale (listă sau generator) și înregistrează rezultatele"""
+        if self.pipeline:
+            import asyncio
+            asyncio.run(self.run_pipeline(pdf_files))
+        else:
+            analyses = self.iter_analyses(pdf_files)
+            if self.ocr is not None:
+                analyses = self.iter_ocr_analyses(analyses)
+            for pdf_file, analysis, trace in analyses:
+                success, message, data = self.process_pdf(pdf_file, analysis, trace)
+                self.record_processed(pdf_file, success, message, data, trace)
+        
+        if self.cache is not None:
+            self.cache.commit()
+        if self.duplicates is not None:
+            self.duplicates.commit()
+    
+    def record_processed(self, pdf_file: Path, success: bool, message: str,
+                         data: InvoiceRecord, trace: Optional[Dict]) -> None:
+        """Înregistrează rezultatul process_pdf pentru un fișier (și timpii lui)"""
+        name = self.display_name(pdf_file)
+        self.record_result(name, success, message, data)
+        if trace is not None:
+            self.timings.add_file(name, trace)
+    
+    async def run_pipeline(self, pdf_files: Iterable[Path]) -> None:
+        """
+        Procesează fișierele printr-un pipeline asyncio cu etape separate
+        
+        citire (în thread-uri) -> extragerea textului și a câmpurilor (în procese)
+        -> creare fișier cu nume nou (în thread-uri) -> înregistrare. Etapele sunt
+        legate prin cozi limitate, deci așteptarea după disc (ex: un share de
+        rețea) se suprapune cu parsarea, iar numărul de fișiere din pipeline
+        rămâne limitat. Rezultatele sunt afișate și înregistrate în ordinea de
+        intrare. Câmpurile sunt extrase în același proces cu textul, ca textul
+        să nu mai fie transmis între procese.
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        timed = self.timings is not None
+        read_queue = asyncio.Queue(self.read_concurrency * 2)
+        parse_queue = asyncio.Queue(self.workers * PIPELINE_BATCH_SIZE * 2)
+        write_queue = asyncio.Queue(self.write_concurrency * 2)
+        # Fișierele din pipeline, inclusiv cele terminate care își așteaptă rândul
+        slots = asyncio.Semaphore(4 * (self.read_concurrency + self.workers + self.write_concurrency))
+        finished = {}
+        order = {'next': 0}
+        # Fișierele cu același nume nou sunt create pe rând
+        target_locks = {}
+        
+        io_executor = ThreadPoolExecutor(self.read_concurrency + self.write_concurrency,
+                                         thread_name_prefix="pipeline-io")
+        parse_executor = self.worker_pool
+        if not isinstance(parse_executor, ProcessPoolExecutor):
+            parse_executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self,))
+        
+        async def produce() -> None:
+            iterator = iter(pdf_files)
+            number = 0
+            while True:
+                await slots.acquire()
+                if isinstance(pdf_files, list):
+                    pdf_file = next(iterator, None)
+                else:
+                    # Generatorul de descoperire poate aștepta după disc
+                    pdf_file = await loop.run_in_executor(io_executor, next, iterator, None)
+                if pdf_file is None:
+                    slots.release()
+                    break
+                await read_queue.put((number, pdf_file))
+                number += 1
+            for _ in range(self.read_concurrency):
+                await read_queue.put(None)
+        
+        async def lookup(pdf_file: Path, trace: Optional[Dict]) -> Tuple:
+            # Ca cached_analysis, dar cu accesul la disc în thread-uri (SQLite rămâne în acest thread)
+            start = time.perf_counter()
+            stat, key = await loop.run_in_executor(
+                io_executor, lambda: (pdf_file.stat(), str(pdf_file.resolve())))
+            content = None
+            digest = self.cache.known_digest(key, stat)
+            if digest is None:
+                content = await loop.run_in_executor(io_executor, pdf_file.read_bytes)
+                digest = await loop.run_in_executor(
+                    io_executor, lambda: hashlib.sha256(content).hexdigest())
+                self.cache.remember_digest(key, stat, digest)
+            cached = self.cache.get(digest)
+            if trace is not None:
+                add_stage_time(trace, 'cache', time.perf_counter() - start)
+            analysis = self.analysis_result(*cached) if cached is not None else None
+            return digest, analysis, content
+        
+        async def read() -> None:
+            while True:
+                item = await read_queue.get()
+                if item is None:
+                    break
+                number, pdf_file = item
+                trace = new_trace() if timed else None
+                digest, analysis, content = None, None, None
+                try:
+                    if self.cache is not None:
+                        digest, analysis, content = await lookup(pdf_file, trace)
+                    if analysis is None and content is None:
+                        start = time.perf_counter()
+                        content = await loop.run_in_executor(io_executor, pdf_file.read_bytes)
+                        if trace is not None:
+                            add_stage_time(trace, 'read', time.perf_counter() - start)
+                except OSError as e:
+                    analysis = (f"Eroare: {str(e)}", InvoiceRecord())
+                await parse_queue.put((number, pdf_file, digest, analysis, content, trace))
+        
+        async def parse() -> None:
+            done = False
+            while not done:
+                # Fișierele deja citite sunt trimise împreună (mai puține mesaje între procese)
+                batch = [await parse_queue.get()]
+                while batch[-1] is not None and len(batch) < PIPELINE_BATCH_SIZE and not parse_queue.empty():
+                    batch.append(parse_queue.get_nowait())
+                done = batch[-1] is None
+                if done:
+                    batch.pop()
+                
+                pending = [item for item in batch if item[3] is None]
+                results = {}
+                if pending:
+                    parsed = await loop.run_in_executor(
+                        parse_executor, _parse_batch_in_worker,
+                        [item[1] for item in pending], [item[4] for item in pending])
+                    results = {item[0]: result for item, result in zip(pending, parsed)}
+                for number, pdf_file, digest, analysis, content, trace in batch:
+                    _, analysis, trace = self.finish_analysis(pdf_file, digest, analysis,
+                                                              results.get(number), trace)
+                    await write_queue.put((number, pdf_file, analysis, trace))
+        
+        async def write() -> None:
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    break
+                number, pdf_file, analysis, trace = item
+                error, data = analysis
+                target = self.generate_new_filename(pdf_file, data) if not error and data.has_data() else None
+                lock = target_locks.setdefault(target, asyncio.Lock())
+                lines = []
+                async with lock:
+                    outcome = await loop.run_in_executor(
+                        io_executor, partial(self.process_pdf, pdf_file, analysis, trace, lines.append))
+                finished[number] = (pdf_file, lines, outcome, trace)
+                record_in_order()
         
-        if self.dry_run:
-            print("\n*** MOD DRY RUN - Nu se vor copia fișierele ***")
-        print("-" * 50)
+        def record_in_order() -> None:
+            while order['next'] in finished:
+                pdf_file, lines, (success, message, data), trace = finished.pop(order['next'])
+                for line in lines:
+                    print(line)
+                self.record_processed(pdf_file, success, message, data, trace)
+                order['next'] += 1
+                slots.release()
         
-        for pdf_file in pdf_files:
-            success, message, data = self.process_pdf(pdf_file)
-            
-            if success:
-                self.processed_files.append((pdf_file.name, message, data))
-            else:
-                self.errors.append((pdf_file.name, message))
+        async def stage(workers: List, next_queue: Optional[asyncio.Queue], consumers: int) -> None:
+            # Când toate corutinele unei etape s-au terminat, se oprește etapa următoare
+            await asyncio.gather(*workers)
+            if next_queue is not None:
+                for _ in range(consumers):
+                    await next_queue.put(None)
         
-        # Afișează rezumatul
+        try:
+            await asyncio.gather(
+                produce(),
+                stage([read() for _ in range(self.read_concurrency)], parse_queue, self.workers),
+                stage([parse() for _ in range(self.workers)], write_queue, self.write_concurrency),
+                stage([write() for _ in range(self.write_concurrency)], None, 0),
+            )
+        finally:
+            if parse_executor is not self.worker_pool:
+                parse_executor.shutdown()
+            io_executor.shutdown()
+    
+    def print_summary(self) -> None:
+        """Afișează rezumatul rulării"""
         print("\n" + "=" * 50)
         print("REZUMAT:")
-        print(f"Procesate cu succes: {len(self.processed_files)}")
-        print(f"Erori: {len(self.errors)}")
+        print(f"Procesate cu succes: {self.success_count}")
+        print(f"Erori: {self.error_count}")
+        if self.cache is not None:
+            print(f"Cache: {self.cache.hits} găsite, {self.cache.misses} extrase din nou")
+        if self.templates is not None and self.templates.suppliers:
+            rate = self.templates.hit_rate()
+            print(f"Șabloane furnizori: {len(self.templates.suppliers)} furnizori "
+                  f"({len(self.templates.new_suppliers)} noi), câmpuri găsite direct din șablon: "
+                  f"{self.templates.hits} din {self.templates.hits + self.templates.misses}"
+                  + (f" ({rate:.1f}%)" if rate is not None else ""))
+        if self.duplicates is not None:
+            print(f"Duplicate (necopiate): {self.duplicates.counts['exact']} exacte, "
+                  f"{self.duplicates.counts['probabil']} probabile")
+        if self.ocr is not None and self.ocr.files:
+            print(f"OCR: {self.ocr.files} fișiere scanate, {self.ocr.pages} pagini recunoscute, "
+                  f"{self.ocr.cached} pagini din cache")
+        if any(self.guard_kills.values()):
+            print(f"Oprite de supraveghere: timeout {self.guard_kills['timeout']}, "
+                  f"memorie {self.guard_kills['memory']}, "
+                  f"oprite neașteptat {self.guard_kills['crash']}")
         
         if self.errors:
             print("\nErori:")
             for filename, error in self.errors:
                 print(f"  {filename}: {error}")
+        
+        if self.timings is not None:
+            self.timings.print_report()
+    
+    def watch(self, interval: float = 2.0, settle: float = 2.0, polling: bool = False,
+              on_batch: Optional[Callable[[], None]] = None,
+              excel_output: Optional[str] = None) -> None:
+        """
+        Urmărește folderul și procesează fișierele originale noi, până la Ctrl+C
+        
+        Sunt procesate fișierele originale care nu apar în handled_files, deci și
+        cele copiate în folder în timpul unui process_folder anterior. Un fișier
+        nou este procesat abia după ce
+        dimensiunea și data modificării nu s-au schimbat timp de settle secunde,
+        ca să nu fie citite PDF-uri copiate doar parțial. Procesele worker sunt
+        pornite o singură dată și refolosite pentru toate loturile. După fiecare
+        lot, processed_files și errors sunt golite (rezultatele au fost deja
+        trimise rapoartelor), deci memoria nu crește cât timp rulează.
+        
+        Args:
+            interval: Intervalul maxim dintre verificări, în secunde
+            settle: Cât timp trebuie să rămână neschimbat un fișier nou
+            polling: Folosește scanări periodice în loc de inotify
+            on_batch: Apelat după fiecare lot, cu rezultatele lotului în
+                processed_files și errors (pentru actualizarea rapoartelor)
+            excel_output: Dacă este dat, fiecare lot este scris pe măsură ce
+                este procesat într-un raport Excel separat (vezi
+                batch_report_path), deci nici memoria, nici timpul unui lot nu
+                cresc cu numărul de facturi procesate anterior
+        """
+        watcher = create_watcher(self.input_folder, polling)
+        # nume -> ((dimensiune, mtime), momentul ultimei schimbări)
+        pending = {
+            entry.name: None for entry in os.scandir(self.input_folder)
+            if entry.name.endswith('.pdf') and self.is_original_file(entry.name)
+            and entry.name not in self.handled_files
+        }
+        
+        self.processed_files.clear()
+        self.errors.clear()
+        supervised = self.file_timeout is not None or self.max_rss_mb is not None
+        if self.workers > 1 or supervised:
+            self.worker_pool = self.start_worker_pool()
+        
+        print(f"\nUrmăresc folderul {self.input_folder} "
+              f"({type(watcher).__name__}, Ctrl+C pentru oprire)")
+        try:
+            while True:
+                for name in watcher.poll(min(interval, settle)):
+                    if name not in self.handled_files and self.is_original_file(name):
+                        pending.setdefault(name, None)
+                
+                now = time.monotonic()
+                ready = []
+                for name, state in list(pending.items()):
+                    try:
+                        stat = (self.input_folder / name).stat()
+                    except FileNotFoundError:
+                        del pending[name]
+                        continue
+                    signature = (stat.st_size, stat.st_mtime_ns)
+                    if state is None or state[0] != signature:
+                        pending[name] = (signature, now)
+                    elif stat.st_size > 0 and now - state[1] >= settle:
+                        ready.append(name)
+                
+                if not ready:
+                    continue
+                
+                for name in ready:
+                    del pending[name]
+                
+                print(f"\nFișiere noi: {len(ready)}")
+                print("-" * 50)
+                writer = None
+                if excel_output is not None:
+                    writer = ExcelReportWriter(self.batch_report_path(excel_output), self.line_items)
+                    self.sinks.append(writer)
+                try:
+                    self.process_files([self.input_folder / name for name in sorted(ready)])
+                except BrokenProcessPool:
+                    # Un proces worker a murit: fișierele neprocesate revin în așteptare
+                    print("Atenție: un proces worker s-a oprit neașteptat; se pornesc procese noi")
+                    self.worker_pool = self.start_worker_pool()
+                    for name in ready:
+                        if name not in self.handled_files:
+                            pending[name] = None
+                finally:
+                    if writer is not None:
+                        writer.close()
+                        self.sinks.remove(writer)
+                        print(f"Lotul a fost salvat în Excel: {writer.output_path}")
+                print(f"Total procesate cu succes: {self.success_count}, erori: {self.error_count}")
+                try:
+                    if on_batch is not None:
+                        on_batch()
+                finally:
+                    self.processed_files.clear()
+                    self.errors.clear()
+        except KeyboardInterrupt:
+            print("\nOprire la cererea utilizatorului")
+        finally:
+            watcher.close()
+            if isinstance(self.worker_pool, SupervisedPool):
+                self.worker_pool.close()
+            elif self.worker_pool is not None:
+                self.worker_pool.shutdown()
+            self.worker_pool = None
+    
+    def serve(self, address: str = DEFAULT_SERVE_ADDRESS, max_requests: int = 16) -> None:
+        """
+        Rulează serviciul HTTP de extragere până la Ctrl+C (vezi ExtractionService)
+        
+        Args:
+            address: "host:port" sau "unix:/cale/socket"
+            max_requests: Numărul maxim de cereri procesate simultan
+        """
+        # Serverul HTTP este importat doar în acest mod (pornire rapidă pentru celelalte)
+        from invoice_server import create_server
+        
+        service = ExtractionService(self, self.workers, max_requests)
+        server = create_server(address, service)
+        print(f"Serviciul de extragere ascultă pe {address} "
+              f"({self.workers} procese worker, cel mult {max_requests} cereri simultan; Ctrl+C pentru oprire)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nOprire la cererea utilizatorului")
+        finally:
+            server.server_close()
+            service.close()
+            if address.startswith("unix:") and os.path.exists(address[len("unix:"):]):
+                os.unlink(address[len("unix:"):])
+            print(f"Fișiere extrase: {service.files} în {service.batches} loturi, "
+                  f"cereri refuzate: {service.rejected}")
     
-    def save_extracted_data(self, output_file: str = "extracted_data.txt") -> None:
-        """Salvează datele extrase într-un fișier"""
+    def save_extracted_data(self, output_file: str = "extracted_data.txt", append: bool = False) -> None:
+        """
+        Salvează datele extrase într-un fișier
+        
+        Args:
+            output_file: Fișierul text de ieșire
+            append: Adaugă rezultatele la sfârșitul fișierului, fără antet (modul watch)
+        """
         output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("Date extrase din PDF-uri:\n")
-            f.write("=" * 40 + "\n\n")
+        with open(output_path, 'a' if append else 'w', encoding='utf-8') as f:
+            if not append:
+                f.write("Date extrase din PDF-uri:\n")
+                f.write("=" * 40 + "\n\n")
             
-            for filename, message, data in self.processed_files:
-                f.write(f"Fișier: {filename}\n")
-                f.write(f"Status: {message}\n")
+            for record in self.processed_files:
+                f.write(f"Fișier: {record.file}\n")
+                f.write(f"Status: {record.message}\n")
                 f.write("Date extrase:\n")
-                for key, value in data.items():
+                for key, value in record.text_items():
                     f.write(f"  {key}: {value or 'N/A'}\n")
                 f.write("-" * 30 + "\n\n")
         
         print(f"\nDatele au fost salvate în: {output_path}")
     
-    def save_to_excel(self, output_file: str = "facturi_extrase.xlsx") -> None:
-        """Salvează datele extrase într-un fișier Excel"""
-        # Dacă nu este cale absolută, salvează în folderul de procesare
-        if not Path(output_file).is_absolute():
-            output_path = self.input_folder / output_file
-        else:
-            output_path = Path(output_file)
+    def report_output_path(self, output_file: str) -> Path:
+        """Calea unui raport (Excel, JSONL, ...); căile relative sunt în folderul de procesare"""
+        if not Path(output_file).is_absolute() and self.input_folder is not None:
+            return self.input_folder / output_file
+        return Path(output_file)
+    
+    def batch_report_path(self, output_file: str) -> Path:
+        """
+        Raportul Excel al unui lot din modul --watch, lângă raportul principal
         
-        # Creează workbook-ul
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Facturi Extrase"
+        facturi.xlsx devine facturi_20241231-235959.xlsx (momentul lotului);
+        dacă fișierul există deja, se adaugă un număr (_2, _3, ...).
+        """
+        output_path = self.report_output_path(output_file)
+        stem = f"{output_path.stem}_{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        batch_path = output_path.with_name(stem + output_path.suffix)
+        counter = 2
+        while batch_path.exists():
+            batch_path = output_path.with_name(f"{stem}_{counter}{output_path.suffix}")
+            counter += 1
+        return batch_path
+    
+    def open_excel_writer(self, output_file: str = "facturi_extrase.xlsx") -> ExcelReportWriter:
+        """
+        Deschide un raport Excel scris pe măsură ce fișierele sunt procesate
         
-        # Definește stilurile
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
+        Raportul este adăugat la destinațiile active; rezultatele de succes nu mai
+        sunt păstrate în memorie. Se închide cu close_excel_writer().
+        """
+        writer = ExcelReportWriter(self.report_output_path(output_file), self.line_items)
+        self.sinks.append(writer)
+        self.keep_results = False
+        return writer
+    
+    def close_excel_writer(self, writer: ExcelReportWriter) -> None:
+        """Salvează raportul Excel deschis cu open_excel_writer()"""
+        writer.close()
+        self.sinks.remove(writer)
+        print(f"\nDatele au fost salvate în Excel: {writer.output_path}")
+        self.print_statistics()
+    
+    def open_sink(self, kind: str, output_file: str) -> "RecordSink":
+        """
+        Deschide o destinație de date (jsonl, csv sau parquet, vezi SINK_TYPES)
         
-        # Definește header-urile
-        headers = [
-            "Fișier Original",
-            "Nume Companie", 
-            "Data Emitere",
-            "Data Scadenta",
-            "Total Plata",
-            "Total TVA",
-            "Denumire Produs",
-            "Cod CPV",
-            "Cod NC8",
-            "Status",
-            "Fișier Nou"
-        ]
-        
-        # Adaugă header-urile
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
+        Înregistrările sunt scrise pe măsură ce fișierele sunt procesate. Se
+        închide cu close_sink().
+        """
+        sink = SINK_TYPES[kind](self.report_output_path(output_file))
+        self.sinks.append(sink)
+        return sink
+    
+    def open_line_item_sink(self, output_file: str) -> "RecordSink":
+        """
+        Deschide o destinație pentru liniile facturilor; formatul este dat de
+        extensia fișierului (.jsonl, .csv sau .parquet, vezi LINE_ITEM_SINK_TYPES)
+        """
+        output_path = self.report_output_path(output_file)
+        sink_type = LINE_ITEM_SINK_TYPES.get(output_path.suffix.lower())
+        if sink_type is None:
+            raise ValueError(f"Format necunoscut pentru liniile facturilor: {output_path.name} "
+                             f"(extensii acceptate: {', '.join(LINE_ITEM_SINK_TYPES)})")
+        sink = sink_type(output_path)
+        self.sinks.append(sink)
+        return sink
+    
+    def replay_journal(self, journal_path: Path) -> int:
+        """
+        Preia rezultatele dintr-un jurnal de reluare (vezi CheckpointJournal)
+        
+        Fiecare intrare este înregistrată ca și cum fișierul tocmai ar fi fost
+        procesat: apare în rezumat și în rapoartele deschise, iar fișierul nu mai
+        este procesat din nou. Jurnalul trebuie preluat înainte de a-l deschide
+        pentru scriere cu open_journal().
         
-        # Adaugă datele
-        for row, (filename, message, data) in enumerate(self.processed_files, 2):
-            ws.cell(row=row, column=1, value=filename)
-            ws.cell(row=row, column=2, value=data.get('company_name', 'N/A'))
-            ws.cell(row=row, column=3, value=data.get('issue_date', 'N/A'))
-            ws.cell(row=row, column=4, value=data.get('due_date', 'N/A'))
-            ws.cell(row=row, column=5, value=data.get('total_payment', 'N/A'))
-            ws.cell(row=row, column=6, value=data.get('total_vat', 'N/A'))
-            ws.cell(row=row, column=7, value=data.get('product_name', 'N/A'))
-            ws.cell(row=row, column=8, value=data.get('cpv_code', 'N/A'))
-            ws.cell(row=row, column=9, value=data.get('nc8_code', 'N/A'))
-            ws.cell(row=row, column=10, value="Succes")
-            ws.cell(row=row, column=11, value=message.replace("Succes: copiat în ", ""))
-        
-        # Adaugă erorile
-        for row, (filename, error) in enumerate(self.errors, len(self.processed_files) + 2):
-            ws.cell(row=row, column=1, value=filename)
-            ws.cell(row=row, column=2, value="N/A")
-            ws.cell(row=row, column=3, value="N/A")
-            ws.cell(row=row, column=4, value="N/A")
-            ws.cell(row=row, column=5, value="N/A")
-            ws.cell(row=row, column=6, value="N/A")
-            ws.cell(row=row, column=7, value="N/A")
-            ws.cell(row=row, column=8, value="N/A")
-            ws.cell(row=row, column=9, value="N/A")
-            ws.cell(row=row, column=10, value="Eroare")
-            ws.cell(row=row, column=11, value=error)
-        
-        # Ajustează lățimea coloanelor
-        column_widths = [25, 30, 15, 15, 15, 15, 25, 12, 12, 15, 30]
-        for col, width in enumerate(column_widths, 1):
-            ws.column_dimensions[ws.cell(row=1, column=col).column_letter].width = width
-        
-        # Salvează fișierul
-        wb.save(output_path)
-        print(f"\nDatele au fost salvate în Excel: {output_path}")
-        
-        # Afișează statistici
-        total_files = len(self.processed_files) + len(self.errors)
-        success_rate = (len(self.processed_files) / total_files * 100) if total_files > 0 else 0
+        Returns:
+            Numărul de intrări preluate
+            
+        Raises:
+            ValueError: Dacă jurnalul a fost scris de o rulare --dry-run și
+                rularea curentă nu este (sau invers); fișierele din jurnal nu
+                ar fi fost copiate
+        """
+        header = CheckpointJournal.header(journal_path)
+        if header is not None and header.get('dry_run', False) != self.dry_run:
+            written = "cu --dry-run" if header['dry_run'] else "fără --dry-run"
+            raise ValueError(f"Jurnalul {journal_path} a fost scris de o rulare {written}; "
+                             f"reluarea trebuie făcută în același mod (sau fără --resume)")
+        replayed = 0
+        for entry in CheckpointJournal.read(journal_path):
+            if entry['file'] in self.handled_files:
+                continue
+            self.record_result(entry['file'], entry['success'], entry['message'],
+                               InvoiceRecord.from_extracted(decode_extracted(entry['data'])))
+            replayed += 1
+        return replayed
+    
+    def open_journal(self, journal_path: Path, append: bool = False) -> CheckpointJournal:
+        """Deschide jurnalul de reluare, în care se scrie fiecare fișier procesat"""
+        journal = CheckpointJournal(journal_path, append, self.dry_run)
+        self.sinks.append(journal)
+        return journal
+    
+    def close_sink(self, sink: "RecordSink") -> None:
+        """Închide o destinație deschisă cu open_sink()"""
+        sink.close()
+        self.sinks.remove(sink)
+        print(f"Datele au fost salvate în {sink.FORMAT_NAME}: {sink.output_path} "
+              f"({sink.count} înregistrări)")
+    
+    def save_to_excel(self, output_file: str = "facturi_extrase.xlsx") -> None:
+        """Salvează datele extrase într-un fișier Excel"""
+        writer = ExcelReportWriter(self.report_output_path(output_file), self.line_items)
+        for record in self.processed_files:
+            writer.write_success(record.file, record.message, record)
+        for filename, error in self.errors:
+            writer.write_error(filename, error)
+        writer.close()
+        print(f"\nDatele au fost salvate în Excel: {writer.output_path}")
+        self.print_statistics()
+    
+    def print_statistics(self) -> None:
+        """Afișează statisticile rulării"""
+        total_files = self.success_count + self.error_count
+        success_rate = (self.success_count / total_files * 100) if total_files > 0 else 0
         
         print(f"Statistici:")
         print(f"  Total fișiere: {total_files}")
-        print(f"  Procesate cu succes: {len(self.processed_files)}")
-        print(f"  Erori: {len(self.errors)}")
+        print(f"  Procesate cu succes: {self.success_count}")
+        print(f"  Erori: {self.error_count}")
         print(f"  Rata de succes: {success_rate:.1f}%")
+    
+    def compare_backends(self, backends: List[str]) -> Dict[str, Dict]:
+        """
+        Extrage textul fișierelor originale cu fiecare backend și compară rezultatele
+        
+        Nu se creează fișiere. Primul backend este referința: pentru celelalte se
+        numără câmpurile extrase identic față de el (dintre câmpurile găsite de
+        cel puțin unul dintre cele două backend-uri).
+        
+        Returns:
+            Dict backend -> {'files', 'seconds', 'empty', 'fields_found',
+            'agreement' (procent sau None pentru referință)}
+        """
+        pdf_files = [pdf_file for pdf_file, original in self.discover_files() if original]
+        reference = None
+        results = {}
+        for backend in backends:
+            seconds = 0.0
+            empty = 0
+            extracted = []
+            for pdf_file in pdf_files:
+                start = time.perf_counter()
+                text = self.extract_text_with(pdf_file, backend)
+                seconds += time.perf_counter() - start
+                if not text.strip():
+                    empty += 1
+                extracted.append(FIELD_ENGINE.extract(text) if text.strip() else {})
+            
+            agreement = None
+            if reference is None:
+                reference = extracted
+            else:
+                compared = same = 0
+                for expected, data in zip(reference, extracted):
+                    for field in FIELD_ENGINE.fields:
+                        if expected.get(field) or data.get(field):
+                            compared += 1
+                            same += expected.get(field) == data.get(field)
+                agreement = same / compared * 100 if compared else 100.0
+            
+            results[backend] = {
+                'files': len(pdf_files),
+                'seconds': seconds,
+                'empty': empty,
+                'fields_found': sum(1 for data in extracted for value in data.values() if value),
+                'agreement': agreement,
+            }
+        return results
+    
+    def print_backend_comparison(self, results: Dict[str, Dict]) -> None:
+        """Afișează rezultatul compare_backends"""
+        print("\nCOMPARAȚIE BACKEND-URI:")
+        for backend, result in results.items():
+            per_file = result['seconds'] / result['files'] * 1000 if result['files'] else 0
+            agreement = ("referință" if result['agreement'] is None
+                         else f"acord cu referința {result['agreement']:.1f}%")
+            print(f"  {TEXT_BACKENDS[backend]:<20} {result['seconds']:8.3f} s  {per_file:8.2f} ms/fișier  "
+                  f"fără text: {result['empty']}  câmpuri găsite: {result['fields_found']}  {agreement}")
+
+
+class ExtractionService:
+    """
+    Serviciul de extragere folosit de modul --serve
+    
+    Păstrează pornit un pool de procese worker (cu extractorul deja încărcat),
+    deci o cerere nu mai plătește pornirea Python și importul bibliotecilor.
+    Fișierele primite sunt puse într-o coadă; un thread le trimite proceselor
+    în loturi de cel mult batch_size, doar când există un proces liber, deci
+    sub încărcare cererile simultane sunt grupate fără a aștepta când serverul
+    este liber. Numărul de cereri procesate simultan este limitat de
+    max_requests; cererile peste limită sunt refuzate imediat (HTTP 503).
+    """
+    
+    def __init__(self, extractor: "InvoiceDataExtractor", workers: int = 1,
+                 max_requests: int = 16, batch_size: int = SERVE_BATCH_SIZE):
+        self.extractor = extractor
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_requests = max(1, max_requests)
+        self.requests = threading.BoundedSemaphore(self.max_requests)
+        self.free_workers = threading.Semaphore(self.workers)
+        # Intrări (cale, conținut, future), None = oprire
+        self.jobs = queue.Queue()
+        self.files = 0
+        self.batches = 0
+        self.rejected = 0
+        self.executor = self.start_pool()
+        self.batcher = threading.Thread(target=self.run_batcher, name="serve-batcher", daemon=True)
+        self.batcher.start()
+    
+    def start_pool(self) -> ProcessPoolExecutor:
+        """Pornește procesele worker și așteaptă până când sunt gata"""
+        executor = ProcessPoolExecutor(max_workers=self.workers,
+                                       initializer=_init_worker,
+                                       initargs=(self.extractor,))
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return executor
+    
+    def submit(self, pdf_path: Path, content: Optional[bytes] = None) -> Future:
+        """Programează extragerea unui fișier; rezultatul este (error_message, InvoiceRecord)"""
+        future = Future()
+        self.jobs.put((pdf_path, content, future))
+        return future
+    
+    def run_batcher(self) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            # Fișierele sosite cât timp toate procesele au fost ocupate pleacă împreună
+            self.free_workers.acquire()
+            batch = [job]
+            while len(batch) < self.batch_size:
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self.jobs.put(None)
+                    break
+                batch.append(job)
+            
+            paths = [pdf_path for pdf_path, _, _ in batch]
+            contents = [content for _, content, _ in batch]
+            try:
+                future = self.executor.submit(_parse_batch_in_worker, paths, contents)
+            except BrokenProcessPool:
+                # Un proces worker a murit (ex: crash în biblioteca PDF): se pornește un pool nou
+                self.executor = self.start_pool()
+                future = self.executor.submit(_parse_batch_in_worker, paths, contents)
+            self.batches += 1
+            future.add_done_callback(partial(self.finish_batch, batch))
+    
+    def finish_batch(self, batch: List[Tuple], future: Future) -> None:
+        """Trimite rezultatele unui lot cererilor care le așteaptă"""
+        self.free_workers.release()
+        try:
+            results = future.result()
+        except Exception as e:
+            results = [(f"Eroare: {str(e)}", "", InvoiceRecord(), None)] * len(batch)
+        for (pdf_path, _, job), result in zip(batch, results):
+            # Actualizează în procesul principal șabloanele furnizorilor
+            _, analysis, _ = self.extractor.finish_analysis(pdf_path, None, None, result, None)
+            self.files += 1
+            job.set_result(analysis)
+    
+    def status(self) -> Dict:
+        return {
+            'status': "ok",
+            'workers': self.workers,
+            'max_requests': self.max_requests,
+            'files': self.files,
+            'batches': self.batches,
+            'rejected': self.rejected,
+        }
+    
+    @staticmethod
+    def encode(body: Dict) -> bytes:
+        """Serializează un răspuns JSON (datele în același format ca în cache și în jurnal)"""
+        return json.dumps(body, ensure_ascii=False, default=encode_extracted).encode('utf-8')
+    
+    def close(self) -> None:
+        self.jobs.put(None)
+        self.batcher.join()
+        self.executor.shutdown()
+
+
+def parse_backends(value: str) -> Tuple[str, ...]:
+    """Transformă o listă de backend-uri separate prin virgulă într-un tuple"""
+    return tuple(backend.strip().lower() for backend in value.split(",") if backend.strip())
 
 
 def main():
@@ -565,6 +4182,62 @@ Exemple de utilizare:
 4. Salvează datele extrase în Excel:
    python invoice_data_extractor.py /path/to/folder --excel facturi.xlsx
 
+5. Procesează în paralel pe 8 procese:
+   python invoice_data_extractor.py /path/to/folder --workers 8
+
+6. Refolosește rezultatele rulărilor anterioare (cache în folderul de procesare):
+   python invoice_data_extractor.py /path/to/folder --cache
+
+7. Citește paginile la cerere, începând cu prima și ultima pagină:
+   python invoice_data_extractor.py /path/to/folder --lazy-pages --page-order edges
+
+8. Rămâne pornit și procesează facturile noi pe măsură ce apar:
+   python invoice_data_extractor.py /path/to/folder --watch --excel facturi.xlsx
+
+9. Creează hardlink-uri în loc de copii (fără spațiu suplimentar pe disc):
+   python invoice_data_extractor.py /path/to/folder --output-mode hardlink
+
+10. Afișează timpii pe etape și pe câmpuri și cele mai lente 5 fișiere:
+   python invoice_data_extractor.py /path/to/folder --dry-run --timings 5
+
+11. Extrage textul cu pdftotext și, dacă nu găsește text, cu PyPDF2:
+   python invoice_data_extractor.py /path/to/folder --backend pdftotext,pypdf2
+
+12. Compară viteza și rezultatele backend-urilor instalate (fără a crea fișiere):
+   python invoice_data_extractor.py /path/to/folder --compare-backends
+
+13. Procesează o arhivă împărțită pe subfoldere (an/lună/furnizor) și încă un folder:
+   python invoice_data_extractor.py /arhiva/2024 /arhiva/2025 --recursive --excel facturi.xlsx
+
+14. Exportă datele tipizate pentru încărcarea într-o bază de date:
+   python invoice_data_extractor.py /path/to/folder --jsonl facturi.jsonl --parquet facturi.parquet
+
+15. Rulare lungă care poate fi reluată după o întrerupere:
+   python invoice_data_extractor.py /arhiva -r --checkpoint --excel facturi.xlsx
+   python invoice_data_extractor.py /arhiva -r --resume --excel facturi.xlsx
+
+16. Oprește extragerea PDF-urilor care durează peste 60 s sau folosesc peste 1 GB:
+   python invoice_data_extractor.py /path/to/folder --workers 4 --timeout 60 --max-rss 1024
+
+17. Suprapune citirea de pe un share de rețea cu parsarea (pipeline asyncio):
+   python invoice_data_extractor.py /mnt/share/facturi --pipeline --workers 4 --read-concurrency 16
+
+18. Învață așezarea facturilor fiecărui furnizor și o refolosește la rulările următoare:
+   python invoice_data_extractor.py /path/to/folder --templates
+
+19. Extrage toate liniile facturilor (foaie separată în Excel și export Parquet):
+   python invoice_data_extractor.py /path/to/folder --excel facturi.xlsx --line-items linii.parquet
+
+20. Recunoaște prin OCR (Tesseract) facturile scanate, pe 2 procese separate:
+   python invoice_data_extractor.py /path/to/folder --ocr --ocr-workers 2
+
+21. Nu mai copiază facturile retrimise de furnizori (index păstrat între rulări):
+   python invoice_data_extractor.py /path/to/folder --duplicates --excel facturi.xlsx
+
+22. Serviciu HTTP local cu 4 procese worker pornite (pentru integrarea cu ERP-ul):
+   python invoice_data_extractor.py /path/to/folder --serve 127.0.0.1:8765 --workers 4
+   python invoice_client.py --server 127.0.0.1:8765 factura.pdf
+
 Date extrase:
 - Numele companiei (după labelul "Nume")
 - Data emitere (după labelul "Data emitere")
@@ -581,7 +4254,14 @@ Format nume fișier: [Nume_Companie]_[Data]_TOTAL_[Valoare].pdf
     
     parser.add_argument(
         "folder",
-        help="Folderul cu PDF-urile de procesat"
+        nargs="+",
+        help="Folderul cu PDF-urile de procesat (sau mai multe foldere)"
+    )
+    
+    parser.add_argument(
+        "--recursive", "-r",
+        action="store_true",
+        help="Caută PDF-uri și în subfoldere"
     )
     
     parser.add_argument(
@@ -600,21 +4280,397 @@ Format nume fișier: [Nume_Companie]_[Data]_TOTAL_[Valoare].pdf
         help="Salvează datele extrase în fișierul Excel specificat"
     )
     
+    parser.add_argument(
+        "--jsonl",
+        help="Salvează datele extrase în fișierul JSON Lines specificat (o factură pe linie)"
+    )
+    
+    parser.add_argument(
+        "--csv",
+        help="Salvează datele extrase în fișierul CSV specificat"
+    )
+    
+    parser.add_argument(
+        "--parquet",
+        help="Salvează datele extrase în fișierul Parquet specificat (necesită pyarrow)"
+    )
+    
+    parser.add_argument(
+        "--line-items",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Extrage toate liniile facturilor (foaia \"Linii Facturi\" în Excel); cu FILE "
+             "le salvează și în .jsonl, .csv sau .parquet"
+    )
+    
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="Recunoaște cu Tesseract textul paginilor scanate (fără text), cu rezultatele "
+             f"păstrate în cache ({DEFAULT_OCR_CACHE_NAME} în folder)"
+    )
+    
+    parser.add_argument(
+        "--ocr-lang",
+        help=f"Limbile Tesseract pentru OCR, ex: ron+eng (implicit: cele instalate dintre {OCR_LANGUAGES})"
+    )
+    
+    parser.add_argument(
+        "--ocr-workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Numărul de procese separate pentru OCR (implicit: jumătate din procesoare)"
+    )
+    
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Numărul de procese pentru extragerea datelor (implicit: 1, serial)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timpul maxim de extragere per fișier, în secunde; fișierele mai lente sunt oprite"
+    )
+    
+    parser.add_argument(
+        "--max-rss",
+        type=int,
+        metavar="MB",
+        help="Memoria maximă a procesului de extragere per fișier, în MB (Linux)"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Citește, parsează și scrie fișierele în etape separate care se suprapun (asyncio)"
+    )
+    
+    parser.add_argument(
+        "--read-concurrency",
+        type=int,
+        default=8,
+        help="Câte fișiere sunt citite simultan în modul --pipeline (implicit: 8)"
+    )
+    
+    parser.add_argument(
+        "--write-concurrency",
+        type=int,
+        default=4,
+        help="Câte fișiere noi sunt create simultan în modul --pipeline (implicit: 4)"
+    )
+    
+    parser.add_argument(
+        "--cache", "-c",
+        nargs="?",
+        const=DEFAULT_CACHE_NAME,
+        help=f"Folosește un cache persistent al extragerilor (implicit: {DEFAULT_CACHE_NAME} în folder)"
+    )
+    
+    parser.add_argument(
+        "--templates",
+        nargs="?",
+        const=DEFAULT_TEMPLATES_NAME,
+        metavar="FILE",
+        help="Încearcă întâi pattern-urile care au găsit câmpurile la facturile anterioare ale "
+             f"aceluiași furnizor (implicit: {DEFAULT_TEMPLATES_NAME} în folder)"
+    )
+    
+    parser.add_argument(
+        "--duplicates",
+        nargs="?",
+        const=DEFAULT_DUPLICATES_NAME,
+        metavar="FILE",
+        help="Detectează facturile deja văzute (același conținut sau același furnizor, dată și total) "
+             f"și nu le mai copiază (index în {DEFAULT_DUPLICATES_NAME} din folder)"
+    )
+    
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="Dimensiunea maximă a cache-ului în MB (implicit: 512)"
+    )
+    
+    parser.add_argument(
+        "--checkpoint",
+        nargs="?",
+        const=DEFAULT_CHECKPOINT_NAME,
+        help=f"Scrie un jurnal de reluare după fiecare fișier (implicit: {DEFAULT_CHECKPOINT_NAME} în folder)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continuă o rulare întreruptă: preia rezultatele din jurnal și procesează doar fișierele rămase"
+    )
+    
+    parser.add_argument(
+        "--lazy-pages",
+        action="store_true",
+        help="Citește paginile pe rând și se oprește când toate datele au fost găsite"
+    )
+    
+    parser.add_argument(
+        "--page-order",
+        choices=PAGE_ORDERS,
+        default="natural",
+        help="Ordinea de citire a paginilor: natural sau edges (prima/ultima întâi)"
+    )
+    
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        help="Numărul maxim de pagini citite din fiecare PDF"
+    )
+    
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Rămâne pornit și procesează fișierele originale noi din folder"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=DEFAULT_SERVE_ADDRESS,
+        metavar="ADDRESS",
+        help="Rulează ca serviciu HTTP local, cu procesele worker pornite: host:port sau "
+             f"unix:/cale/socket (implicit: {DEFAULT_SERVE_ADDRESS})"
+    )
+    
+    parser.add_argument(
+        "--serve-concurrency",
+        type=int,
+        default=16,
+        help="Numărul maxim de cereri procesate simultan în modul --serve (implicit: 16)"
+    )
+    
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=2.0,
+        help="Intervalul de verificare în modul --watch, în secunde (implicit: 2)"
+    )
+    
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Secunde în care un fișier nou trebuie să rămână neschimbat (implicit: 2)"
+    )
+    
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="În modul --watch folosește scanări periodice în loc de inotify"
+    )
+    
+    parser.add_argument(
+        "--output-mode", "-o",
+        choices=list(OUTPUT_MODES),
+        default="copy",
+        help="Cum se creează fișierul cu nume nou: copy, hardlink, reflink, symlink, rename (implicit: copy)"
+    )
+    
+    parser.add_argument(
+        "--skip-identical",
+        choices=SKIP_IDENTICAL_MODES,
+        default="size-mtime",
+        help="Nu rescrie destinațiile identice, verificate după size-mtime (implicit), hash sau none"
+    )
+    
+    parser.add_argument(
+        "--backend", "-b",
+        default="pypdf2",
+        help=f"Backend-urile de extragere a textului, separate prin virgulă, încercate în ordine: "
+             f"{', '.join(TEXT_BACKENDS)} (implicit: pypdf2)"
+    )
+    
+    parser.add_argument(
+        "--compare-backends",
+        nargs="?",
+        const="",
+        metavar="BACKENDS",
+        help="Compară viteza și câmpurile extrase de backend-uri (implicit: toate cele instalate) și iese"
+    )
+    
+    parser.add_argument(
+        "--timings", "-t",
+        type=int,
+        nargs="?",
+        const=10,
+        metavar="N",
+        help="Afișează timpii pe etape și pe câmpuri și cele mai lente N fișiere (implicit: 10)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Rulează sub cProfile și salvează statisticile (pstats) în fișierul specificat"
+    )
+    
     args = parser.parse_args()
     
+    cache = None
+    duplicates = None
+    excel_writer = None
+    data_sinks = []
+    journal = None
+    templates_path = None
+    profiler = None
+    if args.profile:
+        # Se profilează doar procesul principal, nu și procesele worker
+        profiler = cProfile.Profile()
+        profiler.enable()
     try:
-        extractor = InvoiceDataExtractor(args.folder, args.dry_run)
+        if args.watch and (args.recursive or len(args.folder) > 1):
+            parser.error("--watch urmărește un singur folder, fără --recursive")
+        if args.pipeline and (args.timeout or args.max_rss):
+            parser.error("--pipeline nu poate fi folosit împreună cu --timeout sau --max-rss")
+        if args.ocr and args.pipeline:
+            parser.error("--ocr nu poate fi folosit împreună cu --pipeline")
+        if args.serve and (args.watch or args.pipeline or args.ocr or args.timeout or args.max_rss
+                           or args.cache or args.duplicates):
+            parser.error("--serve nu poate fi folosit împreună cu --watch, --pipeline, --ocr, "
+                         "--timeout, --max-rss, --cache sau --duplicates")
+        
+        extractor = InvoiceDataExtractor(args.folder[0], args.dry_run, workers=args.workers,
+                                         lazy_pages=args.lazy_pages,
+                                         page_order=args.page_order,
+                                         max_pages=args.max_pages,
+                                         output_mode=args.output_mode,
+                                         skip_identical=args.skip_identical,
+                                         backends=parse_backends(args.backend),
+                                         roots=args.folder,
+                                         recursive=args.recursive,
+                                         file_timeout=args.timeout,
+                                         max_rss_mb=args.max_rss,
+                                         pipeline=args.pipeline,
+                                         read_concurrency=args.read_concurrency,
+                                         write_concurrency=args.write_concurrency,
+                                         line_items=args.line_items is not None)
+        
+        if args.compare_backends is not None:
+            backends = parse_backends(args.compare_backends) or available_backends()
+            print(f"Compar backend-urile {', '.join(backends)} pe folderul {extractor.input_folder}")
+            extractor.print_backend_comparison(extractor.compare_backends(backends))
+            return
+        
+        if args.ocr:
+            # Înaintea cache-ului: limbile OCR fac parte din versiunea extragerii
+            installed = OcrEngine.installed_languages()
+            if not installed:
+                parser.error("--ocr necesită tesseract (ex: apt install tesseract-ocr tesseract-ocr-ron)")
+            if OcrEngine.renderer() is None:
+                parser.error("--ocr necesită pypdfium2 sau pdftoppm (poppler) pentru randarea paginilor")
+            languages = (args.ocr_lang or OCR_LANGUAGES).split("+")
+            missing = [language for language in languages if language not in installed]
+            if args.ocr_lang and missing:
+                parser.error(f"Limbi Tesseract neinstalate: {', '.join(missing)} "
+                             f"(instalate: {', '.join(installed)})")
+            languages = [language for language in languages if language in installed] or installed[:1]
+            extractor.ocr = OcrEngine(extractor.input_folder / DEFAULT_OCR_CACHE_NAME,
+                                      "+".join(languages), workers=args.ocr_workers,
+                                      timeout=args.timeout)
+        
+        if args.templates:
+            # Înaintea cache-ului: șabloanele fac parte din versiunea extragerii
+            templates_path = Path(args.templates)
+            if not templates_path.is_absolute():
+                templates_path = extractor.input_folder / templates_path
+            extractor.templates = SupplierTemplates.load(templates_path)
+        
+        if args.cache:
+            cache_path = Path(args.cache)
+            if not cache_path.is_absolute():
+                cache_path = extractor.input_folder / cache_path
+            cache = ExtractionCache(cache_path, max_bytes=args.cache_size * 1024 * 1024,
+                                    version=extractor.extraction_version())
+            extractor.cache = cache
+        
+        if args.duplicates:
+            duplicates_path = Path(args.duplicates)
+            if not duplicates_path.is_absolute():
+                duplicates_path = extractor.input_folder / duplicates_path
+            duplicates = DuplicateIndex(duplicates_path, dry_run=args.dry_run)
+            extractor.duplicates = duplicates
+        
+        if args.timings is not None:
+            extractor.timings = RunStats(args.timings)
+        
+        if args.serve:
+            extractor.serve(args.serve, args.serve_concurrency)
+            return
+        
+        if args.excel:
+            # Raportul Excel este scris pe măsură ce fișierele sunt procesate
+            # (în modul --watch, loturile noi au fiecare raportul lor)
+            excel_writer = extractor.open_excel_writer(args.excel)
+        
+        for kind in SINK_TYPES:
+            if getattr(args, kind):
+                data_sinks.append(extractor.open_sink(kind, getattr(args, kind)))
+        if args.line_items:
+            data_sinks.append(extractor.open_line_item_sink(args.line_items))
+        
+        if excel_writer is not None or data_sinks or args.watch:
+            # Raportul text are nevoie de toate rezultatele; celelalte sunt
+            # scrise pe măsură ce apar, iar modul --watch nu le mai folosește
+            extractor.keep_results = bool(args.save)
+        
+        if args.checkpoint or args.resume:
+            journal_path = Path(args.checkpoint or DEFAULT_CHECKPOINT_NAME)
+            if not journal_path.is_absolute():
+                journal_path = extractor.input_folder / journal_path
+            # Rezultatele din jurnal ajung și în rapoartele deschise mai sus
+            if args.resume and journal_path.exists():
+                replayed = extractor.replay_journal(journal_path)
+                print(f"Reluare: {replayed} fișiere preluate din jurnalul {journal_path}")
+            journal = extractor.open_journal(journal_path, append=args.resume)
+        
         extractor.process_folder()
         
         if args.save:
             extractor.save_extracted_data(args.save)
         
-        if args.excel:
-            extractor.save_to_excel(args.excel)
+        if excel_writer is not None:
+            extractor.close_excel_writer(excel_writer)
+        
+        if args.watch:
+            def update_reports() -> None:
+                # Raportul text este completat cu lotul nou
+                if args.save:
+                    extractor.save_extracted_data(args.save, append=True)
             
+            extractor.watch(args.watch_interval, args.settle, args.polling, update_reports, args.excel)
+        
+        for sink in data_sinks:
+            extractor.close_sink(sink)
+        
+        if journal is not None:
+            extractor.close_sink(journal)
+        
     except Exception as e:
         print(f"Eroare: {e}")
         sys.exit(1)
+    finally:
+        if cache is not None:
+            cache.close()
+        if duplicates is not None:
+            duplicates.close()
+        if journal is not None:
+            journal.close()
+        if templates_path is not None and extractor.templates is not None:
+            extractor.templates.save(templates_path)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profilul a fost salvat în: {args.profile} "
+                  f"(python -m pstats {args.profile} sau snakeviz {args.profile})")
 
 
 if __name__ == "__main__":
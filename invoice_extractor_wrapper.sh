@@ -31,12 +31,46 @@ show_help() {
     echo "  [Nume_Companie]_[Data]_TOTAL_[Valoare].pdf"
     echo ""
     echo -e "${YELLOW}Utilizare:${NC}"
-    echo "  $0 [folder] [opțiuni]"
+    echo "  $0 [folder] [alte foldere...] [opțiuni]"
     echo ""
     echo -e "${YELLOW}Opțiuni:${NC}"
     echo "  --dry-run, -d    Testează fără să copieze fișierele"
+    echo "  --recursive, -r  Caută PDF-uri și în subfoldere"
     echo "  --save, -s       Salvează datele extrase în fișier"
     echo "  --excel, -e      Salvează datele extrase în fișier Excel"
+    echo "  --jsonl          Salvează datele în fișier JSON Lines"
+    echo "  --csv            Salvează datele în fișier CSV"
+    echo "  --parquet        Salvează datele în fișier Parquet (necesită pyarrow)"
+    echo "  --line-items     Extrage toate liniile facturilor (opțional: fișier .jsonl/.csv/.parquet)"
+    echo "  --ocr            Recunoaște prin OCR (Tesseract) paginile scanate, fără text"
+    echo "  --ocr-lang       Limbile Tesseract pentru OCR (ex: ron+eng)"
+    echo "  --ocr-workers    Numărul de procese separate pentru OCR"
+    echo "  --workers, -w    Numărul de procese paralele pentru extragere"
+    echo "  --timeout        Timpul maxim de extragere per fișier (secunde)"
+    echo "  --max-rss        Memoria maximă a extragerii per fișier (MB, Linux)"
+    echo "  --pipeline       Suprapune citirea, parsarea și scrierea fișierelor"
+    echo "  --read-concurrency  Fișiere citite simultan în modul --pipeline"
+    echo "  --write-concurrency Fișiere create simultan în modul --pipeline"
+    echo "  --cache, -c      Refolosește extragerile din rulările anterioare"
+    echo "  --templates      Refolosește pattern-urile care au mers la fiecare furnizor"
+    echo "  --duplicates     Nu copiază facturile deja văzute (index păstrat între rulări)"
+    echo "  --checkpoint     Scrie un jurnal de reluare după fiecare fișier"
+    echo "  --resume         Continuă o rulare întreruptă folosind jurnalul"
+    echo "  --lazy-pages     Citește paginile la cerere, până la găsirea datelor"
+    echo "  --page-order     Ordinea paginilor: natural sau edges"
+    echo "  --max-pages      Numărul maxim de pagini citite din fiecare PDF"
+    echo "  --watch          Rămâne pornit și procesează facturile noi din folder"
+    echo "  --serve          Rulează ca serviciu HTTP local (host:port sau unix:/cale/socket)"
+    echo "  --serve-concurrency Numărul maxim de cereri procesate simultan în modul --serve"
+    echo "  --watch-interval Intervalul de verificare în modul --watch (secunde)"
+    echo "  --settle         Secunde în care un fișier nou trebuie să fie neschimbat"
+    echo "  --polling        Folosește scanări periodice în loc de inotify"
+    echo "  --output-mode, -o Cum se creează fișierul nou: copy, hardlink, reflink, symlink, rename"
+    echo "  --skip-identical Verificarea destinațiilor identice: size-mtime, hash, none"
+    echo "  --backend, -b    Backend-urile de extragere a textului (ex: pypdfium2,pypdf2)"
+    echo "  --compare-backends Compară backend-urile de extragere a textului"
+    echo "  --timings, -t    Afișează timpii pe etape și cele mai lente N fișiere"
+    echo "  --profile        Salvează un profil cProfile în fișierul specificat"
     echo "  --help, -h       Afișează acest help"
     echo ""
     echo -e "${YELLOW}Exemple:${NC}"
@@ -44,6 +78,9 @@ show_help() {
     echo "  $0 /path/to/folder --dry-run          # Testează fără copiere"
     echo "  $0 /path/to/folder --save data.txt    # Salvează datele extrase"
     echo "  $0 /path/to/folder --excel facturi.xlsx # Salvează în Excel"
+    echo "  $0 /path/to/folder --workers 8        # Procesează pe 8 procese"
+    echo "  $0 /arhiva/2024 /arhiva/2025 -r       # Procesează arhiva cu subfoldere"
+    echo "  $0 /path/to/folder --watch --excel facturi.xlsx # Procesează facturile noi"
     echo ""
 }
 
@@ -99,25 +136,42 @@ main() {
     check_python
     check_script
     check_folder "$FOLDER"
-    check_pdfs "$FOLDER"
     
-    # Construiește comanda Python cu activarea mediului virtual
+    # Folderele suplimentare (înaintea opțiunilor)
+    FOLDERS=("$FOLDER")
+    while [[ $# -gt 0 ]] && [[ "$1" != -* ]]; do
+        check_folder "$1"
+        FOLDERS+=("$1")
+        shift
+    done
+    
+    # În modul --watch folderul poate fi gol la pornire
+    if [[ " $* " != *" --watch "* ]] && [ ${#FOLDERS[@]} -eq 1 ]; then
+        check_pdfs "$FOLDER"
+    fi
+    
+    # Construiește comanda Python: interpretorul din mediul virtual este rulat
+    # direct (fără source și eval), iar scriptul este pornit ca modul (-m), deci
+    # este încărcat din bytecode-ul compilat în __pycache__, nu recompilat la
+    # fiecare rulare
     SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-    PYTHON_SCRIPT="$SCRIPT_DIR/invoice_data_extractor.py"
-    VENV_ACTIVATE="$SCRIPT_DIR/venv/bin/activate"
+    PYTHON="$SCRIPT_DIR/venv/bin/python3"
+    if [ ! -x "$PYTHON" ]; then
+        PYTHON="python3"
+    fi
     
-    CMD="source \"$VENV_ACTIVATE\" && python3 \"$PYTHON_SCRIPT\" \"$FOLDER\""
+    CMD=("$PYTHON" -m invoice_data_extractor "${FOLDERS[@]}")
     
     # Adaugă opțiunile
     while [[ $# -gt 0 ]]; do
         case $1 in
             --dry-run|-d)
-                CMD="$CMD --dry-run"
+                CMD+=(--dry-run)
                 echo -e "${YELLOW}*** MOD DRY RUN - Nu se vor copia fișierele ***${NC}"
                 ;;
             --save|-s)
                 if [ -n "$2" ]; then
-                    CMD="$CMD --save \"$2\""
+                    CMD+=(--save "$2")
                     shift
                 else
                     echo -e "${RED}Eroare: --save necesită un nume de fișier${NC}"
@@ -126,13 +180,120 @@ main() {
                 ;;
             --excel|-e)
                 if [ -n "$2" ]; then
-                    CMD="$CMD --excel \"$2\""
+                    CMD+=(--excel "$2")
                     shift
                 else
                     echo -e "${RED}Eroare: --excel necesită un nume de fișier${NC}"
                     exit 1
                 fi
                 ;;
+            --jsonl|--csv|--parquet)
+                if [ -n "$2" ]; then
+                    CMD+=("$1" "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: $1 necesită un nume de fișier${NC}"
+                    exit 1
+                fi
+                ;;
+            --cache|-c)
+                if [ -n "$2" ] && [[ "$2" != -* ]]; then
+                    CMD+=(--cache "$2")
+                    shift
+                else
+                    CMD+=(--cache)
+                fi
+                ;;
+            --cache-size)
+                if [ -n "$2" ]; then
+                    CMD+=(--cache-size "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: --cache-size necesită o dimensiune în MB${NC}"
+                    exit 1
+                fi
+                ;;
+            --lazy-pages)
+                CMD+=(--lazy-pages)
+                ;;
+            --recursive|-r)
+                CMD+=(--recursive)
+                ;;
+            --checkpoint|--templates|--line-items|--duplicates|--serve)
+                if [ -n "$2" ] && [[ "$2" != -* ]]; then
+                    CMD+=("$1" "$2")
+                    shift
+                else
+                    CMD+=("$1")
+                fi
+                ;;
+            --resume)
+                CMD+=(--resume)
+                ;;
+            --timings|-t)
+                if [ -n "$2" ] && [[ "$2" != -* ]]; then
+                    CMD+=(--timings "$2")
+                    shift
+                else
+                    CMD+=(--timings)
+                fi
+                ;;
+            --backend|-b)
+                if [ -n "$2" ]; then
+                    CMD+=(--backend "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: --backend necesită o listă de backend-uri${NC}"
+                    exit 1
+                fi
+                ;;
+            --compare-backends)
+                if [ -n "$2" ] && [[ "$2" != -* ]]; then
+                    CMD+=(--compare-backends "$2")
+                    shift
+                else
+                    CMD+=(--compare-backends)
+                fi
+                ;;
+            --profile)
+                if [ -n "$2" ]; then
+                    CMD+=(--profile "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: --profile necesită un nume de fișier${NC}"
+                    exit 1
+                fi
+                ;;
+            --watch|--polling|--pipeline|--ocr)
+                CMD+=("$1")
+                ;;
+            --output-mode|-o)
+                if [ -n "$2" ]; then
+                    CMD+=(--output-mode "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: --output-mode necesită o valoare${NC}"
+                    exit 1
+                fi
+                ;;
+            --page-order|--max-pages|--watch-interval|--settle|--skip-identical|--timeout|--max-rss|--read-concurrency|--write-concurrency|--ocr-lang|--ocr-workers|--serve-concurrency)
+                if [ -n "$2" ]; then
+                    CMD+=("$1" "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: $1 necesită o valoare${NC}"
+                    exit 1
+                fi
+                ;;
+            --workers|-w)
+                if [ -n "$2" ]; then
+                    CMD+=(--workers "$2")
+                    shift
+                else
+                    echo -e "${RED}Eroare: --workers necesită un număr de procese${NC}"
+                    exit 1
+                fi
+                ;;
             *)
                 echo -e "${RED}Eroare: Opțiune necunoscută '$1'${NC}"
                 show_help
@@ -142,11 +303,11 @@ main() {
         shift
     done
     
-    echo -e "${BLUE}Execută comanda:${NC} $CMD"
+    echo -e "${BLUE}Execută comanda:${NC} ${CMD[*]}"
     echo ""
     
     # Execută comanda
-    eval $CMD
+    PYTHONPATH="$SCRIPT_DIR${PYTHONPATH:+:$PYTHONPATH}" "${CMD[@]}"
     
     if [ $? -eq 0 ]; then
         echo ""
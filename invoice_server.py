@@ -0,0 +1,161 @@
+"""
+Serverul HTTP al modului --serve (invoice_data_extractor.py)
+
+Primește cererile HTTP (pe TCP sau pe un socket Unix) și le trimite serviciului
+de extragere (ExtractionService din invoice_data_extractor.py), care păstrează
+procesele worker pornite. Modulul este importat doar de modul --serve, ca
+http.server să nu încetinească pornirea celorlalte rulări.
+"""
+
+import os
+import json
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+from urllib.parse import parse_qs, urlsplit
+
+# Dimensiunea maximă a unei cereri primite de serviciul HTTP (octeți)
+SERVE_MAX_BODY = 64 * 1024 * 1024
+
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """
+    Cererile HTTP ale modului --serve (vezi ExtractionService)
+    
+    GET /health întoarce starea serviciului. POST /extract primește fie
+    conținutul unui PDF (numele opțional în ?name=), fie JSON
+    {"path": "..."} / {"paths": [...]} cu căi din folderele de procesare, și
+    întoarce {"file", "error", "data"} (data este dicționarul extras, ca în
+    cache și în jurnal), respectiv {"results": [...]} pentru "paths".
+    """
+    
+    server_version = "InvoiceDataExtractor/1"
+    protocol_version = "HTTP/1.1"
+    
+    def address_string(self) -> str:
+        # Pentru un socket Unix client_address este gol
+        return self.client_address[0] if self.client_address else "unix"
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+    
+    def send_json(self, status: int, body: Dict) -> None:
+        payload = self.server.service.encode(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self.send_json(404, {'error': "Adresă necunoscută (GET /health, POST /extract)"})
+            return
+        self.send_json(200, self.server.service.status())
+    
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Fără o lungime validă corpul cererii nu poate fi sărit
+            self.close_connection = True
+            self.send_json(400, {'error': "Header Content-Length invalid"})
+            return
+        if length > SERVE_MAX_BODY:
+            self.close_connection = True
+            self.send_json(413, {'error': f"Cererea depășește {SERVE_MAX_BODY // (1024 * 1024)} MB"})
+            return
+        # Corpul este citit înaintea oricărui răspuns, ca o conexiune keep-alive
+        # să continue cu cererea următoare, nu cu restul acestui corp
+        body = self.rfile.read(length)
+        if url.path != "/extract":
+            self.send_json(404, {'error': "Adresă necunoscută (GET /health, POST /extract)"})
+            return
+        
+        service = self.server.service
+        if not service.requests.acquire(blocking=False):
+            service.rejected += 1
+            self.send_json(503, {'error': "Serverul este ocupat, încearcă din nou"})
+            return
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                self.extract_paths(service, body)
+            else:
+                name = parse_qs(url.query).get('name', ["document.pdf"])[0]
+                error, data = service.submit(Path(name), body).result()
+                self.send_json(200, {'file': name, 'error': error, 'data': data.to_dict()})
+        finally:
+            service.requests.release()
+    
+    def extract_paths(self, service: "ExtractionService", body: bytes) -> None:
+        """Cererile JSON: fișierele sunt citite de procesele worker, din folderele de procesare"""
+        try:
+            request = json.loads(body)
+            names = [request['path']] if 'path' in request else request['paths']
+            if not isinstance(names, list) or not all(isinstance(name, str) and name for name in names):
+                raise TypeError(names)
+        except (ValueError, KeyError, TypeError):
+            self.send_json(400, {'error': 'Se așteaptă JSON {"path": "..."} sau {"paths": [...]}'})
+            return
+        
+        extractor = service.extractor
+        roots = [root.resolve() for root in extractor.roots]
+        pdf_files = []
+        for name in names:
+            pdf_file = Path(name)
+            if not pdf_file.is_absolute():
+                pdf_file = extractor.input_folder / pdf_file
+            try:
+                pdf_file = pdf_file.resolve()
+            except (OSError, ValueError):
+                self.send_json(400, {'error': f"Cale invalidă: {name!r}"})
+                return
+            if not any(root == pdf_file or root in pdf_file.parents for root in roots):
+                self.send_json(403, {'error': f"Calea nu este în folderele de procesare: {name}"})
+                return
+            if not pdf_file.is_file():
+                self.send_json(404, {'error': f"Fișierul nu există: {name}"})
+                return
+            pdf_files.append(pdf_file)
+        
+        futures = [service.submit(pdf_file) for pdf_file in pdf_files]
+        results = []
+        for name, future in zip(names, futures):
+            error, data = future.result()
+            results.append({'file': name, 'error': error, 'data': data.to_dict()})
+        self.send_json(200, results[0] if 'path' in request else {'results': results})
+
+
+class ExtractionHTTPServer(ThreadingHTTPServer):
+    """Serverul HTTP al modului --serve, cu o coadă de conexiuni pentru multe cereri simultane"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """ExtractionHTTPServer pe un socket Unix"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def create_server(address: str, service: "ExtractionService") -> socketserver.BaseServer:
+    """Creează serverul HTTP pentru o adresă "host:port" sau "unix:/cale/socket" """
+    if address.startswith("unix:"):
+        socket_path = address[len("unix:"):]
+        if os.path.exists(socket_path):
+            # Socket rămas de la o rulare anterioară
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ExtractionRequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ExtractionHTTPServer((host or "127.0.0.1", int(port)), ExtractionRequestHandler)
+    server.service = service
+    return server
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from corpus import generate_corpus  # noqa: E402
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Un folder cu 4 facturi sintetice cu nume numerice (și manifest.json)"""
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 4, layouts=("standard",))
+    return folder
@@ -0,0 +1,55 @@
+from invoice_data_extractor import EXTRACTOR_VERSION, ExtractionCache, InvoiceRecord
+
+
+def record(company):
+    return InvoiceRecord.from_extracted({'company_name': company})
+
+
+def test_hit_after_reopen(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    cache = ExtractionCache(db_path)
+    assert cache.get("a") is None
+    cache.put("a", "text", record("ALFA SRL"))
+    cache.close()
+
+    cache = ExtractionCache(db_path)
+    text, data = cache.get("a")
+    assert text == "text"
+    assert data.company_name == "ALFA SRL"
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.close()
+
+
+def fill(db_path, entries):
+    """Scrie intrări (digest, versiune, text) fără evict, ca o rulare întreruptă"""
+    for digest, version, text in entries:
+        cache = ExtractionCache(db_path, version=version)
+        cache.put(digest, text, record(version))
+        cache.conn.commit()
+        cache.conn.close()
+
+
+def stored(cache):
+    return sorted(cache.conn.execute("SELECT digest, version FROM entries"))
+
+
+def test_evict_keeps_other_options_and_drops_old_code(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    current = EXTRACTOR_VERSION + ":templates"
+    fill(db_path, [("a", "0", "text"), ("a", "0:templates", "text"), ("a", current, "text")])
+
+    cache = ExtractionCache(db_path, version=EXTRACTOR_VERSION)
+    assert cache.evict() == 2
+    assert stored(cache) == [("a", current)]
+    cache.close()
+
+
+def test_evict_least_recently_used_across_versions(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    fill(db_path, [("vechi", EXTRACTOR_VERSION, "x" * 6),
+                   ("nou", EXTRACTOR_VERSION + ":items", "y" * 6)])
+
+    cache = ExtractionCache(db_path, max_bytes=10, version=EXTRACTOR_VERSION)
+    assert cache.evict() == 1
+    assert stored(cache) == [("nou", EXTRACTOR_VERSION + ":items")]
+    cache.close()
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from invoice_data_extractor import CheckpointJournal, InvoiceDataExtractor, InvoiceRecord
+
+
+def quiet_extractor(folder, **options):
+    extractor = InvoiceDataExtractor(str(folder), **options)
+    extractor.print_summary = lambda: None
+    return extractor
+
+
+def test_append_drops_partial_last_line(tmp_path):
+    path = tmp_path / "jurnal.jsonl"
+    journal = CheckpointJournal(path)
+    journal.write_error("100000.pdf", "Eroare: test")
+    journal.close()
+    # O oprire bruscă lasă ultima linie scrisă pe jumătate
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"file": "100001.pdf", "success": true, "message"')
+
+    journal = CheckpointJournal(path, append=True)
+    journal.write_success("100002.pdf", "Succes", InvoiceRecord())
+    journal.close()
+
+    files = [entry['file'] for entry in CheckpointJournal.read(path)]
+    assert files == ["100000.pdf", "100002.pdf"]
+    for line in path.read_text(encoding='utf-8').splitlines():
+        json.loads(line)
+
+
+def test_header_records_dry_run(tmp_path):
+    path = tmp_path / "jurnal.jsonl"
+    CheckpointJournal(path, dry_run=True).close()
+    assert CheckpointJournal.header(path)['dry_run'] is True
+    assert list(CheckpointJournal.read(path)) == []
+
+
+def test_resume_skips_journaled_files(corpus, capsys):
+    journal_path = corpus / "jurnal.jsonl"
+    extractor = quiet_extractor(corpus, dry_run=True)
+    journal = extractor.open_journal(journal_path)
+    extractor.process_folder()
+    extractor.close_sink(journal)
+    assert extractor.success_count == 4
+
+    resumed = quiet_extractor(corpus, dry_run=True)
+    assert resumed.replay_journal(journal_path) == 4
+    resumed.parse_pdf = lambda *args, **kwargs: pytest.fail("fișierul din jurnal a fost procesat din nou")
+    journal = resumed.open_journal(journal_path, append=True)
+    resumed.process_folder()
+    resumed.close_sink(journal)
+    assert resumed.success_count == 4
+    assert len(list(CheckpointJournal.read(journal_path))) == 4
+
+
+def test_dry_run_journal_is_refused_by_real_resume(corpus):
+    journal_path = corpus / "jurnal.jsonl"
+    extractor = quiet_extractor(corpus, dry_run=True)
+    journal = extractor.open_journal(journal_path)
+    extractor.process_folder()
+    extractor.close_sink(journal)
+
+    with pytest.raises(ValueError, match="--dry-run"):
+        quiet_extractor(corpus).replay_journal(journal_path)
@@ -0,0 +1,57 @@
+import shutil
+import sqlite3
+
+from invoice_data_extractor import DuplicateIndex, InvoiceDataExtractor
+
+
+def run(folder, index_path, dry_run=False):
+    """Procesează folderul cu indexul de duplicate; întoarce extractorul"""
+    extractor = InvoiceDataExtractor(str(folder), dry_run=dry_run)
+    extractor.print_summary = lambda: None
+    extractor.keep_results = True
+    extractor.duplicates = DuplicateIndex(index_path, dry_run=dry_run)
+    extractor.process_folder()
+    extractor.duplicates.close()
+    return extractor
+
+
+def indexed_paths(index_path):
+    with sqlite3.connect(str(index_path)) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT path FROM contents"))
+
+
+def test_resent_invoice_is_not_copied(corpus, tmp_path):
+    shutil.copy(corpus / "100000.pdf", corpus / "100010.pdf")
+
+    extractor = run(corpus, tmp_path / "duplicate.sqlite")
+
+    duplicates = {record.file: record.duplicate for record in extractor.processed_files
+                  if record.duplicate is not None}
+    assert duplicates == {"100010.pdf": ("exact", "100000.pdf")}
+    assert extractor.duplicates.counts == {'exact': 1, 'probabil': 0}
+    assert len(list(corpus.glob("*_*.pdf"))) == 4
+
+
+def test_dry_run_does_not_create_index(corpus, tmp_path):
+    shutil.copy(corpus / "100000.pdf", corpus / "100010.pdf")
+    index_path = tmp_path / "duplicate.sqlite"
+
+    extractor = run(corpus, index_path, dry_run=True)
+
+    assert extractor.duplicates.counts['exact'] == 1
+    assert not index_path.exists()
+
+
+def test_dry_run_leaves_existing_index_unchanged(corpus, tmp_path):
+    index_path = tmp_path / "duplicate.sqlite"
+    run(corpus, index_path)
+    before = indexed_paths(index_path)
+    shutil.copy(corpus / "100000.pdf", corpus / "100010.pdf")
+    shutil.copy(corpus / "100001.pdf", corpus / "100011.pdf")
+    (corpus / "100000.pdf").unlink()
+
+    extractor = run(corpus, index_path, dry_run=True)
+
+    # Fișierul original nu mai există, dar rămâne în index
+    assert extractor.duplicates.counts['exact'] == 2
+    assert indexed_paths(index_path) == before
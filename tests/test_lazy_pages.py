@@ -0,0 +1,27 @@
+from invoice_data_extractor import InvoiceDataExtractor, InvoiceRecord
+
+from corpus import LAYOUTS, generate_corpus
+
+
+def test_lazy_pages_match_full_read(tmp_path):
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 12, pages=3, layouts=LAYOUTS)
+    full = InvoiceDataExtractor(str(folder))
+    for order in ("natural", "edges"):
+        lazy = InvoiceDataExtractor(str(folder), lazy_pages=True, page_order=order)
+        for pdf_path in sorted(folder.glob("*.pdf")):
+            expected, actual = full.parse_pdf(pdf_path)[1], lazy.parse_pdf(pdf_path)[1]
+            for field in InvoiceRecord.FIELDS:
+                assert getattr(actual, field) == getattr(expected, field), (pdf_path.name, order, field)
+
+
+def test_fallback_match_waits_for_better_pattern(tmp_path):
+    # Pe prima pagină potrivește doar pattern-ul de rezervă pentru produs ("1 ..."),
+    # iar "Linia 1" apare abia pe ultima pagină
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 1, pages=3, layouts=("standard",))
+    pdf_path = next(folder.glob("*.pdf"))
+    full = InvoiceDataExtractor(str(folder)).parse_pdf(pdf_path)[1]
+    lazy = InvoiceDataExtractor(str(folder), lazy_pages=True).parse_pdf(pdf_path)[1]
+    assert lazy.product_name == full.product_name
+    assert not lazy.product_name.startswith("Anexa")
@@ -0,0 +1,37 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import invoice_data_extractor
+from invoice_data_extractor import InvoiceDataExtractor, InvoiceRecord, new_trace
+
+SCANNED = {"100001.pdf": 0.3, "100002.pdf": 0.0}
+
+
+def fake_ocr(pdf_path):
+    """OCR-ul unui fișier scanat: primul durează mai mult decât al doilea"""
+    time.sleep(SCANNED[pdf_path.name])
+    return None, "text OCR", InvoiceRecord.from_extracted({'company_name': "SCANAT SRL"}), new_trace()
+
+
+def test_ocr_results_keep_input_order(tmp_path, monkeypatch):
+    # Pool-ul OCR rulează în thread-uri, ca fake_ocr să poată fi înlocuit
+    monkeypatch.setattr(invoice_data_extractor, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(invoice_data_extractor, "_ocr_in_worker", fake_ocr)
+    extractor = InvoiceDataExtractor(str(tmp_path))
+    extractor.ocr = SimpleNamespace(workers=2, files=0, pages=0, cached=0)
+    monkeypatch.setattr(extractor, "needs_ocr", lambda data: data.company_name is None)
+
+    names = ["100000.pdf", "100001.pdf", "100002.pdf", "100003.pdf"]
+    analyses = [
+        (Path(tmp_path / name), (None, InvoiceRecord() if name in SCANNED
+                                 else InvoiceRecord.from_extracted({'company_name': "TEXT SRL"})), None)
+        for name in names
+    ]
+    results = list(extractor.iter_ocr_analyses(analyses))
+
+    assert [pdf_file.name for pdf_file, _, _ in results] == names
+    assert [analysis[1].company_name for _, analysis, _ in results] == \
+        ["TEXT SRL", "SCANAT SRL", "SCANAT SRL", "TEXT SRL"]
+    assert extractor.ocr.files == 2
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from invoice_data_extractor import InvoiceDataExtractor, OUTPUT_RESULTS, invoice_record
+
+
+@pytest.mark.parametrize("output_mode", list(OUTPUT_RESULTS))
+def test_output_mode_message_and_new_file(corpus, output_mode):
+    extractor = InvoiceDataExtractor(str(corpus), output_mode=output_mode)
+    pdf_path = corpus / "100000.pdf"
+    content = pdf_path.read_bytes()
+
+    success, message, data = extractor.process_pdf(pdf_path, log=lambda line: None)
+
+    new_path = corpus / data.new_file
+    assert success
+    assert message == f"Succes: {OUTPUT_RESULTS[output_mode]} {data.new_file}"
+    assert new_path != pdf_path and new_path.read_bytes() == content
+    assert invoice_record(pdf_path.name, message, data)['new_file'] == data.new_file
+    assert pdf_path.exists() == (output_mode != 'rename')
+    assert new_path.is_symlink() == (output_mode == 'symlink')
+    if output_mode == 'hardlink':
+        assert os.path.samefile(pdf_path, new_path)
+
+
+def test_dry_run_reports_new_file_without_creating_it(corpus):
+    extractor = InvoiceDataExtractor(str(corpus), dry_run=True, output_mode='hardlink')
+
+    success, message, data = extractor.process_pdf(corpus / "100000.pdf", log=lambda line: None)
+
+    assert success and message == f"Succes: hardlink creat {data.new_file}"
+    assert not (corpus / data.new_file).exists()
@@ -0,0 +1,137 @@
+import json
+import socket
+import threading
+
+import pytest
+
+import invoice_client
+import invoice_server
+from invoice_data_extractor import ExtractionService, InvoiceDataExtractor
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    """Serviciul de extragere pe un port liber, cu un folder de 4 facturi"""
+    from corpus import generate_corpus
+
+    folder = tmp_path_factory.mktemp("serve") / "facturi"
+    generate_corpus(folder, 4, layouts=("standard",))
+    service = ExtractionService(InvoiceDataExtractor(str(folder), dry_run=True), max_requests=2)
+    http_server = invoice_server.create_server("127.0.0.1:0", service)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{http_server.server_address[1]}", service, folder
+    http_server.shutdown()
+    http_server.server_close()
+    service.close()
+
+
+def manifest(folder):
+    return json.loads((folder / "manifest.json").read_text(encoding='utf-8'))['documents']
+
+
+def raw_request(address, data):
+    """Trimite octeții dați pe o conexiune nouă și întoarce tot răspunsul"""
+    host, _, port = address.rpartition(":")
+    with socket.create_connection((host, int(port)), timeout=10) as connection:
+        connection.sendall(data)
+        connection.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+def test_health(server):
+    address, _, _ = server
+    status = invoice_client.health(address)
+    assert status['status'] == "ok"
+    assert status['max_requests'] == 2
+
+
+def test_bytes_upload(server):
+    address, _, folder = server
+    document = manifest(folder)[0]
+    result = invoice_client.extract(address, (folder / document['file']).read_bytes(), name="upload.pdf")
+    assert result['file'] == "upload.pdf"
+    assert result['error'] is None
+    assert result['data']['company_name'] == document['expected']['company_name']
+
+
+def test_paths(server):
+    address, _, folder = server
+    documents = manifest(folder)
+    results = invoice_client.extract_paths(address, [document['file'] for document in documents])
+    assert [result['file'] for result in results] == [document['file'] for document in documents]
+    for result, document in zip(results, documents):
+        assert result['data']['company_name'] == document['expected']['company_name']
+    single = invoice_client.extract(address, path=documents[0]['file'])
+    assert single['data'] == results[0]['data']
+
+
+def test_path_outside_roots_is_forbidden(server):
+    address, _, folder = server
+    with pytest.raises(RuntimeError, match="HTTP 403"):
+        invoice_client.extract(address, path=str(folder.parent / "altceva.pdf"))
+    with pytest.raises(RuntimeError, match="HTTP 403"):
+        invoice_client.extract(address, path="../../etc/passwd")
+
+
+def test_missing_path(server):
+    address, _, _ = server
+    with pytest.raises(RuntimeError, match="HTTP 404"):
+        invoice_client.extract(address, path="lipseste.pdf")
+
+
+def test_body_too_large(server, monkeypatch):
+    address, _, _ = server
+    monkeypatch.setattr(invoice_server, "SERVE_MAX_BODY", 1024)
+    with pytest.raises(RuntimeError, match="HTTP 413"):
+        invoice_client.extract(address, b"%PDF" + b"0" * 2048)
+
+
+def test_busy_server_is_rejected(server):
+    address, service, folder = server
+    rejected = service.rejected
+    for _ in range(service.max_requests):
+        service.requests.acquire()
+    try:
+        with pytest.raises(RuntimeError, match="HTTP 503"):
+            invoice_client.extract(address, path=manifest(folder)[0]['file'])
+    finally:
+        for _ in range(service.max_requests):
+            service.requests.release()
+    assert service.rejected == rejected + 1
+
+
+@pytest.mark.parametrize("body", [b"{nu este json", b'{"path": 5}', b'{"paths": "a.pdf"}',
+                                  b'{"paths": ["a.pdf", null]}', b'["path"]', b'{}'])
+def test_malformed_json_is_rejected(server, body):
+    address, _, _ = server
+    connection = invoice_client.connect(address, 10)
+    try:
+        with pytest.raises(RuntimeError, match="HTTP 400"):
+            invoice_client.request(connection, "POST", "/extract", body, "application/json")
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_malformed_content_length_is_rejected(server, length):
+    address, _, _ = server
+    response = raw_request(address, b"POST /extract HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_unknown_url_keeps_connection_usable(server):
+    address, _, _ = server
+    connection = invoice_client.connect(address, 10)
+    try:
+        with pytest.raises(RuntimeError, match="HTTP 404"):
+            invoice_client.request(connection, "POST", "/necunoscut", b'{"path": "a.pdf"}', "application/json")
+        # Cererea următoare pe aceeași conexiune nu este amestecată cu corpul celei anterioare
+        assert invoice_client.request(connection, "GET", "/health")['status'] == "ok"
+    finally:
+        connection.close()
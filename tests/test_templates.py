@@ -0,0 +1,69 @@
+import json
+
+from invoice_data_extractor import FIELD_ENGINE, InvoiceDataExtractor, SupplierTemplates, new_trace
+
+
+def supplier_key(text):
+    return SupplierTemplates().supplier_key(text, FIELD_ENGINE.index_labels(text))
+
+
+def test_supplier_key_from_supplier_block():
+    assert supplier_key("VANZATOR ALFA SRL\nCUI RO12345678\nCUMPARATOR\nCUI 87654321") == "12345678"
+
+
+def test_supplier_key_ignores_buyer_id():
+    assert supplier_key("VANZATOR ALFA SRL\nCUMPARATOR BETA SRL\nCUI 87654321") is None
+
+
+def test_supplier_key_without_supplier_label():
+    assert supplier_key("FACTURA\nCUI 12345678\nTOTAL PLATA 100.00") is None
+
+
+def test_templates_learned_and_saved(corpus, tmp_path):
+    templates = SupplierTemplates()
+    extractor = InvoiceDataExtractor(str(corpus), dry_run=True)
+    extractor.templates = templates
+    documents = json.loads((corpus / "manifest.json").read_text(encoding='utf-8'))['documents']
+    for document in documents:
+        extractor.parse_pdf(corpus / document['file'])
+    assert len(templates.new_suppliers) == len(templates.suppliers) > 0
+    # O factură nouă a unui furnizor cunoscut folosește șablonul lui
+    extractor.parse_pdf(corpus / documents[0]['file'])
+    assert templates.hits > 0 and templates.misses == 0
+
+    path = tmp_path / "sabloane.json"
+    templates.save(path)
+    assert SupplierTemplates.load(path).templates == templates.templates
+
+
+def test_lazy_pages_keep_supplier_page(tmp_path):
+    from corpus import generate_corpus
+
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 2, pages=4, layouts=("standard",))
+    templates = SupplierTemplates()
+    extractor = InvoiceDataExtractor(str(folder), lazy_pages=True)
+    extractor.templates = templates
+    for pdf_path in sorted(folder.glob("*.pdf")):
+        extractor.parse_pdf(pdf_path)
+    # Câmpurile de pe ultima pagină (totalurile) sunt învățate pentru furnizor
+    assert all('total_payment' in template for template in templates.templates.values())
+
+
+def test_lazy_pages_record_one_outcome_per_invoice(tmp_path):
+    from corpus import generate_corpus
+
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 1, pages=6, layouts=("standard",))
+    pdf_path = next(folder.glob("*.pdf"))
+    templates = SupplierTemplates()
+    extractor = InvoiceDataExtractor(str(folder), lazy_pages=True)
+    extractor.templates = templates
+    extractor.parse_pdf(pdf_path)
+    learned = dict(next(iter(templates.templates.values())))
+
+    trace = new_trace()
+    extractor.parse_pdf(pdf_path, trace)
+    # A doua factură a furnizorului: câte o căutare per câmp din șablon, un singur rezultat
+    assert templates.hits + templates.misses == len(learned)
+    assert len(trace['templates']) == 1
@@ -0,0 +1,68 @@
+import shutil
+
+from invoice_data_extractor import InvoiceDataExtractor
+
+
+def test_batch_reports_do_not_overwrite(tmp_path):
+    extractor = InvoiceDataExtractor(str(tmp_path))
+    first = extractor.batch_report_path("facturi.xlsx")
+    assert first.parent == tmp_path
+    assert first.name.startswith("facturi_") and first.suffix == ".xlsx"
+    first.touch()
+    second = extractor.batch_report_path("facturi.xlsx")
+    assert second != first and not second.exists()
+
+
+def watched_extractor(folder, **options):
+    """Extractorul după rularea inițială pe folder, ca în main înainte de watch()"""
+    extractor = InvoiceDataExtractor(str(folder), dry_run=True, **options)
+    extractor.print_summary = lambda: None
+    extractor.process_folder()
+    return extractor
+
+
+def watch_batches(extractor, folder, names, report=None):
+    """
+    Copiază în folder câte o factură nouă per lot și rulează watch() până la
+    ultimul lot; întoarce (pool, rezultate, erori) văzute la fiecare lot
+    """
+    source = next(folder.glob("*.pdf"))
+    pending = list(names)
+    batches = []
+
+    def on_batch():
+        batches.append((extractor.worker_pool, len(extractor.processed_files), len(extractor.errors)))
+        if report is not None:
+            extractor.save_extracted_data(str(report), append=True)
+        if not pending:
+            raise KeyboardInterrupt
+        shutil.copy(source, folder / pending.pop(0))
+
+    shutil.copy(source, folder / pending.pop(0))
+    extractor.watch(interval=0.05, settle=0, polling=True, on_batch=on_batch)
+    return batches
+
+
+def test_watch_reuses_worker_pool_and_drops_results(corpus):
+    extractor = watched_extractor(corpus, workers=2)
+    batches = watch_batches(extractor, corpus, ["200000.pdf", "200001.pdf"])
+
+    assert len(batches) == 2
+    assert batches[0][0] is not None and batches[0][0] is batches[1][0]
+    # Rezultatele păstrate sunt doar cele ale lotului curent
+    assert [results for _, results, _ in batches] == [1, 1]
+    assert extractor.processed_files == [] and extractor.errors == []
+    assert extractor.worker_pool is None
+    assert extractor.success_count == 6
+
+
+def test_watch_appends_each_batch_to_text_report(corpus, tmp_path):
+    extractor = watched_extractor(corpus)
+    report = tmp_path / "date.txt"
+    extractor.save_extracted_data(str(report))
+    watch_batches(extractor, corpus, ["200000.pdf", "200001.pdf"], report)
+
+    text = report.read_text(encoding='utf-8')
+    assert text.count("Date extrase din PDF-uri:") == 1
+    assert text.count("Fișier: ") == 6
+    assert "Fișier: 200001.pdf" in text
@@ -0,0 +1,24 @@
+from corpus import generate_corpus
+from invoice_data_extractor import InvoiceDataExtractor
+
+
+def processed(folder, **options):
+    """(fișier, mesaj, date) pentru fiecare factură, în ordinea înregistrării"""
+    extractor = InvoiceDataExtractor(str(folder), dry_run=True, **options)
+    extractor.print_summary = lambda: None
+    extractor.keep_results = True
+    extractor.process_folder()
+    return [(record.file, record.message, record.to_dict()) for record in extractor.processed_files]
+
+
+def test_workers_keep_serial_order(tmp_path):
+    folder = tmp_path / "facturi"
+    generate_corpus(folder, 24)
+    # Un fișier care nu se poate citi nu trebuie să schimbe ordinea celorlalte
+    (folder / "100005.pdf").write_bytes(b"nu este un PDF")
+
+    serial = processed(folder)
+
+    assert [name for name, _, _ in serial] == [f"{100000 + i}.pdf" for i in range(24) if i != 5]
+    assert processed(folder, workers=2) == serial
+    assert processed(folder, workers=3, pipeline=True) == serial